@@ -156,17 +156,16 @@ def _run_pipeline(job_id, tenant_id, keyword, dry_run):
 
     try:
         from core.tenant_config import TenantConfig
-        from core.llm_client import LLMClient
+        from core.llm_client import LLMClient, create_gemini_rate_limiter
         from core.knowledge_base import KnowledgeBase
         from core.pipeline import ArticlePipeline
         from core.prompt_engine import PromptEngine
         from core.kb_cache import KnowledgeBaseCache
-        from core.rate_limiter import RateLimiter
         from core.circuit_breaker import CircuitBreaker
 
         tc = TenantConfig.load(tenant_id)
         llm = LLMClient(
-            rate_limiter=RateLimiter(rpm=15),
+            rate_limiter=create_gemini_rate_limiter(),
             circuit_breaker=CircuitBreaker(name="gemini", failure_threshold=5, cooldown=60),
         )
         kb = KnowledgeBase(tc.kb_path)
@@ -9,6 +9,55 @@ GOOGLE_API_KEYS_LIST = [k.strip() for k in os.getenv("GOOGLE_API_KEYS", "").spli
 # Model Configuration
 GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-3-flash-preview")
 
+# Per-key quota budgets (each key in GOOGLE_API_KEYS gets its own RPM/TPM window)
+GEMINI_RPM_PER_KEY = int(os.getenv("GEMINI_RPM_PER_KEY", "15"))
+GEMINI_TPM_PER_KEY = int(os.getenv("GEMINI_TPM_PER_KEY", "1000000"))
+
+# Max concurrent LLMClient.generate_async() calls per process
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+
+# Optional LLM response cache (SQLite) — identical prompts are served locally
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# Pipeline stage checkpoints — failed runs resume from the last completed stage
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() in ("1", "true", "yes")
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", ".cache/checkpoints")
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", str(24 * 3600)))
+
+# Local SQLite mirror of the keyword spreadsheets (scheduler/queue/jobs read it instead of Sheets)
+SHEET_MIRROR_ENABLED = os.getenv("SHEET_MIRROR_ENABLED", "true").lower() in ("1", "true", "yes")
+SHEET_MIRROR_PATH = os.getenv("SHEET_MIRROR_PATH", ".cache/sheet_mirror.sqlite")
+SHEET_MIRROR_MAX_AGE = int(os.getenv("SHEET_MIRROR_MAX_AGE", "300"))
+
+# Local SQLite store of published WordPress posts (reoptimizer/freshness read it instead of re-downloading)
+WP_POST_CACHE_ENABLED = os.getenv("WP_POST_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+WP_POST_CACHE_PATH = os.getenv("WP_POST_CACHE_PATH", ".cache/wp_posts.sqlite")
+WP_POST_CACHE_MAX_AGE = int(os.getenv("WP_POST_CACHE_MAX_AGE", "300"))
+
+# Shared SQLite cache of SerperAPI results (discovery, pipeline and retries reuse one request)
+SERP_CACHE_ENABLED = os.getenv("SERP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+SERP_CACHE_PATH = os.getenv("SERP_CACHE_PATH", ".cache/serp.sqlite")
+SERP_CACHE_TTL = int(os.getenv("SERP_CACHE_TTL", str(24 * 3600)))
+
+# Local SQLite time series of Search Console data (only missing days are downloaded)
+GSC_STORE_ENABLED = os.getenv("GSC_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+GSC_STORE_PATH = os.getenv("GSC_STORE_PATH", ".cache/gsc.sqlite")
+GSC_FINAL_AFTER_DAYS = int(os.getenv("GSC_FINAL_AFTER_DAYS", "3"))
+GSC_RECENT_MAX_AGE = int(os.getenv("GSC_RECENT_MAX_AGE", "3600"))  # seconds before non-final days are re-fetched
+
+# Re-optimizer: posts processed concurrently and WordPress writes per minute, per site
+REOPTIMIZE_WORKERS = int(os.getenv("REOPTIMIZE_WORKERS", "4"))
+REOPTIMIZE_RPM = int(os.getenv("REOPTIMIZE_RPM", "120"))
+
+# Imagen batching for the article's cover/body/final images:
+#   off       — one predict call per image (default)
+#   instances — one predict call with every prompt as an instance
+#   samples   — one predict call on the cover prompt with sampleCount=N (same scene, N variations)
+IMAGEN_BATCH_MODE = os.getenv("IMAGEN_BATCH_MODE", "off").lower()
+
 
 def load_wp_credentials(site_config):
     """
@@ -63,7 +63,8 @@ class AnalystAgent(BaseAgent):
         links_inventory = input_data.get("links_inventory", [])
         site_config = input_data.get("site_config", {})
         serp_brief = input_data.get("serp_brief", {})
-        kb_text = self._load_kb()
+        kb_query = " ".join([keyword] + serp_brief.get("related_searches", [])[:8]) if serp_brief else keyword
+        kb_text = self._load_kb(query=kb_query)
 
         if isinstance(links_inventory, list):
             links_text = "\n".join(
@@ -175,3 +176,19 @@ class AnalystAgent(BaseAgent):
                 )
         logger.error("[analyst] All %d attempts failed.", MAX_ANALYST_RETRIES)
         return last_result
+
+    async def execute_async(self, input_data) -> AgentResult:
+        """Async execute() with the same JSON-parsing retry logic."""
+        last_result = None
+        for attempt in range(1, MAX_ANALYST_RETRIES + 1):
+            result = await super().execute_async(input_data)
+            if result.success:
+                return result
+            last_result = result
+            if attempt < MAX_ANALYST_RETRIES:
+                logger.warning(
+                    "[analyst] Attempt %d/%d failed: %s — retrying...",
+                    attempt, MAX_ANALYST_RETRIES, result.error
+                )
+        logger.error("[analyst] All %d attempts failed.", MAX_ANALYST_RETRIES)
+        return last_result
@@ -50,13 +50,29 @@ class BaseAgent(ABC):
         """Override to specify which KB files to load. None means no KB needed."""
         return None
 
-    def _load_kb(self):
-        """Loads knowledge base content filtered for this agent."""
+    def _load_kb(self, query=None):
+        """Loads knowledge base content filtered for this agent.
+
+        Args:
+            query: Optional text (keyword, outline...) to retrieve only the
+                   relevant passages when the tenant has KB retrieval enabled.
+        """
         # Use cache if available
         if self.kb_cache and self.tenant_config:
             kb_filter = self._get_kb_filter()
             if kb_filter is None:
                 return ""
+            kb_config = self.tenant_config.get_kb_config()
+            if query and kb_config.get("retrieval"):
+                return self.kb_cache.retrieve(
+                    self.tenant_config.company_id,
+                    self.tenant_config.kb_path,
+                    query,
+                    file_filter=kb_filter,
+                    top_k=kb_config.get("top_k", 8),
+                    max_chars=kb_config.get("max_chars", 12000),
+                    chunk_size=kb_config.get("chunk_size", 1200),
+                )
             return self.kb_cache.get(
                 self.tenant_config.company_id,
                 self.tenant_config.kb_path,
@@ -75,6 +91,47 @@ class BaseAgent(ABC):
         """Override to add output validation. Returns True by default."""
         return True
 
+    def _success_result(self, content, start, input_chars) -> AgentResult:
+        duration_ms = (time.time() - start) * 1000
+        output_chars = len(str(content))
+        logger.info(
+            "[%s] completed in %.0fms (input=%d chars, output=%d chars)",
+            self.name, duration_ms, input_chars, output_chars
+        )
+        return AgentResult(
+            content=content,
+            duration_ms=duration_ms,
+            agent_name=self.name,
+            success=True,
+            input_chars=input_chars,
+            output_chars=output_chars,
+        )
+
+    def _failure_result(self, error, start, input_chars) -> AgentResult:
+        duration_ms = (time.time() - start) * 1000
+        logger.error("[%s] failed after %.0fms: %s", self.name, duration_ms, error)
+        return AgentResult(
+            content=None,
+            duration_ms=duration_ms,
+            agent_name=self.name,
+            success=False,
+            input_chars=input_chars,
+            error=str(error),
+        )
+
+    def _parse_and_cache(self, prompt, json_mode, raw_text, input_data):
+        """Parse the response; only a response that parses goes into the LLM response cache.
+
+        An unparseable one is dropped from the cache so a retry asks the model again.
+        """
+        try:
+            content = self._parse_response(raw_text, input_data)
+        except Exception:
+            self.llm.discard_response(prompt, json_mode)
+            raise
+        self.llm.store_response(prompt, json_mode, raw_text)
+        return content
+
     def execute(self, input_data) -> AgentResult:
         """Execute the agent: build prompt, call LLM, parse response, return result."""
         input_chars = len(str(input_data))
@@ -82,35 +139,26 @@ class BaseAgent(ABC):
 
         try:
             prompt = self._build_prompt(input_data)
-            raw_text = self.llm.generate(prompt, json_mode=self._get_json_mode())
-            content = self._parse_response(raw_text, input_data)
-            duration_ms = (time.time() - start) * 1000
+            json_mode = self._get_json_mode()
+            raw_text = self.llm.generate(prompt, json_mode=json_mode, cache=False)
+            content = self._parse_and_cache(prompt, json_mode, raw_text, input_data)
+            return self._success_result(content, start, input_chars)
+        except Exception as e:
+            return self._failure_result(e, start, input_chars)
 
-            output_chars = len(str(content))
-            logger.info(
-                "[%s] completed in %.0fms (input=%d chars, output=%d chars)",
-                self.name, duration_ms, input_chars, output_chars
-            )
+    async def execute_async(self, input_data) -> AgentResult:
+        """Async execute(): awaits LLMClient.generate_async so other pipelines run meanwhile."""
+        input_chars = len(str(input_data))
+        start = time.time()
 
-            return AgentResult(
-                content=content,
-                duration_ms=duration_ms,
-                agent_name=self.name,
-                success=True,
-                input_chars=input_chars,
-                output_chars=output_chars,
-            )
+        try:
+            prompt = self._build_prompt(input_data)
+            json_mode = self._get_json_mode()
+            raw_text = await self.llm.generate_async(prompt, json_mode=json_mode, cache=False)
+            content = self._parse_and_cache(prompt, json_mode, raw_text, input_data)
+            return self._success_result(content, start, input_chars)
         except Exception as e:
-            duration_ms = (time.time() - start) * 1000
-            logger.error("[%s] failed after %.0fms: %s", self.name, duration_ms, e)
-            return AgentResult(
-                content=None,
-                duration_ms=duration_ms,
-                agent_name=self.name,
-                success=False,
-                input_chars=input_chars,
-                error=str(e),
-            )
+            return self._failure_result(e, start, input_chars)
 
     @staticmethod
     def clean_llm_output(text: str) -> str:
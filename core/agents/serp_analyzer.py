@@ -10,9 +10,10 @@ load_dotenv(override=True)
 logger = get_logger(__name__)
 
 SERPER_API_URL = "https://google.serper.dev/search"
+SERPER_BATCH_LIMIT = 100  # queries per SerperAPI batch request
 
 
-def get_serp_data(keyword, api_key=None, country="br", language="pt-br", num_results=10):
+def get_serp_data(keyword, api_key=None, country="br", language="pt-br", num_results=10, cache=None):
     """Fetch Google SERP data for a keyword via SerperAPI.
 
     Args:
@@ -21,10 +22,17 @@ def get_serp_data(keyword, api_key=None, country="br", language="pt-br", num_res
         country: Country code for localized results.
         language: Language code.
         num_results: Number of results to fetch.
+        cache: Optional SerpCache — concurrent callers for the same query share one request.
 
     Returns:
         dict with keys: organic, people_also_ask, related_searches, or None on failure.
     """
+    if cache is not None:
+        return cache.get_or_fetch(
+            keyword, country, language, num_results,
+            lambda: get_serp_data(keyword, api_key, country, language, num_results),
+        )
+
     key = api_key or os.getenv("SERPER_API_KEY", "")
     if not key:
         logger.warning("SERPER_API_KEY not configured. Skipping SERP analysis.")
@@ -55,6 +63,87 @@ def get_serp_data(keyword, api_key=None, country="br", language="pt-br", num_res
         return None
 
 
+def get_serp_data_batch(keywords, api_key=None, country="br", language="pt-br", num_results=10, cache=None):
+    """Fetch Google SERP data for many keywords with batched SerperAPI requests.
+
+    SerperAPI accepts a JSON array of queries and answers with an array of
+    results in the same order, so up to SERPER_BATCH_LIMIT keywords cost one
+    round trip. Keywords already in the cache are not sent.
+
+    Args:
+        keywords: Search queries.
+        cache: Optional SerpCache — read before fetching, filled with the results.
+        (other args as in get_serp_data)
+
+    Returns:
+        Dict {keyword: SERP data dict, or None on failure}.
+    """
+    results = {}
+    missing = []
+    for keyword in dict.fromkeys(keywords):
+        data = cache.get(keyword, country, language, num_results) if cache is not None else None
+        if data is not None:
+            results[keyword] = data
+        else:
+            missing.append(keyword)
+    if not missing:
+        return results
+
+    key = api_key or os.getenv("SERPER_API_KEY", "")
+    if not key:
+        logger.warning("SERPER_API_KEY not configured. Skipping SERP analysis.")
+        results.update((keyword, None) for keyword in missing)
+        return results
+
+    headers = {
+        "X-API-KEY": key,
+        "Content-Type": "application/json",
+    }
+    for start in range(0, len(missing), SERPER_BATCH_LIMIT):
+        chunk = missing[start:start + SERPER_BATCH_LIMIT]
+        payload = [
+            {"q": keyword, "gl": country, "hl": language, "num": num_results}
+            for keyword in chunk
+        ]
+        items = []
+        try:
+            response = requests.post(SERPER_API_URL, headers=headers, json=payload, timeout=30)
+            if response.status_code == 200:
+                items = response.json()
+            else:
+                logger.warning("SerperAPI batch error (status=%d): %s", response.status_code, response.text[:200])
+        except requests.RequestException as e:
+            logger.warning("SerperAPI batch request failed: %s", e)
+        if not isinstance(items, list):
+            items = [items]
+
+        for i, keyword in enumerate(chunk):
+            item = items[i] if i < len(items) else None
+            data = _parse_serp_response(item) if isinstance(item, dict) else None
+            if data is not None and cache is not None:
+                cache.set(keyword, country, language, num_results, data)
+            results[keyword] = data
+
+    logger.info("SerperAPI batch: %d fetched in %d request(s), %d from cache",
+                len(missing), -(-len(missing) // SERPER_BATCH_LIMIT), len(results) - len(missing))
+    return results
+
+
+def prefetch_serp_data(keywords, cache, api_key=None):
+    """Warm the SERP cache for keywords that are about to be processed.
+
+    Uses the same defaults as generate_serp_brief(), so the pipeline's
+    lookups hit the prefetched entries.
+
+    Returns:
+        Number of keywords with SERP data in the cache.
+    """
+    if cache is None or not keywords:
+        return 0
+    results = get_serp_data_batch(keywords, api_key=api_key, cache=cache)
+    return sum(1 for data in results.values() if data is not None)
+
+
 def _parse_serp_response(data):
     """Parse SerperAPI response into structured SERP brief.
 
@@ -104,15 +193,32 @@ def _estimate_word_count(snippet):
     return max(800, min(5000, estimated))
 
 
-def generate_serp_brief(keyword, api_key=None):
+def generate_serp_brief(keyword, api_key=None, cache=None):
     """Generate a complete SERP brief for a keyword.
 
     This is the main entry point for the pipeline.
 
+    Args:
+        cache: Optional SerpCache passed through to get_serp_data().
+
     Returns:
         dict with full SERP analysis, or empty dict on failure.
     """
-    serp_data = get_serp_data(keyword, api_key=api_key)
+    serp_data = get_serp_data(keyword, api_key=api_key, cache=cache)
+    return _build_brief(keyword, serp_data)
+
+
+def generate_serp_briefs(keywords, api_key=None, cache=None):
+    """Generate SERP briefs for many keywords with batched SerperAPI requests.
+
+    Returns:
+        Dict {keyword: brief dict, or empty dict on failure}.
+    """
+    serp_data = get_serp_data_batch(keywords, api_key=api_key, cache=cache)
+    return {keyword: _build_brief(keyword, data) for keyword, data in serp_data.items()}
+
+
+def _build_brief(keyword, serp_data):
     if not serp_data:
         return {}
 
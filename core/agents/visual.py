@@ -3,13 +3,21 @@ import re
 import base64
 import html as html_module
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from core.agents.base import BaseAgent, AgentResult
 from core.logger import get_logger
 from config.prompts import IMAGE_PROMPT_GENERATION
+from config.settings import IMAGEN_BATCH_MODE
 
 logger = get_logger(__name__)
 
+IMAGEN_URL = "https://generativelanguage.googleapis.com/v1beta/models/imagen-4.0-generate-001:predict?key={key}"
+IMAGEN_TIMEOUT = (10, 120)
+IMAGEN_BATCH_MODES = ("off", "instances", "samples")
+
+IMG_PLACEHOLDER = "<!-- IMG_PLACEHOLDER -->"
+
 
 def _build_alt_text(keyword, context, max_length=125):
     """Build SEO-optimized alt text: keyword + context, max max_length chars."""
@@ -64,9 +72,25 @@ def _get_section_title_from_outline(outline, index=0, from_end=False):
     return selected
 
 
+def _figure_html(media_url, alt):
+    escaped_alt = html_module.escape(alt, quote=True)
+    return f"<figure class='wp-block-image'><img src='{media_url}' alt='{escaped_alt}'/></figure>"
+
+
 class VisualAgent(BaseAgent):
     name = "visual"
 
+    def __init__(self, *args, batch_mode=None, **kwargs):
+        """
+        Args:
+            batch_mode: Imagen batching, one of IMAGEN_BATCH_MODES (default: IMAGEN_BATCH_MODE setting).
+        """
+        super().__init__(*args, **kwargs)
+        self.batch_mode = batch_mode or IMAGEN_BATCH_MODE
+        if self.batch_mode not in IMAGEN_BATCH_MODES:
+            logger.warning("Unknown IMAGEN_BATCH_MODE '%s'. Using 'off'.", self.batch_mode)
+            self.batch_mode = "off"
+
     def _build_prompt(self, input_data):
         article_context = input_data[:8000]
         return IMAGE_PROMPT_GENERATION.format(article_content=article_context)
@@ -74,49 +98,82 @@ class VisualAgent(BaseAgent):
     def _parse_response(self, raw_text, input_data=None):
         return raw_text
 
-    def generate_image(self, image_prompt):
-        """Executes image generation on Imagen API with key rotation."""
-        max_retries = len(self.llm.api_keys)
-        attempts = 0
-
-        while attempts < max_retries:
-            current_key = self.llm.api_keys[self.llm.current_key_index]
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/imagen-4.0-generate-001:predict?key={current_key}"
-            headers = {'Content-Type': 'application/json'}
-
-            payload = {
-                "instances": [{"prompt": image_prompt}],
-                "parameters": {
-                    "sampleCount": 1,
-                    "aspectRatio": "16:9"
-                }
-            }
+    def _predict(self, prompts, sample_count=1):
+        """One Imagen predict call.
 
-            try:
-                response = requests.post(url, headers=headers, json=payload)
-                if response.status_code != 200:
-                    logger.warning("Imagen API Error (Key #%d): status=%d", self.llm.current_key_index + 1, response.status_code)
-                    if response.status_code in [400, 401, 403, 429]:
-                        if self.llm._rotate_key():
-                            attempts += 1
-                            continue
-                    return None
+        The key comes from the LLM client's key pool (least-loaded key, through
+        its rate limiter); quota/auth errors move on to the next key. Safe to
+        call from several threads at once.
 
-                data = response.json()
-                if 'predictions' in data:
-                    for pred in data['predictions']:
-                        if 'bytesBase64Encoded' in pred:
-                            return pred['bytesBase64Encoded']
+        Returns:
+            List of base64 images in prediction order (None for filtered ones),
+            or None if the call failed.
+        """
+        payload = {
+            "instances": [{"prompt": prompt} for prompt in prompts],
+            "parameters": {
+                "sampleCount": sample_count,
+                "aspectRatio": "16:9",
+                # Filtered images come back as entries with a reason, keeping positions stable
+                "includeRaiReason": True,
+            }
+        }
+
+        def _request(key_index):
+            response = requests.post(IMAGEN_URL.format(key=self.llm.api_keys[key_index]),
+                                     headers={'Content-Type': 'application/json'},
+                                     json=payload, timeout=IMAGEN_TIMEOUT)
+            if response.status_code != 200:
+                logger.warning("Imagen API Error (Key #%d): status=%d", key_index + 1, response.status_code)
+                # Key-level errors (quota, auth, invalid key) — the pool benches this key and
+                # tries the next one. Other 400s (bad prompt, unsupported batch) are not the key's fault.
+                if response.status_code in (401, 403, 429) or (
+                        response.status_code == 400 and "API key" in response.text):
+                    raise Exception(f"Imagen API error {403 if response.status_code == 401 else response.status_code}")
                 return None
+            return [pred.get('bytesBase64Encoded') for pred in response.json().get('predictions', [])]
 
-            except Exception as e:
-                logger.error("Image Generation Connection Failed: %s", e)
-                if self.llm._rotate_key():
-                    attempts += 1
-                    continue
-                return None
+        try:
+            return self.llm._run_with_key_pool(_request)
+        except Exception as e:
+            logger.error("Image Generation Failed: %s", e)
+            return None
+
+    def generate_image(self, image_prompt):
+        """Generate one image on the Imagen API. Returns base64 data or None."""
+        images = self._predict([image_prompt])
+        return next((image for image in images or [] if image), None)
+
+    def generate_images(self, prompts):
+        """Generate one image per prompt with a single predict call (batch_mode).
 
-        return None
+        "instances" sends every prompt as its own instance; "samples" asks for
+        len(prompts) samples of the first prompt. Predictions map back to the
+        prompts by position. Slots the batch didn't fill (filtered image, short
+        or rejected response) are generated individually.
+
+        Returns:
+            List of base64 images (or None) aligned with prompts.
+        """
+        images = None
+        if self.batch_mode == "instances":
+            images = self._predict(prompts)
+        elif self.batch_mode == "samples":
+            images = self._predict(prompts[:1], sample_count=len(prompts))
+
+        if images is None or len(images) != len(prompts):
+            if images is not None:
+                logger.warning("Imagen batch returned %d images for %d slots. Filling individually.",
+                               len(images), len(prompts))
+            images = list(images or [])[:len(prompts)]
+            images += [None] * (len(prompts) - len(images))
+
+        missing = [i for i, image in enumerate(images) if not image]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                for i, image in zip(missing, pool.map(lambda i: self.generate_image(prompts[i]), missing)):
+                    images[i] = image
+        return images
 
     @staticmethod
     def _is_valid_image(filepath):
@@ -187,7 +244,7 @@ class VisualAgent(BaseAgent):
             return None, None
 
     def process_images(self, final_content, final_title, keyword, wp_client, knowledge_base_path,
-                        site_config=None, outline=None):
+                        site_config=None, outline=None, image_prompts=None):
         """Full image processing pipeline: generate prompts, create images, inject into HTML.
 
         Args:
@@ -198,6 +255,7 @@ class VisualAgent(BaseAgent):
             knowledge_base_path: Path to KB for author photos.
             site_config: Site configuration dict (for author_name, etc).
             outline: Outline dict from analyst (for section titles).
+            image_prompts: Prompts already generated by the pipeline (skips the LLM call).
 
         Returns:
             (updated_content, featured_media_id, images_failed_count)
@@ -206,101 +264,95 @@ class VisualAgent(BaseAgent):
         featured_media_id = None
         slug = keyword.replace(" ", "-").lower()[:30]
 
-        # Generate prompts
+        # Generate prompts (unless the pipeline already did, concurrently with SEO scoring)
         logger.info("  5. Visual Agent: Generating Editorial Images...")
-        result = self.execute(final_content)
-        if not result.success:
-            logger.warning("     Image prompt generation failed. Publishing without images.")
-            return final_content, None, 3
-
-        prompts_list = [p.strip() for p in result.content.split('|||') if p.strip()]
-
-        # IMAGE 1: AI-Generated Cover
-        if len(prompts_list) >= 1:
-            logger.info("     Image 1 (Cover): Generating AI editorial image...")
-            try:
-                b64_image = self.generate_image(prompts_list[0])
-                if b64_image:
-                    image_data = base64.b64decode(b64_image)
-                    filename = f"{slug}-capa.png"
-                    cover_alt = _build_alt_text(keyword, final_title)
-                    media_id, media_url = wp_client.upload_media(image_data, filename, alt_text=cover_alt)
-                    featured_media_id = media_id
-                    logger.info("     Featured Image Set (ID: %s, alt: '%s')", media_id, cover_alt[:50])
-                else:
-                    logger.warning("     Cover image generation returned empty. Publishing without featured image.")
-                    images_failed += 1
-            except Exception as img_err:
-                logger.warning("     Cover image failed: %s. Publishing without featured image.", img_err)
-                images_failed += 1
-
-        # IMAGE 2: AI-Generated Body Image
-        if len(prompts_list) >= 2:
-            logger.info("     Image 2 (Body): Generating AI editorial image...")
+        if image_prompts is not None:
+            prompts_list = image_prompts
+        else:
+            result = self.execute(final_content)
+            if not result.success:
+                logger.warning("     Image prompt generation failed. Publishing without images.")
+                return final_content, None, 3
+            prompts_list = [p.strip() for p in result.content.split('|||') if p.strip()]
+
+        # Cover, body and final images are generated and uploaded concurrently;
+        # each upload starts as soon as its own image arrives.
+        first_section = _get_section_title_from_outline(outline, index=0)
+        last_section = _get_section_title_from_outline(outline, from_end=True)
+        slots = [
+            ("Cover", f"{slug}-capa.png", _build_alt_text(keyword, final_title)),
+            ("Body", f"{slug}-corpo.png", _build_alt_text(keyword, first_section or final_title)),
+            ("Final", f"{slug}-final.png", _build_alt_text(keyword, last_section or final_title)),
+        ][:len(prompts_list)]
+
+        # Batched mode: one predict call for all slots, then concurrent uploads
+        batched = None
+        if self.batch_mode != "off" and len(slots) > 1:
+            logger.info("     Generating %d images in one Imagen request (%s mode)...", len(slots), self.batch_mode)
+            batched = self.generate_images(prompts_list[:len(slots)])
+
+        def _generate_and_upload(index):
+            label, filename, alt = slots[index]
             try:
-                b64_image = self.generate_image(prompts_list[1])
-                if b64_image:
-                    image_data = base64.b64decode(b64_image)
-                    filename = f"{slug}-corpo.png"
-                    first_section = _get_section_title_from_outline(outline, index=0)
-                    body_alt = _build_alt_text(keyword, first_section or final_title)
-                    media_id, media_url = wp_client.upload_media(image_data, filename, alt_text=body_alt)
-
-                    escaped_alt = html_module.escape(body_alt, quote=True)
-                    body_img_html = f"<figure class='wp-block-image'><img src='{media_url}' alt='{escaped_alt}'/></figure>"
-
-                    if "<!-- IMG_PLACEHOLDER -->" in final_content:
-                        final_content = final_content.replace("<!-- IMG_PLACEHOLDER -->", body_img_html, 1)
-                        logger.info("     Body image injected into placeholder.")
-                    else:
-                        h2_match = re.search(r'(</h2>)', final_content)
-                        if h2_match:
-                            insert_pos = h2_match.end()
-                            final_content = final_content[:insert_pos] + "\n" + body_img_html + "\n" + final_content[insert_pos:]
-                            logger.info("     Body image inserted after first H2.")
-                        else:
-                            final_content += "\n" + body_img_html
-                            logger.info("     Body image appended to end.")
+                if batched is not None:
+                    b64_image = batched[index]
                 else:
-                    logger.warning("     Body image generation returned empty. Continuing without it.")
-                    images_failed += 1
+                    logger.info("     Image %d (%s): Generating AI editorial image...", index + 1, label)
+                    b64_image = self.generate_image(prompts_list[index])
+                if not b64_image:
+                    logger.warning("     %s image generation returned empty.", label)
+                    return None
+                return wp_client.upload_media(base64.b64decode(b64_image), filename, alt_text=alt)
             except Exception as img_err:
-                logger.warning("     Body image failed: %s. Continuing without it.", img_err)
-                images_failed += 1
+                logger.warning("     %s image failed: %s", label, img_err)
+                return None
 
-        # IMAGE 3: AI-Generated Final
-        if len(prompts_list) >= 3:
-            logger.info("     Image 3 (Final): Generating AI editorial image...")
-            try:
-                b64_image = self.generate_image(prompts_list[2])
-                if b64_image:
-                    image_data = base64.b64decode(b64_image)
-                    filename = f"{slug}-final.png"
-                    last_section = _get_section_title_from_outline(outline, from_end=True)
-                    final_alt = _build_alt_text(keyword, last_section or final_title)
-                    media_id, media_url = wp_client.upload_media(image_data, filename, alt_text=final_alt)
-
-                    escaped_alt = html_module.escape(final_alt, quote=True)
-                    final_img_html = f"<figure class='wp-block-image'><img src='{media_url}' alt='{escaped_alt}'/></figure>"
-
-                    if "<!-- IMG_PLACEHOLDER -->" in final_content:
-                        final_content = final_content.replace("<!-- IMG_PLACEHOLDER -->", final_img_html, 1)
-                        logger.info("     Final image injected into placeholder.")
-                    else:
-                        if '<div class="cta-box">' in final_content:
-                            final_content = final_content.replace(
-                                '<div class="cta-box">',
-                                final_img_html + '\n<div class="cta-box">'
-                            )
-                            logger.info("     Final image inserted before CTA.")
-                        else:
-                            final_content += "\n" + final_img_html
-                            logger.info("     Final image appended to end.")
-                else:
-                    logger.warning("     Final image generation returned empty. Publishing without it.")
-                    images_failed += 1
-            except Exception as img_err:
-                logger.warning("     Final image failed: %s. Publishing without it.", img_err)
+        if slots:
+            with ThreadPoolExecutor(max_workers=len(slots)) as pool:
+                uploads = list(pool.map(_generate_and_upload, range(len(slots))))
+        else:
+            uploads = []
+
+        # Injection runs in a fixed order (body, then final) whatever finished first
+        for index, upload in enumerate(uploads):
+            label, _, alt = slots[index]
+            media_id, media_url = upload or (None, None)
+            if not media_id:
                 images_failed += 1
+                logger.warning("     %s image unavailable. Continuing without it.", label)
+                continue
+            if index == 0:
+                featured_media_id = media_id
+                logger.info("     Featured Image Set (ID: %s, alt: '%s')", media_id, alt[:50])
+            elif index == 1:
+                final_content = self._inject_body_image(final_content, _figure_html(media_url, alt))
+            else:
+                final_content = self._inject_final_image(final_content, _figure_html(media_url, alt))
 
         return final_content, featured_media_id, images_failed
+
+    @staticmethod
+    def _inject_body_image(content, img_html):
+        """Body image: first placeholder, else after the first H2, else at the end."""
+        if IMG_PLACEHOLDER in content:
+            logger.info("     Body image injected into placeholder.")
+            return content.replace(IMG_PLACEHOLDER, img_html, 1)
+        h2_match = re.search(r'(</h2>)', content)
+        if h2_match:
+            insert_pos = h2_match.end()
+            logger.info("     Body image inserted after first H2.")
+            return content[:insert_pos] + "\n" + img_html + "\n" + content[insert_pos:]
+        logger.info("     Body image appended to end.")
+        return content + "\n" + img_html
+
+    @staticmethod
+    def _inject_final_image(content, img_html):
+        """Final image: next placeholder, else before the CTA box, else at the end."""
+        if IMG_PLACEHOLDER in content:
+            logger.info("     Final image injected into placeholder.")
+            return content.replace(IMG_PLACEHOLDER, img_html, 1)
+        if '<div class="cta-box">' in content:
+            logger.info("     Final image inserted before CTA.")
+            return content.replace('<div class="cta-box">', img_html + '\n<div class="cta-box">')
+        logger.info("     Final image appended to end.")
+        return content + "\n" + img_html
@@ -3,6 +3,19 @@ import json
 from core.agents.base import BaseAgent
 
 
+def _build_kb_query(outline_json):
+    """Collect title, headings and keyword variations as the KB retrieval query."""
+    parts = [outline_json.get('title', '')]
+    for section in outline_json.get('outline', []) or outline_json.get('sections', []):
+        if isinstance(section, dict):
+            parts.extend(str(v) for k, v in section.items() if k.lower() in ('h2', 'h3', 'title', 'heading'))
+        else:
+            parts.append(str(section))
+    parts.extend(outline_json.get('keyword_variations', []))
+    parts.extend(outline_json.get('lsi_keywords', []))
+    return " ".join(p for p in parts if p)
+
+
 class WriterAgent(BaseAgent):
     name = "writer"
 
@@ -17,11 +30,11 @@ class WriterAgent(BaseAgent):
             site_config = {}
             outline_json = input_data
 
-        kb_text = self._load_kb()
-
         keyword_variations = outline_json.get('keyword_variations', [])
         lsi_keywords = outline_json.get('lsi_keywords', [])
 
+        kb_text = self._load_kb(query=_build_kb_query(outline_json))
+
         # Use PromptEngine if available
         if self.prompt_engine:
             return self.prompt_engine.render("writer", {
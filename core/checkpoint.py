@@ -0,0 +1,126 @@
+"""CheckpointStore — Persists pipeline stage outputs so failed runs resume where they stopped."""
+import hashlib
+import json
+import os
+import threading
+import time
+from core.dry_run import slugify
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = ".cache/checkpoints"
+
+
+def make_run_id(tenant_id, keyword):
+    """Stable run ID for a tenant+keyword (readable slug plus a short hash)."""
+    normalized = keyword.strip().lower()
+    digest = hashlib.sha1(f"{tenant_id}\0{normalized}".encode("utf-8")).hexdigest()[:12]
+    return f"{slugify(normalized)[:60]}-{digest}"
+
+
+class CheckpointStore:
+    """Stores each completed stage (serp, outline, draft, ...) as JSON on disk.
+
+    One file per run at {base_dir}/{tenant_id}/{run_id}.json. A rerun — or an
+    rq retry — of the same tenant+keyword loads it and skips finished stages.
+    Checkpoints older than ttl seconds are ignored. Thread-safe.
+    """
+
+    def __init__(self, base_dir=DEFAULT_CHECKPOINT_DIR, ttl=24 * 3600):
+        """
+        Args:
+            base_dir: Directory holding checkpoint files.
+            ttl: Seconds after which a checkpoint is considered stale (default: 24h).
+        """
+        self.base_dir = base_dir
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def _path(self, tenant_id, keyword):
+        return os.path.join(self.base_dir, slugify(tenant_id) or "default", f"{make_run_id(tenant_id, keyword)}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+            return None
+        if time.time() - data.get("updated_at", 0) > self._ttl:
+            logger.info("Checkpoint %s is stale. Starting fresh.", path)
+            return None
+        return data
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # atomic — a crash never leaves a half-written checkpoint
+
+    def load(self, tenant_id, keyword):
+        """Return {stage_name: output} for a run (empty dict if none)."""
+        with self._lock:
+            data = self._read(self._path(tenant_id, keyword))
+        return dict(data["stages"]) if data else {}
+
+    def save(self, tenant_id, keyword, stage, output):
+        """Persist one stage's output (must be JSON-serializable)."""
+        path = self._path(tenant_id, keyword)
+        with self._lock:
+            data = self._read(path) or {
+                "run_id": make_run_id(tenant_id, keyword),
+                "tenant_id": tenant_id,
+                "keyword": keyword,
+                "stages": {},
+            }
+            data["stages"][stage] = output
+            data["updated_at"] = time.time()
+            try:
+                self._write(path, data)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("Could not save checkpoint '%s' for '%s': %s", stage, keyword, e)
+
+    def discard(self, tenant_id, keyword, *stages):
+        """Drop specific stages so the next run redoes them."""
+        path = self._path(tenant_id, keyword)
+        with self._lock:
+            data = self._read(path)
+            if not data:
+                return
+            for stage in stages:
+                data["stages"].pop(stage, None)
+            data["updated_at"] = time.time()
+            try:
+                self._write(path, data)
+            except OSError as e:
+                logger.warning("Could not update checkpoint for '%s': %s", keyword, e)
+
+    def clear(self, tenant_id, keyword):
+        """Remove a run's checkpoint (call once the article is published/saved)."""
+        path = self._path(tenant_id, keyword)
+        with self._lock:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not remove checkpoint %s: %s", path, e)
+
+
+def create_checkpoint_store(enabled=None):
+    """Return a CheckpointStore configured from settings, or None when disabled.
+
+    Args:
+        enabled: Force on/off (default: CHECKPOINT_ENABLED setting).
+    """
+    from config.settings import CHECKPOINT_ENABLED, CHECKPOINT_DIR, CHECKPOINT_TTL
+
+    if enabled is None:
+        enabled = CHECKPOINT_ENABLED
+    if not enabled:
+        return None
+    return CheckpointStore(CHECKPOINT_DIR, ttl=CHECKPOINT_TTL)
@@ -2,7 +2,7 @@
 import json
 import time
 import os
-from core.integrations.gsc_client import get_article_performance, get_keyword_performance
+from core.integrations.gsc_client import get_article_performance, get_keyword_performance, date_window
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,11 +12,17 @@ class PerformanceDashboard:
     """Aggregates metrics from GSC, WordPress, and pipeline data."""
 
     def __init__(self, wp_client=None, gsc_property_url=None, sheets_client=None,
-                 spreadsheet_id=None):
+                 spreadsheet_id=None, gsc_store=None):
+        """
+        Args:
+            gsc_store: Optional GSCStore — GSC metrics are computed from the local
+                       daily store, which only downloads the days it is missing.
+        """
         self.wp = wp_client
         self.gsc_url = gsc_property_url or os.getenv("GSC_PROPERTY_URL", "")
         self.sheets = sheets_client
         self.spreadsheet_id = spreadsheet_id
+        self.gsc_store = gsc_store
 
     def generate_report(self, days=28):
         """Generate a comprehensive performance report.
@@ -52,9 +58,11 @@ class PerformanceDashboard:
             return {"total": 0, "source": "unavailable"}
 
         try:
-            posts = self.wp.get_posts()
+            total = self.wp.count_posts()
+            if total is None:
+                total = len(self.wp.get_posts(fields=["id"]))
             return {
-                "total": len(posts),
+                "total": total,
                 "source": "wordpress",
             }
         except Exception as e:
@@ -67,8 +75,8 @@ class PerformanceDashboard:
             return {"source": "unavailable", "reason": "GSC_PROPERTY_URL not configured"}
 
         try:
-            pages = get_article_performance(self.gsc_url, days)
-            keywords = get_keyword_performance(self.gsc_url, days)
+            pages = get_article_performance(self.gsc_url, days, store=self.gsc_store)
+            keywords = get_keyword_performance(self.gsc_url, days, store=self.gsc_store)
 
             if not pages:
                 return {"source": "no_data"}
@@ -85,7 +93,7 @@ class PerformanceDashboard:
             page2 = [p for p in pages if 11 <= p['position'] <= 20]
             page2.sort(key=lambda x: x['impressions'], reverse=True)
 
-            return {
+            metrics = {
                 "source": "gsc",
                 "total_clicks": total_clicks,
                 "total_impressions": total_impressions,
@@ -96,6 +104,9 @@ class PerformanceDashboard:
                 "top5_by_clicks": top5,
                 "page2_opportunities": page2[:10],
             }
+            if self.gsc_store is not None:
+                metrics["daily"] = self.gsc_store.daily_totals(self.gsc_url, *date_window(days))
+            return metrics
         except Exception as e:
             logger.warning("Failed to get GSC metrics: %s", e)
             return {"source": "error", "error": str(e)}
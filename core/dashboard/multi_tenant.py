@@ -3,6 +3,7 @@ import json
 import time
 from core.tenant_config import TenantConfig
 from core.dashboard.dashboard import PerformanceDashboard
+from core.integrations.gsc_store import create_gsc_store
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,6 +14,7 @@ class MultiTenantDashboard:
 
     def __init__(self):
         self.tenants = TenantConfig.list_all()
+        self.gsc_store = create_gsc_store()
 
     def generate_unified_report(self, days=28):
         """Generate a report covering all tenants.
@@ -33,6 +35,7 @@ class MultiTenantDashboard:
                 tc = TenantConfig.load(tenant_id)
                 dashboard = PerformanceDashboard(
                     gsc_property_url=tc.wordpress_url,
+                    gsc_store=self.gsc_store,
                 )
                 report = dashboard.generate_report(days)
                 tenant_reports[tenant_id] = report
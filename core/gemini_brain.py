@@ -43,12 +43,6 @@ class GeminiBrain:
 
     # --- Key management (delegated) ---
 
-    def _configure_current_key(self):
-        self.llm._configure_current_key()
-
-    def _rotate_key(self):
-        return self.llm._rotate_key()
-
     def _execute_with_retry(self, func, *args, **kwargs):
         return self.llm.execute_with_retry(func, *args, **kwargs)
 
@@ -0,0 +1,356 @@
+"""HtmlDocument — Parse article HTML once and apply post-processing passes to the token stream.
+
+The pipeline tail (image placement, TOC, internal links, WhatsApp tracking,
+FAQ extraction) used to rescan and copy the whole document once per step.
+Here the article is tokenized once, each pass edits the shared token list,
+and render() serializes it once at the end.
+
+Usage:
+    doc = HtmlDocument(html)
+    place_image_placeholders(doc)
+    inserted = insert_internal_links(doc, links_strategy)
+    faq_items = extract_faq_items(doc)
+    html = doc.render()
+"""
+import bisect
+import re
+from core.seo.internal_links import ProtectedSpans
+from core.seo.topic_clusters import build_toc_html, heading_slug
+
+IMG_PLACEHOLDER = "<!-- IMG_PLACEHOLDER -->"
+
+TEXT, TAG, COMMENT = "text", "tag", "comment"
+
+_TOKEN_RE = re.compile(r"<!--.*?-->|<[^>]*>|[^<]+|<", re.DOTALL)
+_TAG_NAME_RE = re.compile(r"<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9]*)")
+_PLACEHOLDER_RE = re.compile(r"<!--\s*IMG_PLACEHOLDER\s*-->")
+_FAQ_HEADING_RE = re.compile(r"FAQ|Perguntas\s+Frequentes|Dúvidas\s+Frequentes", re.IGNORECASE)
+_WA_HREF_RE = re.compile(r'(href="https://wa\.me/[^"]*?)(")')
+
+# Links are never inserted inside these elements (or inside a .cta-box)
+_PROTECTED_TAGS = ("a", "h1", "h2", "h3", "script", "style")
+
+
+class Token:
+    """One piece of the document: a text run, a tag, or a comment."""
+    __slots__ = ("kind", "raw", "name", "closing", "protected")
+
+    def __init__(self, kind, raw, name="", closing=False):
+        self.kind = kind
+        self.raw = raw
+        self.name = name
+        self.closing = closing
+        self.protected = False
+
+    def is_open(self, name):
+        return self.kind == TAG and not self.closing and self.name == name
+
+    def is_close(self, name):
+        return self.kind == TAG and self.closing and self.name == name
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.raw!r})"
+
+
+def tokenize(html):
+    """Split HTML into Tokens in a single regex scan."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(html):
+        raw = match.group(0)
+        if raw.startswith("<!--"):
+            tokens.append(Token(COMMENT, raw))
+            continue
+        tag = _TAG_NAME_RE.match(raw) if raw.startswith("<") else None
+        if tag:
+            tokens.append(Token(TAG, raw, tag.group(2).lower(), bool(tag.group(1))))
+        else:
+            tokens.append(Token(TEXT, raw))
+    return tokens
+
+
+def _text_of(tokens, tag_separator=""):
+    return tag_separator.join(t.raw if t.kind == TEXT else tag_separator for t in tokens if t.kind != COMMENT)
+
+
+class HtmlDocument:
+    """Token list for one article. Passes mutate .tokens; render() joins them once."""
+
+    def __init__(self, html):
+        self.tokens = tokenize(html or "")
+
+    def render(self):
+        return "".join(t.raw for t in self.tokens)
+
+    def find(self, predicate, start=0):
+        """Index of the first token matching predicate at or after start, or -1."""
+        for i in range(start, len(self.tokens)):
+            if predicate(self.tokens[i]):
+                return i
+        return -1
+
+    def insert_html(self, index, html):
+        """Insert an HTML fragment before tokens[index]."""
+        self.tokens[index:index] = tokenize(html)
+
+    def element_text(self, open_index):
+        """Plain text of the element opened at open_index, and the index of its closing tag."""
+        name = self.tokens[open_index].name
+        close_index = self.find(lambda t: t.is_close(name), open_index + 1)
+        end = close_index if close_index != -1 else len(self.tokens)
+        return _text_of(self.tokens[open_index + 1:end]).strip(), close_index
+
+    def normalize_text(self):
+        """Merge adjacent text tokens and collapse 3+ newlines (after removals)."""
+        merged = []
+        for token in self.tokens:
+            if token.kind == TEXT and merged and merged[-1].kind == TEXT:
+                merged[-1].raw += token.raw
+            else:
+                merged.append(token)
+        for token in merged:
+            if token.kind == TEXT and "\n\n\n" in token.raw:
+                token.raw = re.sub(r"\n{3,}", "\n\n", token.raw)
+        self.tokens = [t for t in merged if t.kind != TEXT or t.raw]
+
+    def mark_protected(self):
+        """Flag text tokens inside <a>, H1-H3 or a .cta-box element."""
+        depth = dict.fromkeys(_PROTECTED_TAGS, 0)
+        cta_name, cta_depth = None, 0
+        for token in self.tokens:
+            if token.kind == TAG:
+                if token.name in depth:
+                    depth[token.name] = max(0, depth[token.name] + (-1 if token.closing else 1))
+                if cta_depth:
+                    if token.name == cta_name:
+                        cta_depth += -1 if token.closing else 1
+                elif not token.closing and "cta-box" in token.raw:
+                    cta_name, cta_depth = token.name, 1
+            elif token.kind == TEXT:
+                token.protected = bool(cta_depth) or any(depth.values())
+
+
+# ──────────────────────────────────────────────
+# Passes
+# ──────────────────────────────────────────────
+
+def remove_placeholders(doc):
+    """Drop every IMG_PLACEHOLDER comment (whitespace variants included)."""
+    doc.tokens = [t for t in doc.tokens if not (t.kind == COMMENT and _PLACEHOLDER_RE.fullmatch(t.raw))]
+    doc.normalize_text()
+
+
+def place_image_placeholders(doc):
+    """Token-stream version of pipeline.fix_image_placement().
+
+    Leaves exactly 2 placeholders: before the 3rd H2 (or the 2nd if there are
+    only 2), and before the CTA box (or the last H2 when there are 4+, else at the end).
+    """
+    remove_placeholders(doc)
+
+    h2_indexes = [i for i, t in enumerate(doc.tokens) if t.is_open("h2")]
+    if len(h2_indexes) < 2:
+        return
+
+    cta_index = doc.find(lambda t: t.is_open("div") and t.raw == '<div class="cta-box">')
+    pos1 = h2_indexes[2] if len(h2_indexes) >= 3 else h2_indexes[1]
+    if cta_index > 0:
+        pos2 = cta_index
+    elif len(h2_indexes) >= 4:
+        pos2 = h2_indexes[-1]
+    else:
+        pos2 = len(doc.tokens)
+    if pos2 <= pos1:
+        pos2 = len(doc.tokens)
+
+    # Insert the later one first so pos1 stays valid
+    doc.insert_html(pos2, "\n" + IMG_PLACEHOLDER + "\n\n")
+    doc.insert_html(pos1, IMG_PLACEHOLDER + "\n\n")
+
+
+def insert_toc(doc):
+    """Token-stream version of topic_clusters.inject_toc(): TOC after the first H2, ids on H2s.
+
+    Returns:
+        True if a TOC was inserted.
+    """
+    headings = []
+    h2_indexes = [i for i, t in enumerate(doc.tokens) if t.is_open("h2")]
+    for i in h2_indexes:
+        text, _ = doc.element_text(i)
+        headings.append(text)
+
+    toc = build_toc_html(headings)
+    if not toc:
+        return False
+
+    for i, text in zip(h2_indexes, headings):
+        token = doc.tokens[i]
+        if token.raw.lower() == "<h2>":
+            token.raw = f'<h2 id="{heading_slug(text)}">'
+
+    first_close = doc.find(lambda t: t.is_close("h2"))
+    if first_close != -1:
+        doc.insert_html(first_close + 1, "\n" + toc + "\n")
+    return True
+
+
+class _LinkableText:
+    """The unprotected text tokens of a document joined into one searchable string.
+
+    Tokens are separated by NUL, so a match never spans a tag. Chosen links
+    go into a ProtectedSpans index, so later anchors cannot land inside them,
+    and apply() splices every link into the token list in a single rebuild.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.indexes = [i for i, t in enumerate(doc.tokens) if t.kind == TEXT and not t.protected]
+        self.offsets = []
+        offset = 0
+        for i in self.indexes:
+            self.offsets.append(offset)
+            offset += len(doc.tokens[i].raw) + 1
+        self.text = "\0".join(doc.tokens[i].raw for i in self.indexes)
+        self.links = ProtectedSpans()
+        self.insertions = []  # (start, end, url)
+
+    def link_first_occurrence(self, anchor, url):
+        """Reserve the first unlinked occurrence of anchor (case-insensitive) for url."""
+        pattern = re.compile(re.escape(anchor), re.IGNORECASE)
+        pos = 0
+        while True:
+            match = pattern.search(self.text, pos)
+            if match is None:
+                return False
+            if not self.links.overlaps(match.start(), match.end()):
+                self.links.add(match.start(), match.end())
+                self.insertions.append((match.start(), match.end(), url))
+                return True
+            pos = match.start() + 1
+
+    def apply(self):
+        """Wrap every reserved span in an <a> tag."""
+        if not self.insertions:
+            return
+        by_token = {}
+        for start, end, url in sorted(self.insertions):
+            k = bisect.bisect_right(self.offsets, start) - 1
+            base = self.offsets[k]
+            by_token.setdefault(self.indexes[k], []).append((start - base, end - base, url))
+
+        tokens = []
+        for i, token in enumerate(self.doc.tokens):
+            spans = by_token.get(i)
+            if spans is None:
+                tokens.append(token)
+                continue
+            cursor = 0
+            for start, end, url in spans:
+                link_text = Token(TEXT, token.raw[start:end])
+                link_text.protected = True
+                tokens += [Token(TEXT, token.raw[cursor:start]), Token(TAG, f'<a href="{url}">', "a"),
+                           link_text, Token(TAG, "</a>", "a", closing=True)]
+                cursor = end
+            tokens.append(Token(TEXT, token.raw[cursor:]))
+        self.doc.tokens = [t for t in tokens if t.kind != TEXT or t.raw]
+
+
+def insert_internal_links(doc, links_strategy, max_links=5, cluster_links=None):
+    """Token-stream version of internal_links.inject_internal_links().
+
+    Cluster links go first; strategy links fall back to their first 2 words.
+    Text inside links, H1-H3 and the CTA box is never linked. As in
+    inject_internal_links(), the linkable text is indexed once and all links
+    are spliced in a single rebuild at the end.
+
+    Returns:
+        Number of links inserted.
+    """
+    doc.mark_protected()
+    text = _LinkableText(doc)
+    inserted = 0
+
+    for link_item in cluster_links or []:
+        if inserted >= max_links:
+            break
+        anchor = link_item.get('text', '').strip()
+        url = link_item.get('url', '').strip()
+        if anchor and url and text.link_first_occurrence(anchor, url):
+            inserted += 1
+
+    for link_item in links_strategy or []:
+        if inserted >= max_links:
+            break
+        anchor = link_item.get('text', '').strip()
+        url = link_item.get('url', '').strip()
+        if not anchor or not url:
+            continue
+        if text.link_first_occurrence(anchor, url):
+            inserted += 1
+            continue
+        words = anchor.split()
+        if len(words) >= 2 and text.link_first_occurrence(' '.join(words[:2]), url):
+            inserted += 1
+
+    text.apply()
+    return inserted
+
+
+def add_whatsapp_tracking(doc, article_slug):
+    """Append text=Vim+do+artigo+{slug} to wa.me links that have no text param."""
+    if not article_slug:
+        return
+    tracking_param = f"text=Vim+do+artigo+{article_slug}"
+    for token in doc.tokens:
+        if token.is_open("a") and "wa.me/" in token.raw:
+            token.raw = _WA_HREF_RE.sub(
+                lambda m: m.group(1) + ('&' if '?' in m.group(1) else '?') + tracking_param + m.group(2)
+                if 'text=' not in m.group(1) else m.group(0),
+                token.raw,
+            )
+
+
+def extract_faq_items(doc):
+    """Token-stream version of schema.extract_faq_from_html().
+
+    Finds the H2/H3 FAQ heading, then pairs each H3 question with the text
+    that follows it, up to the next H2.
+
+    Returns:
+        List of {"question": str, "answer": str}.
+    """
+    tokens = doc.tokens
+    start = -1
+    for i, token in enumerate(tokens):
+        if token.kind == TAG and not token.closing and token.name in ("h2", "h3"):
+            text, close_index = doc.element_text(i)
+            if _FAQ_HEADING_RE.search(text):
+                start = close_index + 1 if close_index != -1 else len(tokens)
+                break
+    if start == -1:
+        return []
+
+    end = doc.find(lambda t: t.is_open("h2"), start)
+    section = tokens[start:end if end != -1 else len(tokens)]
+
+    items = []
+    question, answer_tokens, in_question = None, [], False
+    for token in section:
+        if token.is_open("h3"):
+            if question is not None:
+                items.append((question, answer_tokens))
+            question, answer_tokens, in_question = [], [], True
+        elif token.is_close("h3") and in_question:
+            in_question = False
+        elif question is not None:
+            (question if in_question else answer_tokens).append(token)
+    if question is not None:
+        items.append((question, answer_tokens))
+
+    faq = []
+    for question_tokens, answer in items:
+        question_text = _text_of(question_tokens).strip()
+        answer_text = re.sub(r"\s+", " ", _text_of(answer, " ").strip())
+        if question_text and answer_text:
+            faq.append({"question": question_text, "answer": answer_text})
+    return faq
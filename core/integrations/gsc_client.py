@@ -1,6 +1,7 @@
 """Google Search Console client — Fetches performance data for articles."""
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import date, timedelta
 from dotenv import load_dotenv
 from core.logger import get_logger
 
@@ -9,14 +10,41 @@ load_dotenv(override=True)
 logger = get_logger(__name__)
 
 GSC_SCOPES = ['https://www.googleapis.com/auth/webmasters.readonly']
+GSC_ROW_LIMIT = 25000  # API maximum per searchanalytics.query page
+
+# Built services per credentials file, shared by every GSC helper in the process
+_services = {}
+_services_lock = threading.Lock()
 
 
 def _get_gsc_service(service_account_path='config/service_account.json'):
-    """Build GSC API service using service account credentials.
+    """Return the process-wide GSC API service for a service account file.
+
+    The first call loads the credentials and builds the client from the
+    discovery document bundled with google-api-python-client (no discovery
+    fetch); later calls — from the dashboard, the freshness engine or any
+    helper below — reuse it. Failures are not cached.
 
     Returns:
         Google Search Console API service, or None on failure.
     """
+    key = os.path.abspath(service_account_path)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _build_gsc_service(service_account_path)
+            if service is not None:
+                _services[key] = service
+        return service
+
+
+def clear_gsc_services():
+    """Drop cached services (e.g. after rotating the service account key)."""
+    with _services_lock:
+        _services.clear()
+
+
+def _build_gsc_service(service_account_path):
     try:
         from google.oauth2 import service_account
         from googleapiclient.discovery import build
@@ -24,7 +52,9 @@ def _get_gsc_service(service_account_path='config/service_account.json'):
         credentials = service_account.Credentials.from_service_account_file(
             service_account_path, scopes=GSC_SCOPES
         )
-        service = build('searchconsole', 'v1', credentials=credentials)
+        service = build('searchconsole', 'v1', credentials=credentials,
+                        static_discovery=True, cache_discovery=False)
+        logger.info("GSC service built for %s", service_account_path)
         return service
     except ImportError:
         logger.warning("google-api-python-client not installed. GSC integration unavailable.")
@@ -34,113 +64,119 @@ def _get_gsc_service(service_account_path='config/service_account.json'):
         return None
 
 
-def get_article_performance(property_url, days=28, service_account_path='config/service_account.json'):
-    """Fetch performance data for all pages from Google Search Console.
+def date_window(days, offset_days=0):
+    """(start, end) dates of a `days`-long window ending offset_days before today (inclusive)."""
+    end = date.today() - timedelta(days=offset_days)
+    return end - timedelta(days=days - 1), end
 
-    Args:
-        property_url: GSC property URL (e.g., 'https://mjesus.com.br').
-        days: Number of days to look back.
-        service_account_path: Path to service account JSON.
+
+def query_search_analytics(service, property_url, start_date, end_date, dimensions, row_limit=GSC_ROW_LIMIT):
+    """Run a searchanalytics query, following startRow until every row is read.
 
     Returns:
-        List of dicts with keys: page, clicks, impressions, ctr, position.
-        Empty list on failure.
+        List of raw API rows ({'keys': [...], 'clicks', 'impressions', 'ctr', 'position'}).
+        Raises on API errors.
     """
-    if not property_url:
-        property_url = os.getenv("GSC_PROPERTY_URL", "")
-    if not property_url:
-        logger.warning("GSC_PROPERTY_URL not configured. Skipping GSC data.")
-        return []
-
-    service = _get_gsc_service(service_account_path)
-    if not service:
-        return []
-
-    end_date = datetime.now().strftime('%Y-%m-%d')
-    start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-
-    try:
+    rows = []
+    start_row = 0
+    while True:
         response = service.searchanalytics().query(
             siteUrl=property_url,
             body={
-                'startDate': start_date,
-                'endDate': end_date,
-                'dimensions': ['page'],
-                'rowLimit': 500,
+                'startDate': str(start_date),
+                'endDate': str(end_date),
+                'dimensions': list(dimensions),
+                'rowLimit': row_limit,
+                'startRow': start_row,
             }
         ).execute()
+        page = response.get('rows', [])
+        rows.extend(page)
+        if len(page) < row_limit:
+            return rows
+        start_row += row_limit
 
-        results = []
-        for row in response.get('rows', []):
-            results.append({
-                'page': row['keys'][0],
-                'clicks': row.get('clicks', 0),
-                'impressions': row.get('impressions', 0),
-                'ctr': round(row.get('ctr', 0) * 100, 2),
-                'position': round(row.get('position', 0), 1),
-            })
-
-        logger.info("GSC data fetched: %d pages, %s to %s", len(results), start_date, end_date)
-        return results
-
-    except Exception as e:
-        logger.warning("GSC query failed: %s", e)
-        return []
 
+def _format_row(name, value, row):
+    return {
+        name: value,
+        'clicks': row.get('clicks', 0),
+        'impressions': row.get('impressions', 0),
+        'ctr': round(row.get('ctr', 0) * 100, 2),
+        'position': round(row.get('position', 0), 1),
+    }
 
-def get_keyword_performance(property_url, days=28, service_account_path='config/service_account.json'):
-    """Fetch performance data by query (keyword) from GSC.
 
-    Returns:
-        List of dicts with keys: query, clicks, impressions, ctr, position.
-    """
+def _get_performance(dimension, property_url, days, service_account_path, store, offset_days):
+    """Per-page or per-query metrics for the window — from the local store when given."""
     if not property_url:
         property_url = os.getenv("GSC_PROPERTY_URL", "")
     if not property_url:
+        logger.warning("GSC_PROPERTY_URL not configured. Skipping GSC data.")
         return []
 
-    service = _get_gsc_service(service_account_path)
+    start_date, end_date = date_window(days, offset_days)
+
+    service = None
+    if store is not None:
+        if store.missing_days(property_url, start_date, end_date, dimension):
+            service = _get_gsc_service(service_account_path)
+        if service is None or store.sync(service, property_url, start_date, end_date, dimension) is not None:
+            return store.performance(property_url, start_date, end_date, dimension)
+        # A partial sync would aggregate an incomplete window
+        logger.warning("GSC store sync failed for %s; querying %s data directly.", property_url, dimension)
+
+    service = service or _get_gsc_service(service_account_path)
     if not service:
         return []
+    try:
+        rows = query_search_analytics(service, property_url, start_date, end_date, [dimension])
+    except Exception as e:
+        logger.warning("GSC %s query failed: %s", dimension, e)
+        return []
 
-    end_date = datetime.now().strftime('%Y-%m-%d')
-    start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    results = [_format_row(dimension, row['keys'][0], row) for row in rows]
+    logger.info("GSC data fetched: %d %s rows, %s to %s", len(results), dimension, start_date, end_date)
+    return results
 
-    try:
-        response = service.searchanalytics().query(
-            siteUrl=property_url,
-            body={
-                'startDate': start_date,
-                'endDate': end_date,
-                'dimensions': ['query'],
-                'rowLimit': 1000,
-            }
-        ).execute()
 
-        results = []
-        for row in response.get('rows', []):
-            results.append({
-                'query': row['keys'][0],
-                'clicks': row.get('clicks', 0),
-                'impressions': row.get('impressions', 0),
-                'ctr': round(row.get('ctr', 0) * 100, 2),
-                'position': round(row.get('position', 0), 1),
-            })
+def get_article_performance(property_url, days=28, service_account_path='config/service_account.json',
+                            store=None, offset_days=0):
+    """Fetch performance data for all pages from Google Search Console.
 
-        return results
+    Args:
+        property_url: GSC property URL (e.g., 'https://mjesus.com.br').
+        days: Number of days to look back.
+        service_account_path: Path to service account JSON.
+        store: Optional GSCStore — only days missing locally are downloaded and
+               the metrics are aggregated from the stored daily rows.
+        offset_days: End the window this many days before today.
 
-    except Exception as e:
-        logger.warning("GSC keyword query failed: %s", e)
-        return []
+    Returns:
+        List of dicts with keys: page, clicks, impressions, ctr, position.
+        Empty list on failure.
+    """
+    return _get_performance('page', property_url, days, service_account_path, store, offset_days)
+
+
+def get_keyword_performance(property_url, days=28, service_account_path='config/service_account.json',
+                            store=None, offset_days=0):
+    """Fetch performance data by query (keyword) from GSC.
+
+    Returns:
+        List of dicts with keys: query, clicks, impressions, ctr, position.
+    """
+    return _get_performance('query', property_url, days, service_account_path, store, offset_days)
 
 
-def find_page2_opportunities(property_url, days=28, service_account_path='config/service_account.json'):
+def find_page2_opportunities(property_url, days=28, service_account_path='config/service_account.json',
+                             store=None):
     """Find articles ranking on page 2 (positions 11-20) — optimization opportunities.
 
     Returns:
         List of dicts with page performance data, sorted by impressions desc.
     """
-    all_pages = get_article_performance(property_url, days, service_account_path)
+    all_pages = get_article_performance(property_url, days, service_account_path, store=store)
     page2 = [p for p in all_pages if 11 <= p['position'] <= 20]
     page2.sort(key=lambda x: x['impressions'], reverse=True)
 
@@ -149,14 +185,15 @@ def find_page2_opportunities(property_url, days=28, service_account_path='config
     return page2
 
 
-def compare_periods(property_url, days=28, service_account_path='config/service_account.json'):
-    """Compare current period vs previous period to detect position changes.
+def compare_periods(property_url, days=28, service_account_path='config/service_account.json', store=None):
+    """Compare current period vs the `days` before it to detect position changes.
 
     Returns:
         List of dicts with: page, current_position, previous_position, change.
     """
-    current = get_article_performance(property_url, days, service_account_path)
-    previous = get_article_performance(property_url, days * 2, service_account_path)
+    current = get_article_performance(property_url, days, service_account_path, store=store)
+    previous = get_article_performance(property_url, days, service_account_path, store=store,
+                                       offset_days=days)
 
     if not current or not previous:
         return []
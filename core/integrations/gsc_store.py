@@ -0,0 +1,217 @@
+"""GSCStore — Local SQLite time series of Search Console performance, one row per day."""
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from core.integrations.gsc_client import query_search_analytics
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_GSC_STORE_PATH = ".cache/gsc.sqlite"
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _ranges(days):
+    """Group sorted dates into contiguous (start, end) ranges."""
+    ranges = []
+    for day in days:
+        if ranges and day - ranges[-1][1] == timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [tuple(r) for r in ranges]
+
+
+class GSCStore:
+    """Keeps GSC clicks/impressions/position per (property, dimension, date, page|query).
+
+    sync() downloads only the days of a window that are not stored yet, with
+    'date' as an extra dimension and full startRow pagination. Recent days
+    (younger than final_after_days) are still being updated by Google, so
+    they are fetched again once their copy is older than recent_max_age,
+    until they are final. Period
+    metrics are aggregated locally: clicks and impressions are summed,
+    position is impression-weighted. Thread-safe.
+    """
+
+    def __init__(self, path=DEFAULT_GSC_STORE_PATH, final_after_days=3, recent_max_age=3600):
+        """
+        Args:
+            path: SQLite file path (":memory:" for a process-local store).
+            final_after_days: Days after which GSC data for a date no longer changes.
+            recent_max_age: Seconds a non-final day's copy is served before it is re-fetched.
+        """
+        self.path = path
+        self.final_after_days = final_after_days
+        self.recent_max_age = recent_max_age
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS gsc_daily ("
+            " property TEXT NOT NULL,"
+            " dimension TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " dim_value TEXT NOT NULL,"
+            " clicks INTEGER NOT NULL,"
+            " impressions INTEGER NOT NULL,"
+            " position REAL NOT NULL,"
+            " PRIMARY KEY (property, dimension, date, dim_value));"
+            "CREATE TABLE IF NOT EXISTS gsc_days ("
+            " property TEXT NOT NULL,"
+            " dimension TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " final INTEGER NOT NULL,"
+            " synced_at REAL NOT NULL,"
+            " PRIMARY KEY (property, dimension, date));"
+        )
+        self._conn.commit()
+
+    # ──────────────────────────────────────────────
+    # Sync
+    # ──────────────────────────────────────────────
+
+    def missing_days(self, property_url, start, end, dimension="page"):
+        """Dates in [start, end] that are neither final nor synced within recent_max_age."""
+        with self._lock:
+            present = {
+                row[0] for row in self._conn.execute(
+                    "SELECT date FROM gsc_days WHERE property = ? AND dimension = ?"
+                    " AND date BETWEEN ? AND ? AND (final = 1 OR synced_at > ?)",
+                    (property_url, dimension, start.isoformat(), end.isoformat(),
+                     time.time() - self.recent_max_age),
+                )
+            }
+        return [day for day in _days(start, end) if day.isoformat() not in present]
+
+    def sync(self, service, property_url, start, end, dimension="page"):
+        """Download the missing days of [start, end] for one dimension.
+
+        Args:
+            service: Search Console API service.
+            start, end: datetime.date bounds (inclusive).
+
+        Returns:
+            Number of days downloaded, or None if a query failed.
+        """
+        missing = self.missing_days(property_url, start, end, dimension)
+        for range_start, range_end in _ranges(missing):
+            try:
+                rows = query_search_analytics(service, property_url, range_start, range_end,
+                                              ["date", dimension])
+            except Exception as e:
+                logger.warning("GSC %s sync failed for %s (%s to %s): %s",
+                               dimension, property_url, range_start, range_end, e)
+                return None
+            self.apply_rows(property_url, dimension, range_start, range_end, rows)
+        if missing:
+            logger.info("GSC store %s: %d %s day(s) synced", property_url, len(missing), dimension)
+        return len(missing)
+
+    def apply_rows(self, property_url, dimension, start, end, rows):
+        """Replace the stored days [start, end] with API rows keyed by [date, dimension]."""
+        final_before = date.today() - timedelta(days=self.final_after_days)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM gsc_daily WHERE property = ? AND dimension = ? AND date BETWEEN ? AND ?",
+                (property_url, dimension, start.isoformat(), end.isoformat()),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO gsc_daily"
+                " (property, dimension, date, dim_value, clicks, impressions, position)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(property_url, dimension, row['keys'][0], row['keys'][1], row.get('clicks', 0),
+                  row.get('impressions', 0), row.get('position', 0)) for row in rows],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO gsc_days (property, dimension, date, final, synced_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(property_url, dimension, day.isoformat(), int(day <= final_before), now)
+                 for day in _days(start, end)],
+            )
+            self._conn.commit()
+
+    # ──────────────────────────────────────────────
+    # Local queries
+    # ──────────────────────────────────────────────
+
+    def performance(self, property_url, start, end, dimension="page"):
+        """Per-page (or per-query) metrics for [start, end], like get_article_performance().
+
+        Returns:
+            List of dicts with keys: <dimension>, clicks, impressions, ctr, position.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dim_value, SUM(clicks), SUM(impressions),"
+                " SUM(position * impressions) / MAX(SUM(impressions), 1)"
+                " FROM gsc_daily WHERE property = ? AND dimension = ? AND date BETWEEN ? AND ?"
+                " GROUP BY dim_value ORDER BY SUM(clicks) DESC, dim_value",
+                (property_url, dimension, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [
+            {
+                dimension: value,
+                'clicks': clicks,
+                'impressions': impressions,
+                'ctr': round(clicks / impressions * 100, 2) if impressions else 0,
+                'position': round(position, 1),
+            }
+            for value, clicks, impressions, position in rows
+        ]
+
+    def daily_totals(self, property_url, start, end, dimension="page"):
+        """Site-wide clicks/impressions per day in [start, end], oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, SUM(clicks), SUM(impressions) FROM gsc_daily"
+                " WHERE property = ? AND dimension = ? AND date BETWEEN ? AND ?"
+                " GROUP BY date ORDER BY date",
+                (property_url, dimension, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [{'date': day, 'clicks': clicks, 'impressions': impressions} for day, clicks, impressions in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self):
+        with self._lock:
+            rows, properties, days = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT property), COUNT(DISTINCT date) FROM gsc_daily"
+            ).fetchone()
+        return {"rows": rows, "properties": properties, "days": days}
+
+
+def create_gsc_store(enabled=None):
+    """Return a GSCStore configured from settings, or None when disabled.
+
+    Args:
+        enabled: Force on/off (default: GSC_STORE_ENABLED setting).
+    """
+    from config.settings import (
+        GSC_STORE_ENABLED, GSC_STORE_PATH, GSC_FINAL_AFTER_DAYS, GSC_RECENT_MAX_AGE,
+    )
+
+    if enabled is None:
+        enabled = GSC_STORE_ENABLED
+    if not enabled:
+        return None
+    try:
+        return GSCStore(GSC_STORE_PATH, final_after_days=GSC_FINAL_AFTER_DAYS,
+                        recent_max_age=GSC_RECENT_MAX_AGE)
+    except sqlite3.Error as e:
+        logger.warning("GSC store unavailable (%s). Querying Search Console directly.", e)
+        return None
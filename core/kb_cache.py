@@ -1,6 +1,7 @@
 """KnowledgeBaseCache — In-memory cache for KB content with TTL."""
 import time
 from core.knowledge_base import KnowledgeBase
+from core.kb_index import KnowledgeBaseIndex, DEFAULT_CHUNK_SIZE
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,6 +16,7 @@ class KnowledgeBaseCache:
             ttl: Time-to-live in seconds (default: 1 hour).
         """
         self._cache = {}  # {cache_key: (content, timestamp)}
+        self._indexes = {}  # {tenant_id: (KnowledgeBaseIndex, timestamp)}
         self._ttl = ttl
         self._hits = 0
         self._misses = 0
@@ -79,11 +81,55 @@ class KnowledgeBaseCache:
         self._cache[cache_key] = (content, time.time())
         return content
 
+    def get_index(self, tenant_id, kb_path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Get the tenant's chunked KB index, building it once per TTL window.
+
+        Args:
+            tenant_id: Tenant identifier.
+            kb_path: Path to knowledge_base directory.
+            chunk_size: Target passage size in chars.
+
+        Returns:
+            KnowledgeBaseIndex instance.
+        """
+        if tenant_id in self._indexes:
+            index, timestamp = self._indexes[tenant_id]
+            if time.time() - timestamp < self._ttl:
+                self._hits += 1
+                return index
+            del self._indexes[tenant_id]
+
+        self._misses += 1
+        logger.debug("KB index MISS: %s — building from %s", tenant_id, kb_path)
+        index = KnowledgeBaseIndex.build(kb_path, chunk_size=chunk_size)
+        self._indexes[tenant_id] = (index, time.time())
+        return index
+
+    def retrieve(self, tenant_id, kb_path, query, file_filter=None, top_k=8, max_chars=12000,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """Get only the KB passages relevant to query, under a character budget.
+
+        Args:
+            tenant_id: Tenant identifier.
+            kb_path: Path to knowledge_base directory.
+            query: Text to rank passages against (keyword, outline...).
+            file_filter: List of filename substrings to restrict sources.
+            top_k: Maximum number of passages.
+            max_chars: Character budget for injected passages.
+            chunk_size: Target passage size in chars.
+
+        Returns:
+            Formatted passages string (empty if nothing matched).
+        """
+        index = self.get_index(tenant_id, kb_path, chunk_size=chunk_size)
+        return index.retrieve(query, top_k=top_k, max_chars=max_chars, file_filter=file_filter)
+
     def invalidate(self, tenant_id):
         """Remove all cached entries for a tenant."""
         keys_to_remove = [k for k in self._cache if k.startswith(f"{tenant_id}:")]
         for key in keys_to_remove:
             del self._cache[key]
+        self._indexes.pop(tenant_id, None)
         if keys_to_remove:
             logger.info("KB cache invalidated for tenant '%s' (%d entries)", tenant_id, len(keys_to_remove))
 
@@ -91,6 +137,7 @@ class KnowledgeBaseCache:
         """Clear all cached entries."""
         count = len(self._cache)
         self._cache.clear()
+        self._indexes.clear()
         logger.info("KB cache cleared (%d entries)", count)
 
     @property
@@ -104,4 +151,5 @@ class KnowledgeBaseCache:
             "total": total,
             "hit_rate": f"{hit_rate:.1f}%",
             "entries": len(self._cache),
+            "indexes": len(self._indexes),
         }
@@ -0,0 +1,217 @@
+"""KnowledgeBaseIndex — Chunked BM25 index over a tenant's knowledge base files."""
+import glob
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1200
+
+# BM25 parameters (standard Okapi values)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Portuguese stopwords — removed before indexing so passages are ranked by content words
+_STOPWORDS = {
+    "a", "ao", "aos", "as", "com", "como", "da", "das", "de", "do", "dos", "e", "ela", "ele",
+    "elas", "eles", "em", "entre", "era", "essa", "esse", "esta", "este", "eu", "foi", "ha",
+    "isso", "isto", "ja", "la", "lhe", "mais", "mas", "me", "mesmo", "meu", "minha", "muito",
+    "na", "nao", "nas", "nem", "no", "nos", "num", "numa", "o", "os", "ou", "para", "pela",
+    "pelas", "pelo", "pelos", "por", "pra", "qual", "quando", "que", "quem", "se", "sem",
+    "ser", "seu", "seus", "so", "sua", "suas", "tambem", "te", "tem", "ter", "um", "uma",
+    "umas", "uns", "voce", "vai", "sao", "estao", "the", "of", "and", "to",
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Lowercase, strip accents and split text into indexable terms."""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return [
+        tok for tok in _TOKEN_RE.findall(normalized)
+        if len(tok) > 1 and tok not in _STOPWORDS and not tok.isdigit()
+    ]
+
+
+def split_into_chunks(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Split text into passages of roughly chunk_size chars, on paragraph boundaries.
+
+    Paragraphs longer than chunk_size are split on sentence boundaries
+    (and hard-cut as a last resort) so no passage grows unbounded.
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+    pieces = []
+    for para in paragraphs:
+        if len(para) <= chunk_size:
+            pieces.append(para)
+            continue
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", para):
+            while len(sentence) > chunk_size:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(sentence[:chunk_size])
+                sentence = sentence[chunk_size:]
+            if current and len(current) + len(sentence) + 1 > chunk_size:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            pieces.append(current)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > chunk_size:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+@dataclass
+class KBChunk:
+    """A passage from a knowledge base file."""
+    source: str
+    position: int
+    text: str
+
+
+class KnowledgeBaseIndex:
+    """BM25 retriever over chunked knowledge base files.
+
+    Built once per tenant (see KnowledgeBaseCache.get_index) so agents receive only
+    the passages relevant to their keyword/outline instead of whole files.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self._term_freqs = []
+        self._doc_freqs = Counter()
+        self._lengths = []
+
+        for chunk in chunks:
+            tf = Counter(tokenize(chunk.text))
+            self._term_freqs.append(tf)
+            self._lengths.append(sum(tf.values()))
+            self._doc_freqs.update(tf.keys())
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    @classmethod
+    def build(cls, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Read every .txt file in path and index its passages.
+
+        Args:
+            path: Path to knowledge_base directory.
+            chunk_size: Target passage size in chars.
+
+        Returns:
+            KnowledgeBaseIndex (empty if the directory has no .txt files).
+        """
+        chunks = []
+        if not os.path.exists(path):
+            logger.info("No knowledge base found at '%s'. Index is empty.", path)
+            return cls(chunks)
+
+        for file_path in sorted(glob.glob(f"{path}/*.txt")):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error("Could not index KB file %s: %s", file_path, e)
+                continue
+            source = os.path.basename(file_path)
+            for i, text in enumerate(split_into_chunks(content, chunk_size)):
+                chunks.append(KBChunk(source=source, position=i, text=text))
+
+        logger.info("Indexed KB '%s': %d passages", path, len(chunks))
+        return cls(chunks)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def _idf(self, term):
+        n = len(self.chunks)
+        df = self._doc_freqs.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _score(self, idx, query_terms):
+        tf = self._term_freqs[idx]
+        length_norm = 1 - BM25_B + BM25_B * (self._lengths[idx] / self._avg_length if self._avg_length else 0)
+        score = 0.0
+        for term in query_terms:
+            freq = tf.get(term, 0)
+            if freq:
+                score += self._idf(term) * (freq * (BM25_K1 + 1)) / (freq + BM25_K1 * length_norm)
+        return score
+
+    def search(self, query, top_k=8, max_chars=12000, file_filter=None):
+        """Return the best-scoring passages for query.
+
+        Args:
+            query: Free text (keyword, title, outline headings...).
+            top_k: Maximum number of passages.
+            max_chars: Character budget for the selected passages.
+            file_filter: Optional list of filename substrings to restrict sources.
+
+        Returns:
+            List of KBChunk, in document order.
+        """
+        query_terms = set(tokenize(query or ""))
+        if not query_terms or not self.chunks:
+            return []
+
+        scored = []
+        for idx, chunk in enumerate(self.chunks):
+            if file_filter and not any(p in chunk.source.lower() for p in file_filter):
+                continue
+            score = self._score(idx, query_terms)
+            if score > 0:
+                scored.append((score, idx))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        selected = []
+        used = 0
+        for _, idx in scored:
+            if len(selected) >= top_k:
+                break
+            chunk = self.chunks[idx]
+            if used + len(chunk.text) > max_chars:
+                continue
+            selected.append(idx)
+            used += len(chunk.text)
+
+        return [self.chunks[idx] for idx in sorted(selected)]
+
+    def retrieve(self, query, top_k=8, max_chars=12000, file_filter=None):
+        """Search and format passages for prompt injection.
+
+        Returns:
+            Formatted string (same "--- ARQUIVO ---" headers as KnowledgeBase.load),
+            or empty string if nothing matched.
+        """
+        passages = self.search(query, top_k=top_k, max_chars=max_chars, file_filter=file_filter)
+        if not passages:
+            return ""
+        parts = [
+            f"\n--- ARQUIVO: {chunk.source} (trecho {chunk.position + 1}) ---\n{chunk.text}\n"
+            for chunk in passages
+        ]
+        content = "".join(parts)
+        logger.debug("KB retrieval: %d passage(s), %d chars for query '%s'",
+                     len(passages), len(content), query[:60])
+        return content
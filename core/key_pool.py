@@ -0,0 +1,148 @@
+"""ApiKeyPool — Per-key RPM/TPM budgets with least-loaded key selection."""
+import time
+import threading
+from collections import deque
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW_SECONDS = 60
+
+
+class _KeyBudget:
+    """Sliding-window usage for a single API key."""
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = deque()  # timestamps
+        self.tokens = deque()  # (timestamp, tokens)
+        self.cooldown_until = 0.0
+        self.total_requests = 0
+        self.total_failures = 0
+
+    def prune(self, now):
+        while self.requests and now - self.requests[0] > WINDOW_SECONDS:
+            self.requests.popleft()
+        while self.tokens and now - self.tokens[0][0] > WINDOW_SECONDS:
+            self.tokens.popleft()
+
+    def used_tokens(self):
+        return sum(t for _, t in self.tokens)
+
+    def _tokens_exceeded(self, estimated_tokens):
+        used = self.used_tokens()
+        return bool(self.tpm and used and used + estimated_tokens > self.tpm)
+
+    def headroom(self, now, estimated_tokens=0):
+        """Fraction of the tighter budget (RPM or TPM) still free, 0.0 if unusable."""
+        if now < self.cooldown_until or self._tokens_exceeded(estimated_tokens):
+            return 0.0
+        rpm_left = (self.rpm - len(self.requests)) / self.rpm
+        tpm_left = (self.tpm - self.used_tokens()) / self.tpm if self.tpm else 1.0
+        return max(0.0, min(rpm_left, tpm_left))
+
+    def seconds_until_free(self, now, estimated_tokens=0):
+        """Estimate when this key will accept a request again."""
+        waits = []
+        if now < self.cooldown_until:
+            waits.append(self.cooldown_until - now)
+        if len(self.requests) >= self.rpm and self.requests:
+            waits.append(WINDOW_SECONDS - (now - self.requests[0]))
+        if self._tokens_exceeded(estimated_tokens):
+            waits.append(WINDOW_SECONDS - (now - self.tokens[0][0]))
+        return max(waits) if waits else 0.0
+
+
+class ApiKeyPool:
+    """Spreads calls over several API keys, each with its own RPM/TPM budget.
+
+    acquire() returns the index of the key with the most remaining headroom,
+    so N keys give close to N× throughput instead of draining one key until
+    it fails. Thread-safe.
+    """
+
+    def __init__(self, api_keys, rpm_per_key=15, tpm_per_key=1_000_000, cooldown=60):
+        """
+        Args:
+            api_keys: List of API keys.
+            rpm_per_key: Requests per minute allowed on each key.
+            tpm_per_key: Tokens per minute allowed on each key (0 disables the TPM budget).
+            cooldown: Seconds a key is benched after a quota/auth error.
+        """
+        self.api_keys = list(api_keys)
+        self.cooldown = cooldown
+        self._budgets = [_KeyBudget(rpm_per_key, tpm_per_key) for _ in self.api_keys]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.api_keys)
+
+    def _pick(self, now, estimated_tokens):
+        """Return (index, wait_seconds). index is None when every key is exhausted."""
+        best_index, best_headroom = None, 0.0
+        for i, budget in enumerate(self._budgets):
+            budget.prune(now)
+            headroom = budget.headroom(now, estimated_tokens)
+            if headroom > best_headroom:
+                best_index, best_headroom = i, headroom
+        if best_index is not None:
+            return best_index, 0.0
+        return None, min(b.seconds_until_free(now, estimated_tokens) for b in self._budgets)
+
+    def acquire(self, estimated_tokens=0):
+        """Reserve a request on the least-loaded key, waiting if all keys are saturated.
+
+        Args:
+            estimated_tokens: Expected token usage (counted against the key's TPM).
+
+        Returns:
+            Index of the selected key in api_keys.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                index, wait = self._pick(now, estimated_tokens)
+                if index is not None:
+                    budget = self._budgets[index]
+                    budget.requests.append(now)
+                    if estimated_tokens:
+                        budget.tokens.append((now, estimated_tokens))
+                    budget.total_requests += 1
+                    return index
+            sleep_time = max(wait, 0.1) + 0.1  # +0.1s buffer
+            logger.info("All %d API key(s) at quota: waiting %.1fs", len(self.api_keys), sleep_time)
+            time.sleep(sleep_time)
+
+    def record_tokens(self, index, tokens):
+        """Add token usage to a key's TPM window (e.g. actual minus estimated)."""
+        if not tokens:
+            return
+        with self._lock:
+            self._budgets[index].tokens.append((time.time(), tokens))
+
+    def penalize(self, index, cooldown=None):
+        """Bench a key after a 429/403/expired error so selection skips it."""
+        with self._lock:
+            budget = self._budgets[index]
+            budget.cooldown_until = time.time() + (self.cooldown if cooldown is None else cooldown)
+            budget.total_failures += 1
+        logger.warning("API key #%d benched for %ds", index + 1, self.cooldown if cooldown is None else cooldown)
+
+    @property
+    def stats(self):
+        """Per-key usage within the current window."""
+        with self._lock:
+            now = time.time()
+            keys = []
+            for i, budget in enumerate(self._budgets):
+                budget.prune(now)
+                keys.append({
+                    "key": i + 1,
+                    "current_rpm": len(budget.requests),
+                    "current_tpm": budget.used_tokens(),
+                    "total_requests": budget.total_requests,
+                    "total_failures": budget.total_failures,
+                    "cooling_down": now < budget.cooldown_until,
+                })
+            return {"keys": keys}
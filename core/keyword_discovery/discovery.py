@@ -1,20 +1,40 @@
 """Auto Keyword Discovery — Finds new keyword opportunities from multiple sources."""
 import re
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from core.agents.serp_analyzer import generate_serp_brief
+from core.agents.serp_analyzer import generate_serp_brief, prefetch_serp_data
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_DISCOVERY_WORKERS = 8
+MODIFIER_EXPANSIONS = 10   # modifier expansions validated via Google Suggest per seed
+MODIFIER_SUGGESTIONS = 3   # suggestions kept per validated expansion
 
-def google_suggest(keyword, language="pt-BR", country="br"):
+
+def google_suggest(keyword, language="pt-BR", country="br", cache=None):
     """Fetch Google Autocomplete suggestions for a keyword.
 
     Uses the public Google Suggest API (no key required).
 
+    Args:
+        cache: Optional SerpCache — suggestions are stored alongside SERP results.
+
     Returns:
         List of suggestion strings.
     """
+    if cache is not None:
+        suggestions = cache.get_or_fetch(
+            keyword, country, language, 0,
+            lambda: _fetch_suggestions(keyword, language, country),
+            source="suggest",
+        )
+        return suggestions or []
+    return _fetch_suggestions(keyword, language, country) or []
+
+
+def _fetch_suggestions(keyword, language, country):
+    """Call Google Suggest. Returns a list, or None on failure (so it is not cached)."""
     url = "https://suggestqueries.google.com/complete/search"
     params = {
         "client": "firefox",
@@ -36,7 +56,7 @@ def google_suggest(keyword, language="pt-BR", country="br"):
     except Exception as e:
         logger.warning("Google Suggest failed for '%s': %s", keyword, e)
 
-    return []
+    return None
 
 
 def expand_with_modifiers(keyword):
@@ -63,7 +83,45 @@ def expand_with_modifiers(keyword):
     return expanded
 
 
-def discover_keywords(seed_keyword, existing_keywords=None, max_results=30):
+def _expand_frontier(pool, seeds, serp_cache):
+    """Fetch every source for every seed concurrently.
+
+    Returns:
+        List of (keyword, source, score) in a fixed order — per seed: suggest,
+        SERP related, People Also Ask, modifier expansion — so deduplication
+        keeps the same winner regardless of which request finished first.
+    """
+    suggest = {seed: pool.submit(google_suggest, seed, cache=serp_cache) for seed in seeds}
+    if len(seeds) > 1:
+        # One batched SerperAPI request for the whole frontier; the per-seed briefs below hit the cache
+        prefetch_serp_data(seeds, serp_cache)
+    serp = {seed: pool.submit(generate_serp_brief, seed, cache=serp_cache) for seed in seeds}
+    modifiers = {
+        seed: [pool.submit(google_suggest, exp_kw, cache=serp_cache)
+               for exp_kw in expand_with_modifiers(seed)[:MODIFIER_EXPANSIONS]]
+        for seed in seeds
+    }
+
+    found = []
+    for seed in seeds:
+        # Source 1: Google Suggest
+        found.extend((s, "google_suggest", 3) for s in suggest[seed].result())
+
+        # Source 2 & 3: SERP data
+        brief = serp[seed].result()
+        if brief:
+            found.extend((related, "serp_related", 4) for related in brief.get("related_searches", []))
+            found.extend((paa.get("question", ""), "people_also_ask", 5)
+                         for paa in brief.get("people_also_ask", []))
+
+        # Source 4: Modifier expansion, validated via Google Suggest
+        for future in modifiers[seed]:
+            found.extend((s, "modifier_expansion", 2) for s in future.result()[:MODIFIER_SUGGESTIONS])
+    return found
+
+
+def discover_keywords(seed_keyword, existing_keywords=None, max_results=30, serp_cache=None,
+                      depth=1, max_workers=DEFAULT_DISCOVERY_WORKERS):
     """Discover new keyword opportunities from multiple sources.
 
     Sources:
@@ -72,53 +130,47 @@ def discover_keywords(seed_keyword, existing_keywords=None, max_results=30):
     3. SERP People Also Ask (via SerperAPI)
     4. Modifier expansion
 
+    All requests of a round run concurrently on a bounded pool. With depth > 1
+    the best new keywords of each round (up to max_results) seed the next one;
+    keywords are deduplicated across the whole frontier.
+
     Args:
-        seed_keyword: Starting keyword to expand from.
+        seed_keyword: Starting keyword to expand from, or a list of seeds.
         existing_keywords: Set of keywords already covered (to filter out).
         max_results: Maximum keywords to return.
+        serp_cache: Optional SerpCache — SERP and Suggest responses are reused across
+                    runs and by the article pipeline.
+        depth: Expansion rounds (1 = only the seeds are expanded).
+        max_workers: Concurrent Suggest/SerperAPI requests.
 
     Returns:
-        List of dicts: [{"keyword": str, "source": str, "priority": int}]
+        List of dicts: [{"keyword": str, "source": str, "score": int, "depth": int}]
     """
+    seeds = [seed_keyword] if isinstance(seed_keyword, str) else list(seed_keyword)
     existing = {kw.lower().strip() for kw in (existing_keywords or [])}
-    all_keywords = {}  # keyword_lower → {"keyword": str, "source": str, "score": int}
-
-    # Source 1: Google Suggest
-    suggestions = google_suggest(seed_keyword)
-    for s in suggestions:
-        kl = s.lower().strip()
-        if kl not in existing and kl not in all_keywords:
-            all_keywords[kl] = {"keyword": s, "source": "google_suggest", "score": 3}
-
-    # Source 2 & 3: SERP data
-    serp = generate_serp_brief(seed_keyword)
-    if serp:
-        for related in serp.get("related_searches", []):
-            kl = related.lower().strip()
-            if kl not in existing and kl not in all_keywords:
-                all_keywords[kl] = {"keyword": related, "source": "serp_related", "score": 4}
-
-        for paa in serp.get("people_also_ask", []):
-            q = paa.get("question", "")
-            kl = q.lower().strip()
-            if kl and kl not in existing and kl not in all_keywords:
-                all_keywords[kl] = {"keyword": q, "source": "people_also_ask", "score": 5}
-
-    # Source 4: Modifier expansion
-    expanded = expand_with_modifiers(seed_keyword)
-    # Validate expanded keywords via Google Suggest
-    for exp_kw in expanded[:10]:
-        sub_suggestions = google_suggest(exp_kw)
-        for s in sub_suggestions[:3]:
-            kl = s.lower().strip()
-            if kl not in existing and kl not in all_keywords:
-                all_keywords[kl] = {"keyword": s, "source": "modifier_expansion", "score": 2}
+    seen = existing | {seed.lower().strip() for seed in seeds}
+    all_keywords = {}  # keyword_lower → {"keyword": str, "source": str, "score": int, "depth": int}
+
+    frontier = seeds
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for level in range(1, max(1, depth) + 1):
+            new = []
+            for keyword, source, score in _expand_frontier(pool, frontier, serp_cache):
+                kl = keyword.lower().strip()
+                if kl and kl not in seen:
+                    seen.add(kl)
+                    all_keywords[kl] = {"keyword": keyword, "source": source, "score": score, "depth": level}
+                    new.append(all_keywords[kl])
+            frontier = [item["keyword"] for item in
+                        sorted(new, key=lambda x: x["score"], reverse=True)[:max_results]]
+            if not frontier:
+                break
 
     # Sort by score (higher = better source) and limit
     results = sorted(all_keywords.values(), key=lambda x: x["score"], reverse=True)
     results = results[:max_results]
 
-    logger.info("Keyword discovery for '%s': %d new keywords found (from %d total candidates)",
-                seed_keyword, len(results), len(all_keywords))
+    logger.info("Keyword discovery for %s: %d new keywords found (from %d total candidates)",
+                ", ".join(f"'{seed}'" for seed in seeds), len(results), len(all_keywords))
 
     return results
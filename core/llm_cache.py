@@ -0,0 +1,149 @@
+"""LLMResponseCache — Content-addressed SQLite cache for LLM responses."""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = ".cache/llm_responses.sqlite"
+
+
+def make_cache_key(model_name, prompt, json_mode):
+    """Hash of (model, json_mode, prompt) — identical requests share one entry."""
+    digest = hashlib.sha256()
+    digest.update(f"{model_name}\0{int(bool(json_mode))}\0".encode("utf-8"))
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """Stores LLM responses in a local SQLite file so replays use no quota.
+
+    Entries expire after ttl seconds; when more than max_entries are stored,
+    the least recently used ones are evicted. Thread-safe.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=7 * 24 * 3600, max_entries=5000):
+        """
+        Args:
+            path: SQLite file path (":memory:" for a process-local cache).
+            ttl: Time-to-live in seconds (default: 7 days).
+            max_entries: Maximum stored responses before LRU eviction.
+        """
+        self.path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def get(self, model_name, prompt, json_mode=False):
+        """Return the cached response text, or None on miss/expiry."""
+        key = make_cache_key(model_name, prompt, json_mode)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] < self._ttl:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self._hits += 1
+                logger.debug("LLM cache HIT: %s", key[:12])
+                return row[0]
+            if row:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                logger.debug("LLM cache EXPIRED: %s", key[:12])
+            self._misses += 1
+            return None
+
+    def set(self, model_name, prompt, json_mode, response):
+        """Store a response and evict least recently used entries beyond max_entries."""
+        key = make_cache_key(model_name, prompt, json_mode)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, response, now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self._max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (count - self._max_entries,),
+                )
+                logger.debug("LLM cache evicted %d LRU entries", count - self._max_entries)
+            self._conn.commit()
+
+    def delete(self, model_name, prompt, json_mode=False):
+        """Drop one cached response (e.g. one its caller could not parse)."""
+        key = make_cache_key(model_name, prompt, json_mode)
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+        logger.info("LLM cache cleared (%d entries)", count)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self):
+        """Return cache statistics."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "total": total,
+            "hit_rate": f"{hit_rate:.1f}%",
+            "entries": entries,
+        }
+
+
+def create_response_cache(enabled=None):
+    """Return an LLMResponseCache configured from settings, or None when disabled.
+
+    Args:
+        enabled: Force on/off (default: LLM_CACHE_ENABLED setting).
+    """
+    from config.settings import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+
+    if enabled is None:
+        enabled = LLM_CACHE_ENABLED
+    if not enabled:
+        return None
+    try:
+        return LLMResponseCache(LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+    except sqlite3.Error as e:
+        logger.warning("LLM response cache unavailable (%s). Continuing without it.", e)
+        return None
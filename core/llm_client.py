@@ -1,21 +1,64 @@
-"""LLMClient — Shared Gemini client with API key rotation, retry, rate limiting, and circuit breaker."""
+"""LLMClient — Shared Gemini client with API key pool, retry, rate limiting, and circuit breaker."""
+import asyncio
+import weakref
 import google.generativeai as genai
-from config.settings import GOOGLE_API_KEYS_LIST, GEMINI_MODEL_NAME
+from google.ai import generativelanguage as glm
+from config.settings import (
+    GOOGLE_API_KEYS_LIST, GEMINI_MODEL_NAME, GEMINI_RPM_PER_KEY, GEMINI_TPM_PER_KEY,
+    GEMINI_MAX_CONCURRENCY,
+)
+from core.key_pool import ApiKeyPool
 from core.logger import get_logger
+from core.rate_limiter import create_rate_limiter
 
 logger = get_logger(__name__)
 
+# Errors that mean "this key is out of quota or unusable" — bench it and try another key
+_KEY_ERROR_MARKERS = ("400", "429", "403", "API key expired")
+
+# Per-process cap on in-flight generate_async() calls, one semaphore per event loop
+_async_semaphores = weakref.WeakKeyDictionary()
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 chars per token) used to reserve TPM budget."""
+    return len(text) // 4 + 1
+
+
+def create_key_pool(api_keys=None):
+    """Build an ApiKeyPool from settings, to share across LLMClient instances in a process."""
+    return ApiKeyPool(
+        api_keys or GOOGLE_API_KEYS_LIST,
+        rpm_per_key=GEMINI_RPM_PER_KEY,
+        tpm_per_key=GEMINI_TPM_PER_KEY,
+    )
+
+
+def create_gemini_rate_limiter(api_keys=None):
+    """Build the global Gemini limiter, sized to the whole pool's quota.
+
+    The ApiKeyPool enforces each key's budget inside one process; this
+    limiter (shared through Redis when available) caps the total across
+    processes at GEMINI_RPM_PER_KEY × number of keys.
+    """
+    keys = api_keys or GOOGLE_API_KEYS_LIST
+    return create_rate_limiter(rpm=GEMINI_RPM_PER_KEY * max(1, len(keys)))
+
 
 class LLMClient:
-    """Manages Gemini API access with key rotation, rate limiting, and circuit breaker."""
+    """Manages Gemini API access with a per-key quota pool, rate limiting, and circuit breaker."""
 
-    def __init__(self, api_keys=None, model_name=None, rate_limiter=None, circuit_breaker=None):
+    def __init__(self, api_keys=None, model_name=None, rate_limiter=None, circuit_breaker=None,
+                 key_pool=None, response_cache=None):
         """
         Args:
             api_keys: List of API keys (default: from env).
             model_name: Gemini model name (default: from env).
             rate_limiter: Optional RateLimiter instance.
             circuit_breaker: Optional CircuitBreaker instance.
+            key_pool: Optional ApiKeyPool (default: one built from api_keys with
+                      GEMINI_RPM_PER_KEY / GEMINI_TPM_PER_KEY budgets).
+            response_cache: Optional LLMResponseCache; identical prompts skip the API.
         """
         self.api_keys = api_keys or GOOGLE_API_KEYS_LIST
         if not self.api_keys:
@@ -25,27 +68,41 @@ class LLMClient:
         self.current_key_index = 0
         self.rate_limiter = rate_limiter
         self.circuit_breaker = circuit_breaker
-        self._configure_current_key()
+        self.key_pool = key_pool or create_key_pool(self.api_keys)
+        self.response_cache = response_cache
+        self._clients = {}  # {key_index: GenerativeServiceClient}
+        self._async_clients = {}  # {key_index: (event_loop, GenerativeServiceAsyncClient)}
 
-    def _configure_current_key(self):
-        """Configures the Gemini library with the current key."""
-        current_key = self.api_keys[self.current_key_index]
-        genai.configure(api_key=current_key)
-        logger.debug("Configured Gemini with API key #%d", self.current_key_index + 1)
+    def _get_client(self, key_index):
+        """Returns a GenerativeServiceClient bound to one API key (created once per key)."""
+        client = self._clients.get(key_index)
+        if client is None:
+            client = glm.GenerativeServiceClient(client_options={"api_key": self.api_keys[key_index]})
+            self._clients[key_index] = client
+        return client
 
-    def _rotate_key(self):
-        """Rotates to the next available API key."""
-        if len(self.api_keys) <= 1:
-            logger.error("Only one API key available, cannot rotate.")
-            return False
+    def _get_async_client(self, key_index):
+        """Returns an async client for one API key, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        cached = self._async_clients.get(key_index)
+        if cached is None or cached[0] is not loop:
+            client = glm.GenerativeServiceAsyncClient(client_options={"api_key": self.api_keys[key_index]})
+            self._async_clients[key_index] = (loop, client)
+            return client
+        return cached[1]
 
-        self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-        self._configure_current_key()
-        logger.info("Rotating to API Key #%d", self.current_key_index + 1)
-        return True
+    @staticmethod
+    def _get_semaphore():
+        """Returns the per-process concurrency semaphore (GEMINI_MAX_CONCURRENCY) for the running loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = _async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+            _async_semaphores[loop] = semaphore
+        return semaphore
 
-    def execute_with_retry(self, func, *args, **kwargs):
-        """Executes a function with retry logic, rate limiting, and circuit breaker."""
+    def _before_call(self):
+        """Circuit breaker check and global rate limiting before a call."""
         # Check circuit breaker
         if self.circuit_breaker:
             self.circuit_breaker.allow_request()
@@ -54,50 +111,151 @@ class LLMClient:
         if self.rate_limiter:
             self.rate_limiter.throttle()
 
-        max_retries = len(self.api_keys)
-        attempts = 0
+    def _record_success(self):
+        if self.circuit_breaker:
+            self.circuit_breaker.record_success()
+
+    def _handle_error(self, key_index, e):
+        """Records a failed call. Returns True if another key should be tried, else re-raises."""
+        error_str = str(e)
+        if self.circuit_breaker:
+            self.circuit_breaker.record_failure()
+        if any(marker in error_str for marker in _KEY_ERROR_MARKERS):
+            logger.warning("API Error with key #%d: %s", key_index + 1, e)
+            if len(self.api_keys) <= 1:
+                raise e
+            self.key_pool.penalize(key_index)
+            return True
+        raise e
 
-        while attempts < max_retries:
+    def _run_with_key_pool(self, task, estimated_tokens=0):
+        """Runs task(key_index) on the least-loaded key, benching keys that hit quota/auth errors."""
+        self._before_call()
+
+        for _ in range(len(self.api_keys)):
+            key_index = self.key_pool.acquire(estimated_tokens)
+            self.current_key_index = key_index
             try:
-                result = func(*args, **kwargs)
-                # Success — record it
-                if self.circuit_breaker:
-                    self.circuit_breaker.record_success()
+                result = task(key_index)
+                self._record_success()
                 return result
             except Exception as e:
-                error_str = str(e)
-                if "400" in error_str or "429" in error_str or "403" in error_str or "API key expired" in error_str:
-                    logger.warning("API Error with key #%d: %s", self.current_key_index + 1, e)
-                    if self.circuit_breaker:
-                        self.circuit_breaker.record_failure()
-                    if not self._rotate_key():
-                        raise e
-                    attempts += 1
-                else:
-                    if self.circuit_breaker:
-                        self.circuit_breaker.record_failure()
-                    raise e
+                self._handle_error(key_index, e)
 
         raise Exception("All API keys failed.")
 
-    def get_model(self):
-        """Returns a configured GenerativeModel instance."""
-        return genai.GenerativeModel(self.model_name)
+    def execute_with_retry(self, func, *args, **kwargs):
+        """Executes a function with retry logic, rate limiting, and circuit breaker.
+
+        The key chosen from the pool is exposed as current_key_index, which
+        get_model() uses when called without an explicit key.
+        """
+        return self._run_with_key_pool(lambda _key_index: func(*args, **kwargs))
+
+    def get_model(self, key_index=None):
+        """Returns a GenerativeModel instance bound to a specific API key."""
+        if key_index is None:
+            key_index = self.current_key_index
+        model = genai.GenerativeModel(self.model_name)
+        # GenerativeModel has no public per-instance key option; inject the key's client
+        model._client = self._get_client(key_index)
+        return model
+
+    def _build_generation_config(self, json_mode):
+        return {"response_mime_type": "application/json"} if json_mode else None
+
+    def _record_usage(self, key_index, response, estimated):
+        """Corrects the key's TPM window with the real token count, when reported."""
+        usage = getattr(response, "usage_metadata", None)
+        total = getattr(usage, "total_token_count", 0) if usage else 0
+        if isinstance(total, int) and total:
+            self.key_pool.record_tokens(key_index, total - estimated)
 
-    def generate(self, prompt, json_mode=False):
+    def store_response(self, prompt, json_mode, text):
+        """Cache a response once its caller has validated it (no-op without a cache)."""
+        if self.response_cache:
+            self.response_cache.set(self.model_name, prompt, json_mode, text)
+
+    def discard_response(self, prompt, json_mode):
+        """Drop a cached response its caller could not use, so a retry calls the model."""
+        if self.response_cache:
+            self.response_cache.delete(self.model_name, prompt, json_mode)
+
+    def generate(self, prompt, json_mode=False, cache=True):
         """Generates content using the LLM with retry logic.
 
         Args:
             prompt: The prompt string to send.
             json_mode: If True, requests JSON response format.
+            cache: Store the response in the response cache. Callers that parse
+                   the text pass False and call store_response() once it parses.
 
         Returns:
             The raw response text.
         """
-        def _task():
-            model = self.get_model()
-            config = {"response_mime_type": "application/json"} if json_mode else None
-            response = model.generate_content(prompt, generation_config=config)
+        if self.response_cache:
+            cached = self.response_cache.get(self.model_name, prompt, json_mode)
+            if cached is not None:
+                return cached
+
+        estimated = estimate_tokens(prompt)
+
+        def _task(key_index):
+            model = self.get_model(key_index)
+            response = model.generate_content(prompt, generation_config=self._build_generation_config(json_mode))
+            self._record_usage(key_index, response, estimated)
             return response.text
 
-        return self.execute_with_retry(_task)
+        text = self._run_with_key_pool(_task, estimated_tokens=estimated)
+        if cache:
+            self.store_response(prompt, json_mode, text)
+        return text
+
+    async def generate_async(self, prompt, json_mode=False, cache=True):
+        """Asyncio-native generate(): same rate limiter, circuit breaker and key pool.
+
+        At most GEMINI_MAX_CONCURRENCY calls are in flight per process; blocking waits
+        (rate limiter, saturated key pool) run in a thread so the event loop
+        keeps serving other pipelines.
+
+        Args:
+            prompt: The prompt string to send.
+            json_mode: If True, requests JSON response format.
+            cache: As in generate().
+
+        Returns:
+            The raw response text.
+        """
+        if self.response_cache:
+            cached = self.response_cache.get(self.model_name, prompt, json_mode)
+            if cached is not None:
+                return cached
+
+        estimated = estimate_tokens(prompt)
+
+        async with self._get_semaphore():
+            await asyncio.to_thread(self._before_call)
+
+            for _ in range(len(self.api_keys)):
+                key_index = await asyncio.to_thread(self.key_pool.acquire, estimated)
+                try:
+                    model = genai.GenerativeModel(self.model_name)
+                    # Same per-key injection as get_model(), using the async transport
+                    model._async_client = self._get_async_client(key_index)
+                    response = await model.generate_content_async(
+                        prompt, generation_config=self._build_generation_config(json_mode)
+                    )
+                    self._record_usage(key_index, response, estimated)
+                    self._record_success()
+                    if cache:
+                        self.store_response(prompt, json_mode, response.text)
+                    return response.text
+                except Exception as e:
+                    self._handle_error(key_index, e)
+
+        raise Exception("All API keys failed.")
+
+    @property
+    def stats(self):
+        """Return per-key pool statistics."""
+        return self.key_pool.stats
@@ -9,19 +9,25 @@ from core.agents.writer import WriterAgent
 from core.agents.humanizer import HumanizerAgent
 from core.agents.editor import EditorAgent
 from core.agents.base import AgentResult
-from core.seo.internal_links import inject_internal_links
-from core.seo.topic_clusters import get_cluster_for_keyword, get_cluster_links, is_pillar_keyword, inject_toc
+from core.seo.topic_clusters import get_cluster_for_keyword, get_cluster_links, is_pillar_keyword
+from core.html_postprocessor import (
+    HtmlDocument, place_image_placeholders, insert_toc, insert_internal_links,
+    add_whatsapp_tracking, extract_faq_items,
+)
 from core.seo.schema import (
     generate_article_schema, generate_local_business_schema,
-    generate_faq_schema, extract_faq_from_html, inject_schema_into_html,
+    generate_faq_schema, inject_schema_into_html,
     prepare_schema_meta,
 )
 from core.agents.seo_scorer import SeoScorer
-from core.agents.serp_analyzer import generate_serp_brief
+from core.agents.serp_analyzer import generate_serp_brief, prefetch_serp_data
+from core.stage_graph import StageGraph
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+SEO_MIN_SCORE = 40  # articles scoring below this are not published
+
 
 @dataclass
 class PipelineResult:
@@ -44,6 +50,8 @@ class PipelineResult:
     excerpt: str = ""
     missing_link_keywords: list = field(default_factory=list)
     schema_meta: str = ""
+    image_prompts: list = None  # None when image prompts were not generated in the pipeline
+    growth_topics: list = None  # None when growth suggestions were not generated in the pipeline
 
 
 def generate_slug(title):
@@ -72,6 +80,24 @@ def validate_keyword(keyword, seen_keywords):
     return True, ""
 
 
+def prefetchable_keywords(keywords):
+    """Keywords fit for a batched SERP prefetch.
+
+    Drops what validate_keyword() would skip, and duplicates that differ only
+    in case or spacing (they share one SERP cache entry), so one bad query
+    can't fail the whole SerperAPI batch.
+    """
+    seen = set()
+    result = []
+    for keyword in keywords:
+        normalized = " ".join((keyword or "").lower().split())
+        if normalized in seen or not validate_keyword(keyword, seen)[0]:
+            continue
+        seen.add(normalized)
+        result.append(keyword.strip())
+    return result
+
+
 def validate_analyst_output(outline_json):
     """Validates the analyst agent output (JSON structure)."""
     if not isinstance(outline_json, dict):
@@ -168,12 +194,28 @@ class ArticlePipeline:
     """Orchestrates the article generation pipeline: analyst -> writer -> humanizer -> editor."""
 
     def __init__(self, llm_client: LLMClient, knowledge_base: KnowledgeBase = None,
-                 prompt_engine=None, kb_cache=None, tenant_config=None):
+                 prompt_engine=None, kb_cache=None, tenant_config=None,
+                 visual=None, growth=None, max_workers=4, checkpoints=None, serp_cache=None):
+        """
+        Args:
+            visual: Optional VisualAgent — image prompts are generated alongside SEO scoring.
+            growth: Optional GrowthAgent — topic suggestions are generated alongside SEO scoring.
+            max_workers: Threads used to run independent stages concurrently.
+            checkpoints: Optional CheckpointStore — completed stages are persisted and
+                         skipped when the same tenant+keyword is run again.
+            serp_cache: Optional SerpCache — SERP briefs are shared with keyword discovery,
+                        retries and other workers instead of re-querying SerperAPI.
+        """
         self.llm = llm_client
         self.kb = knowledge_base
         self.prompt_engine = prompt_engine
         self.kb_cache = kb_cache
         self.tenant_config = tenant_config
+        self.visual = visual
+        self.growth = growth
+        self.max_workers = max_workers
+        self.checkpoints = checkpoints
+        self.serp_cache = serp_cache
 
         agent_kwargs = {
             "prompt_engine": prompt_engine,
@@ -191,13 +233,76 @@ class ArticlePipeline:
             enabled = tenant_config.get_enabled_agents()
         self.humanizer = HumanizerAgent(llm_client, knowledge_base, **agent_kwargs) if "humanizer" in enabled else None
 
-    def run(self, keyword, links_inventory, site_config=None) -> PipelineResult:
+    def prefetch_serp(self, keywords):
+        """Fetch the SERP data of upcoming keywords in batched requests (needs serp_cache)."""
+        keywords = prefetchable_keywords(keywords)
+        if self.serp_cache is not None and keywords:
+            cached = prefetch_serp_data(keywords, self.serp_cache)
+            logger.info("SERP prefetch: %d/%d keyword(s) cached", cached, len(keywords))
+
+    def _fetch_serp(self, keyword):
+        logger.info("  0. SERP Analyzer: Fetching competitive data...")
+        serp_brief = generate_serp_brief(keyword, cache=self.serp_cache)
+        if serp_brief:
+            logger.info("     SERP: %d results, %d PAA questions, target %d words",
+                        len(serp_brief.get("top_results", [])),
+                        len(serp_brief.get("people_also_ask", [])),
+                        serp_brief.get("recommended_word_count", 1800))
+        else:
+            logger.info("     SERP: Skipped (no API key or API error)")
+        return serp_brief
+
+    def _warm_kb_index(self):
+        """Build the tenant's KB index up front so the analyst doesn't wait on it."""
+        kb_config = self.tenant_config.get_kb_config()
+        self.kb_cache.get_index(
+            self.tenant_config.company_id,
+            self.tenant_config.kb_path,
+            chunk_size=kb_config.get("chunk_size", 1200),
+        )
+
+    @property
+    def _tenant_id(self):
+        return self.tenant_config.company_id if self.tenant_config else "default"
+
+    def _checkpoint(self, keyword, stage, output):
+        if self.checkpoints:
+            self.checkpoints.save(self._tenant_id, keyword, stage, output)
+
+    def _prepare(self, keyword, topic_clusters, resumed):
+        """Run the independent pre-writing stages concurrently.
+
+        Returns:
+            Dict with serp, cluster and is_pillar results.
+        """
+        graph = StageGraph(max_workers=self.max_workers)
+        if "serp" in resumed:
+            logger.info("  0. SERP Analyzer: Resumed from checkpoint")
+        else:
+            graph.add("serp", lambda _: self._fetch_serp(keyword))
+        graph.add("cluster", lambda _: get_cluster_for_keyword(keyword, topic_clusters))
+        graph.add("is_pillar", lambda _: is_pillar_keyword(keyword, topic_clusters))
+        if self.kb_cache and self.tenant_config and self.tenant_config.get_kb_config().get("retrieval"):
+            graph.add("kb_index", lambda _: self._warm_kb_index())
+        return graph.run(initial={"serp": resumed["serp"]} if "serp" in resumed else None)
+
+    def run(self, keyword, links_inventory, site_config=None, existing_keywords=None) -> PipelineResult:
         """Runs the full 4-agent article pipeline.
 
+        Independent stages run concurrently: SERP fetch, KB index warm-up and
+        cluster lookup before the analyst; SEO scoring, schema building, image
+        prompts and growth suggestions after the editor.
+
+        With a CheckpointStore, serp_brief, outline, draft, humanized and edited
+        HTML are saved as each stage succeeds; a rerun for the same tenant+keyword
+        resumes after the last saved stage. Callers clear the checkpoint once the
+        article is published.
+
         Args:
             keyword: Target keyword for the article.
             links_inventory: List of existing articles for internal linking.
             site_config: Site configuration dict (for schema, local SEO, etc).
+            existing_keywords: Keywords the growth agent must not suggest again.
 
         Returns:
             PipelineResult with article content, title, metrics, etc.
@@ -205,44 +310,53 @@ class ArticlePipeline:
         start = time.time()
         metrics = []
 
-        # STEP 0: SERP ANALYSIS (competitive intelligence)
-        logger.info("  0. SERP Analyzer: Fetching competitive data...")
-        serp_brief = generate_serp_brief(keyword)
-        if serp_brief:
-            logger.info("     SERP: %d results, %d PAA questions, target %d words",
-                        len(serp_brief.get("top_results", [])),
-                        len(serp_brief.get("people_also_ask", [])),
-                        serp_brief.get("recommended_word_count", 1800))
-        else:
-            logger.info("     SERP: Skipped (no API key or API error)")
+        topic_clusters = []
+        if self.tenant_config:
+            topic_clusters = self.tenant_config.raw_config.get("topic_clusters", [])
+
+        resumed = self.checkpoints.load(self._tenant_id, keyword) if self.checkpoints else {}
+        if resumed:
+            logger.info("  Resuming '%s' from checkpoint (stages: %s)", keyword, ", ".join(resumed))
+
+        # STEP 0: SERP ANALYSIS + KB index + cluster lookup (concurrent)
+        prepared = self._prepare(keyword, topic_clusters, resumed)
+        serp_brief = prepared["serp"]
+        if "serp" not in resumed and serp_brief:
+            # An empty brief is a failed fetch; a resumed run should retry it
+            self._checkpoint(keyword, "serp", serp_brief)
 
         # STEP 1: ANALYST
-        logger.info("  1. Analyst Agent: Creating Strategic Outline...")
-        analyst_result = self.analyst.execute({
-            "keyword": keyword,
-            "links_inventory": links_inventory,
-            "site_config": site_config or {},
-            "serp_brief": serp_brief or {},
-        })
-        metrics.append(analyst_result)
-
-        if not analyst_result.success:
-            return PipelineResult(
-                success=False,
-                error=f"Analyst failed: {analyst_result.error}",
-                agent_metrics=metrics,
-                total_duration_ms=(time.time() - start) * 1000,
-            )
+        if "outline" in resumed:
+            logger.info("  1. Analyst Agent: Resumed from checkpoint")
+            outline_json = resumed["outline"]
+        else:
+            logger.info("  1. Analyst Agent: Creating Strategic Outline...")
+            analyst_result = self.analyst.execute({
+                "keyword": keyword,
+                "links_inventory": links_inventory,
+                "site_config": site_config or {},
+                "serp_brief": serp_brief or {},
+            })
+            metrics.append(analyst_result)
+
+            if not analyst_result.success:
+                return PipelineResult(
+                    success=False,
+                    error=f"Analyst failed: {analyst_result.error}",
+                    agent_metrics=metrics,
+                    total_duration_ms=(time.time() - start) * 1000,
+                )
 
-        outline_json = analyst_result.content
-        is_valid, err = validate_analyst_output(outline_json)
-        if not is_valid:
-            return PipelineResult(
-                success=False,
-                error=f"Analyst validation failed: {err}",
-                agent_metrics=metrics,
-                total_duration_ms=(time.time() - start) * 1000,
-            )
+            outline_json = analyst_result.content
+            is_valid, err = validate_analyst_output(outline_json)
+            if not is_valid:
+                return PipelineResult(
+                    success=False,
+                    error=f"Analyst validation failed: {err}",
+                    agent_metrics=metrics,
+                    total_duration_ms=(time.time() - start) * 1000,
+                )
+            self._checkpoint(keyword, "outline", outline_json)
 
         final_title = outline_json.get('title', keyword.title())
         logger.info("     Title: %s", final_title)
@@ -256,33 +370,41 @@ class ArticlePipeline:
             logger.info("     Target word count adjusted to %d (from SERP data)", rwc)
 
         # STEP 2: WRITER
-        logger.info("  2. Senior Writer Agent: Writing Content...")
-        writer_input = dict(outline_json)
-        writer_input['_site_config'] = site_config or {}
-        writer_result = self.writer.execute(writer_input)
-        metrics.append(writer_result)
+        if "draft" in resumed:
+            logger.info("  2. Senior Writer Agent: Resumed from checkpoint")
+            draft_html = resumed["draft"]
+        else:
+            logger.info("  2. Senior Writer Agent: Writing Content...")
+            writer_input = dict(outline_json)
+            writer_input['_site_config'] = site_config or {}
+            writer_result = self.writer.execute(writer_input)
+            metrics.append(writer_result)
 
-        if not writer_result.success:
-            return PipelineResult(
-                success=False,
-                error=f"Writer failed: {writer_result.error}",
-                agent_metrics=metrics,
-                total_duration_ms=(time.time() - start) * 1000,
-            )
+            if not writer_result.success:
+                return PipelineResult(
+                    success=False,
+                    error=f"Writer failed: {writer_result.error}",
+                    agent_metrics=metrics,
+                    total_duration_ms=(time.time() - start) * 1000,
+                )
 
-        draft_html = writer_result.content
-        is_valid, err = validate_html_output(draft_html, "Writer")
-        if not is_valid:
-            return PipelineResult(
-                success=False,
-                error=f"Writer validation failed: {err}",
-                agent_metrics=metrics,
-                total_duration_ms=(time.time() - start) * 1000,
-            )
+            draft_html = writer_result.content
+            is_valid, err = validate_html_output(draft_html, "Writer")
+            if not is_valid:
+                return PipelineResult(
+                    success=False,
+                    error=f"Writer validation failed: {err}",
+                    agent_metrics=metrics,
+                    total_duration_ms=(time.time() - start) * 1000,
+                )
+            self._checkpoint(keyword, "draft", draft_html)
 
         # STEP 3: HUMANIZER (optional — skipped when voice is integrated in Writer)
         humanized_html = draft_html
-        if self.humanizer:
+        if self.humanizer and "humanized" in resumed:
+            logger.info("  3. Humanizer Agent: Resumed from checkpoint")
+            humanized_html = resumed["humanized"]
+        elif self.humanizer:
             logger.info("  3. Humanizer Agent: Injecting Voice...")
             humanizer_result = self.humanizer.execute(draft_html)
             metrics.append(humanizer_result)
@@ -307,61 +429,64 @@ class ArticlePipeline:
                     agent_metrics=metrics,
                     total_duration_ms=(time.time() - start) * 1000,
                 )
+            self._checkpoint(keyword, "humanized", humanized_html)
         else:
             logger.info("  3. Humanizer: Skipped (voice integrated in Writer)")
 
         # STEP 4: EDITOR
-        logger.info("  4. Editor Agent: Polishing & SEO Check...")
-        editor_result = self.editor.execute(humanized_html)
-        metrics.append(editor_result)
+        if "edited" in resumed:
+            logger.info("  4. Editor Agent: Resumed from checkpoint")
+            final_content = resumed["edited"]
+        else:
+            logger.info("  4. Editor Agent: Polishing & SEO Check...")
+            editor_result = self.editor.execute(humanized_html)
+            metrics.append(editor_result)
 
-        if not editor_result.success:
-            return PipelineResult(
-                success=False,
-                error=f"Editor failed: {editor_result.error}",
-                agent_metrics=metrics,
-                total_duration_ms=(time.time() - start) * 1000,
-            )
+            if not editor_result.success:
+                return PipelineResult(
+                    success=False,
+                    error=f"Editor failed: {editor_result.error}",
+                    agent_metrics=metrics,
+                    total_duration_ms=(time.time() - start) * 1000,
+                )
 
-        final_content = editor_result.content
+            final_content = editor_result.content
+            is_valid, err = validate_html_output(final_content, "Editor")
+            if not is_valid:
+                return PipelineResult(
+                    success=False,
+                    error=f"Editor validation failed: {err}",
+                    agent_metrics=metrics,
+                    total_duration_ms=(time.time() - start) * 1000,
+                )
+            self._checkpoint(keyword, "edited", final_content)
 
-        # Fix image placeholder positioning (safety net)
-        final_content = fix_image_placement(final_content)
+        # STEP 5: HTML POST-PROCESSING — parsed once, passes below edit the same tokens
+        doc = HtmlDocument(final_content)
 
-        is_valid, err = validate_html_output(final_content, "Editor")
-        if not is_valid:
-            return PipelineResult(
-                success=False,
-                error=f"Editor validation failed: {err}",
-                agent_metrics=metrics,
-                total_duration_ms=(time.time() - start) * 1000,
-            )
+        # Fix image placeholder positioning (safety net)
+        place_image_placeholders(doc)
 
-        # STEP 5: INTERNAL LINKS INJECTION (cluster-aware)
+        # Internal links injection (cluster-aware)
         links_strategy = outline_json.get('internal_links_strategy', [])
         missing_link_keywords = []
 
         # Get cluster links if keyword belongs to a cluster
         cluster_links_list = []
-        topic_clusters = []
-        if self.tenant_config:
-            topic_clusters = self.tenant_config.raw_config.get("topic_clusters", [])
-        cluster = get_cluster_for_keyword(keyword, topic_clusters)
+        cluster = prepared["cluster"]
         if cluster:
             cluster_links_list = get_cluster_links(keyword, cluster, links_inventory)
             logger.info("  5. Internal Links: %d cluster links + strategy links...", len(cluster_links_list))
 
             # Inject TOC for pillar pages
-            if is_pillar_keyword(keyword, topic_clusters):
-                final_content = inject_toc(final_content)
+            if prepared["is_pillar"]:
+                insert_toc(doc)
                 logger.info("     Pillar page detected: TOC injected")
         else:
             logger.info("  5. Internal Links: Injecting links...")
 
         if links_strategy or cluster_links_list:
-            final_content, num_links = inject_internal_links(
-                final_content, links_strategy, cluster_links=cluster_links_list
-            )
+            num_links = insert_internal_links(doc, links_strategy, cluster_links=cluster_links_list)
             logger.info("     Inserted %d internal links", num_links)
 
             # Detect links to articles that don't exist in inventory
@@ -375,19 +500,53 @@ class ArticlePipeline:
             if missing_link_keywords:
                 logger.info("     %d priority keyword(s) need to be created for link building", len(missing_link_keywords))
 
-        # STEP 6: SEO SCORING
-        logger.info("  6. SEO Scorer: Evaluating article...")
-        scorer = SeoScorer()
-        seo_result = scorer.score(
-            html=final_content,
-            keyword=keyword,
-            meta_description=outline_json.get('meta_description', ''),
-            title=final_title,
-            lsi_keywords=outline_json.get('lsi_keywords', []),
-            slug=generate_slug(final_title),
-            entities=outline_json.get('expected_entities', []),
-        )
-        logger.info("     SEO Score: %d/100 (%s)", seo_result.total, seo_result.grade)
+        # Conversion tracking — add UTM to WhatsApp CTA links
+        article_slug = generate_slug(final_title)
+        add_whatsapp_tracking(doc, article_slug)
+
+        faq_items = extract_faq_items(doc)
+        final_content = doc.render()
+
+        # STEP 6 + 7: SEO scoring, schema markup, image prompts, growth (concurrent).
+        # The LLM stages wait for the score and are skipped when the SEO gate will block.
+        cfg = site_config or {}
+        post = StageGraph(max_workers=self.max_workers)
+        post.add("seo", lambda _: self._score(final_content, keyword, final_title, outline_json))
+        post.add("schemas", lambda _: self._build_schemas(faq_items, keyword, final_title, outline_json, cfg))
+
+        def gated(stage):
+            return lambda r: stage() if r["seo"].total >= SEO_MIN_SCORE else None
+
+        if self.visual:
+            post.add("image_prompts", gated(lambda: self.visual.execute(final_content)), deps=("seo",))
+        if self.growth:
+            growth_existing = set(existing_keywords or ())
+            growth_existing.add(keyword.lower())
+            growth_existing.update(
+                item.get('keyword', '').lower() for item in links_inventory if item.get('keyword')
+            )
+            post.add("growth", gated(lambda: self.growth.execute({
+                "title": final_title,
+                "existing_keywords": "\n".join(sorted(growth_existing)),
+            })), deps=("seo",))
+        finished = post.run()
+
+        image_prompts = None
+        visual_result = finished.get("image_prompts")
+        if visual_result:
+            metrics.append(visual_result)
+            if visual_result.success:
+                image_prompts = [p.strip() for p in visual_result.content.split('|||') if p.strip()]
+
+        growth_topics = None
+        growth_result = finished.get("growth")
+        if growth_result:
+            metrics.append(growth_result)
+            if growth_result.success:
+                growth_topics = growth_result.content
+
+        seo_result = finished["seo"]
+        logger.info("  6. SEO Scorer: %d/100 (%s)", seo_result.total, seo_result.grade)
         for check in seo_result.checks:
             check_status = "OK" if check.passed else "FAIL"
             logger.info("       %s: %s — %s", check.name, check_status, check.detail)
@@ -395,12 +554,15 @@ class ArticlePipeline:
             logger.warning("       %s", warning)
 
         # SEO QUALITY GATE
-        if seo_result.total < 40:
-            logger.error("  SEO GATE BLOCKED: Score %d (grade %s) is below minimum threshold (40).",
-                         seo_result.total, seo_result.grade)
+        if seo_result.total < SEO_MIN_SCORE:
+            logger.error("  SEO GATE BLOCKED: Score %d (grade %s) is below minimum threshold (%d).",
+                         seo_result.total, seo_result.grade, SEO_MIN_SCORE)
+            # Same HTML would fail again — the retry re-runs the editor on the saved draft
+            if self.checkpoints:
+                self.checkpoints.discard(self._tenant_id, keyword, "edited")
             return PipelineResult(
                 success=False,
-                error=f"SEO score too low: {seo_result.total}/100 (grade {seo_result.grade}). Minimum is 40.",
+                error=f"SEO score too low: {seo_result.total}/100 (grade {seo_result.grade}). Minimum is {SEO_MIN_SCORE}.",
                 title=final_title,
                 seo_score=seo_result.total,
                 seo_grade=seo_result.grade,
@@ -416,60 +578,17 @@ class ArticlePipeline:
             logger.warning("  SEO WARNING: Score %d (grade %s). Article will be published with warning.",
                            seo_result.total, seo_result.grade)
 
-        # STEP 7: SCHEMA MARKUP INJECTION
-        cfg = site_config or {}
-        schemas = []
-        article_schema = generate_article_schema(
-            title=final_title,
-            description=outline_json.get('meta_description', ''),
-            url=cfg.get('wordpress_url', ''),
-            author_name=cfg.get('author_name', ''),
-            date_published=time.strftime('%Y-%m-%d'),
-            image_url='',
-            keyword=keyword,
-        )
-        schemas.append(article_schema)
-
-        if cfg.get('business_name') and cfg.get('address'):
-            lb_schema = generate_local_business_schema(
-                business_name=cfg['business_name'],
-                address=cfg['address'],
-                phone=cfg.get('phone', ''),
-                url=cfg.get('wordpress_url', ''),
-                geo_lat=cfg.get('geo_lat'),
-                geo_lng=cfg.get('geo_lng'),
-            )
-            schemas.append(lb_schema)
-
-        faq_items = extract_faq_from_html(final_content)
-        if faq_items:
-            faq_schema = generate_faq_schema(faq_items)
-            if faq_schema:
-                schemas.append(faq_schema)
-                logger.info("     FAQ schema generated with %d items", len(faq_items))
-
         # Schema is NOT injected into HTML content (WordPress strips <script> tags)
         # Instead, prepare as meta field for WordPress REST API
+        schemas = finished["schemas"]
         schema_meta = prepare_schema_meta(schemas)
         logger.info("  7. Schema Markup: Prepared %d schema(s) for meta field", len(schemas))
 
         total_ms = (time.time() - start) * 1000
         logger.info("  Pipeline complete in %.0fms", total_ms)
 
-        article_slug = generate_slug(final_title)
         article_excerpt = generate_excerpt(final_content)
 
-        # STEP 8: CONVERSION TRACKING — Add UTM to WhatsApp CTA links
-        if article_slug:
-            tracking_param = f"text=Vim+do+artigo+{article_slug}"
-            # Add tracking to wa.me links that don't already have text param
-            final_content = re.sub(
-                r'(href="https://wa\.me/[^"]*?)(")',
-                lambda m: m.group(1) + ('&' if '?' in m.group(1) else '?') + tracking_param + m.group(2)
-                if 'text=' not in m.group(1) else m.group(0),
-                final_content
-            )
-
         return PipelineResult(
             success=True,
             title=final_title,
@@ -492,4 +611,51 @@ class ArticlePipeline:
             excerpt=article_excerpt,
             missing_link_keywords=missing_link_keywords,
             schema_meta=schema_meta,
+            image_prompts=image_prompts,
+            growth_topics=growth_topics,
+        )
+
+    @staticmethod
+    def _score(html, keyword, title, outline_json):
+        scorer = SeoScorer()
+        return scorer.score(
+            html=html,
+            keyword=keyword,
+            meta_description=outline_json.get('meta_description', ''),
+            title=title,
+            lsi_keywords=outline_json.get('lsi_keywords', []),
+            slug=generate_slug(title),
+            entities=outline_json.get('expected_entities', []),
+        )
+
+    @staticmethod
+    def _build_schemas(faq_items, keyword, title, outline_json, cfg):
+        schemas = []
+        article_schema = generate_article_schema(
+            title=title,
+            description=outline_json.get('meta_description', ''),
+            url=cfg.get('wordpress_url', ''),
+            author_name=cfg.get('author_name', ''),
+            date_published=time.strftime('%Y-%m-%d'),
+            image_url='',
+            keyword=keyword,
         )
+        schemas.append(article_schema)
+
+        if cfg.get('business_name') and cfg.get('address'):
+            lb_schema = generate_local_business_schema(
+                business_name=cfg['business_name'],
+                address=cfg['address'],
+                phone=cfg.get('phone', ''),
+                url=cfg.get('wordpress_url', ''),
+                geo_lat=cfg.get('geo_lat'),
+                geo_lng=cfg.get('geo_lng'),
+            )
+            schemas.append(lb_schema)
+
+        if faq_items:
+            faq_schema = generate_faq_schema(faq_items)
+            if faq_schema:
+                schemas.append(faq_schema)
+                logger.info("     FAQ schema generated with %d items", len(faq_items))
+        return schemas
@@ -1,6 +1,8 @@
 """RateLimiter — Sliding window rate limiter for API calls."""
+import os
 import time
 import threading
+import uuid
 from collections import deque
 from core.logger import get_logger
 
@@ -81,3 +83,135 @@ class RateLimiter:
                 "total_waits": self._total_waits,
                 "total_wait_time_s": round(self._total_wait_time, 1),
             }
+
+
+# Atomic sliding window: drop expired entries, then either register this request
+# or return how many milliseconds until the oldest entry leaves the window.
+# Uses the Redis server clock so workers on different hosts agree on "now".
+_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local member = ARGV[3]
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+if count < limit then
+    redis.call('ZADD', key, now, member)
+    redis.call('PEXPIRE', key, math.ceil(window * 1000))
+    return 0
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return math.ceil((tonumber(oldest[2]) + window - now) * 1000)
+"""
+
+REDIS_KEY_PREFIX = "ratelimit"
+
+
+class RedisRateLimiter:
+    """Sliding window rate limiter shared through Redis.
+
+    Same throttle()/stats API as RateLimiter, but the window lives in a Redis
+    sorted set updated by an atomic Lua script, so every rq worker, the API
+    server and main.py draw from one quota. Falls back to an in-process
+    RateLimiter if Redis becomes unreachable.
+    """
+
+    def __init__(self, redis_conn, rpm=15, name="gemini", window=60):
+        """
+        Args:
+            redis_conn: Redis connection.
+            rpm: Maximum requests per window across all processes.
+            name: Quota name (one Redis key per name).
+            window: Window size in seconds (default: 60).
+        """
+        self.redis = redis_conn
+        self.rpm = rpm
+        self.name = name
+        self.window = window
+        self.key = f"{REDIS_KEY_PREFIX}:{name}"
+        self._script = redis_conn.register_script(_SLIDING_WINDOW_LUA)
+        self._fallback = RateLimiter(rpm=rpm)
+        self._lock = threading.Lock()
+        self._total_waits = 0
+        self._total_wait_time = 0.0
+
+    def _try_acquire(self):
+        """Run the Lua script once. Returns 0.0 if acquired, else seconds to wait."""
+        member = f"{time.time():.6f}-{uuid.uuid4().hex[:8]}"
+        wait_ms = self._script(keys=[self.key], args=[self.window, self.rpm, member])
+        return int(wait_ms) / 1000.0
+
+    def throttle(self):
+        """Block until a slot is free in the shared window, then take it.
+
+        Returns:
+            float: Time waited in seconds.
+        """
+        waited = 0.0
+        while True:
+            try:
+                wait = self._try_acquire()
+            except Exception as e:
+                logger.warning("Redis rate limiter unavailable (%s). Using in-process limiter.", e)
+                return waited + self._fallback.throttle()
+
+            if wait <= 0:
+                if waited:
+                    with self._lock:
+                        self._total_waits += 1
+                        self._total_wait_time += waited
+                return waited
+
+            sleep_time = wait + 0.1  # +0.1s buffer
+            logger.info("Rate limit (shared '%s'): waiting %.1fs (%d RPM)", self.name, sleep_time, self.rpm)
+            time.sleep(sleep_time)
+            waited += sleep_time
+
+    def wait_if_needed(self):
+        """Acquire a slot (the shared window is checked and updated atomically).
+
+        Returns:
+            float: Time waited in seconds.
+        """
+        return self.throttle()
+
+    def acquire(self):
+        """No-op: slots are registered atomically by throttle()/wait_if_needed()."""
+
+    @property
+    def stats(self):
+        """Return rate limiter statistics (current_rpm is the shared, cross-process count)."""
+        try:
+            seconds, microseconds = self.redis.time()  # same clock the Lua script trims with
+            now = int(seconds) + int(microseconds) / 1_000_000
+            active = self.redis.zcount(self.key, now - self.window, "+inf")
+        except Exception:
+            active = self._fallback.stats["current_rpm"]
+        with self._lock:
+            return {
+                "rpm_limit": self.rpm,
+                "current_rpm": int(active),
+                "total_waits": self._total_waits,
+                "total_wait_time_s": round(self._total_wait_time, 1),
+                "backend": "redis",
+            }
+
+
+def create_rate_limiter(rpm=15, name="gemini"):
+    """Return a Redis-backed limiter when Redis is reachable, else an in-process one.
+
+    Set RATE_LIMITER_BACKEND=memory to force the in-process limiter.
+
+    Args:
+        rpm: Maximum requests per minute.
+        name: Quota name shared by all processes using the same Redis.
+    """
+    if os.getenv("RATE_LIMITER_BACKEND", "redis").lower() != "memory":
+        from core.queue_config import get_redis_connection
+        conn = get_redis_connection()
+        if conn is not None:
+            logger.debug("Using shared Redis rate limiter '%s' (%d RPM)", name, rpm)
+            return RedisRateLimiter(conn, rpm=rpm, name=name)
+    return RateLimiter(rpm=rpm)
@@ -1,6 +1,6 @@
 """ArticleReoptimizer — Re-optimizes existing WordPress articles via REST API."""
 import re
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from html import unescape
 from core.seo.schema import (
     generate_article_schema,
@@ -13,12 +13,23 @@ from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Post fields reoptimize_all() reads — passed as the _fields projection
+REOPTIMIZE_FIELDS = ["id", "title", "content", "excerpt", "slug", "link", "date", "featured_media", "meta"]
+
+# Media fields needed to pick alt text and to skip items whose alt is already right
+MEDIA_FIELDS = ("id", "source_url", "alt_text")
+
 
 def _clean_html_entities(text):
     """Clean HTML entities from text."""
     return unescape(re.sub(r'<[^>]+>', '', text)).strip()
 
 
+def _normalize_text(text):
+    """Tags stripped, entities unescaped, whitespace collapsed — for comparing excerpts."""
+    return re.sub(r'\s+', ' ', _clean_html_entities(text or ''))
+
+
 def _extract_keyword_from_title(title):
     """Extract a meaningful keyword from a post title.
     Takes the first meaningful phrase before ':' or '—' or the full title.
@@ -33,12 +44,31 @@ def _extract_keyword_from_title(title):
     return clean
 
 
+def summarize_results(results):
+    """Count reoptimize_all() results by status: {"updated", "skipped", "failed"}."""
+    counts = {"updated": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        counts[result.get('status', 'updated' if result.get('success') else 'failed')] += 1
+    return counts
+
+
 class ArticleReoptimizer:
     """Re-optimizes existing WordPress articles via REST API."""
 
-    def __init__(self, wp_client, site_config):
+    def __init__(self, wp_client, site_config, post_cache=None, max_workers=4, rate_limiter=None):
+        """
+        Args:
+            wp_client: WordPressClient for the site.
+            site_config: Site dict from sites.json.
+            post_cache: Optional WPPostCache to read posts from.
+            max_workers: Posts processed concurrently by reoptimize_all().
+            rate_limiter: Optional RateLimiter shared by this site's writes.
+        """
         self.wp = wp_client
         self.config = site_config
+        self.post_cache = post_cache
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
         self.base_url = wp_client.base_url
         self.headers = wp_client.headers
 
@@ -54,20 +84,28 @@ class ArticleReoptimizer:
 
         return media_ids
 
-    def _get_yoast_keyword(self, post_id):
-        """Try to get the Yoast focus keyword for a post."""
+    def _get_yoast_keyword(self, post_id, post=None):
+        """Try to get the Yoast focus keyword for a post.
+
+        A listed post's meta (_fields=meta) is final: when the key isn't
+        REST-registered WordPress returns "meta": [], and fetching the post
+        again would not return it either. Only fetches when no post is given.
+        """
         try:
-            url = f"{self.base_url}/wp-json/wp/v2/posts/{post_id}?_fields=meta"
-            r = requests.get(url, headers=self.headers)
-            if r.status_code == 200:
-                meta = r.json().get('meta', {})
-                kw = meta.get('_yoast_wpseo_focuskw', '')
-                if kw:
-                    return kw
+            if post is None:
+                post = self.wp.get_post(post_id, fields=["meta"]) or {}
+            meta = post.get('meta')
+            kw = meta.get('_yoast_wpseo_focuskw', '') if isinstance(meta, dict) else ''
+            if kw:
+                return kw
         except Exception:
             pass
         return None
 
+    def _throttle(self):
+        if self.rate_limiter:
+            self.rate_limiter.throttle()
+
     def analyze_and_fix(self, html, keyword, post_title, post_url="", date_published="", image_url=""):
         """Apply algorithmic fixes (no LLM):
         1. Remove schema JSON-LD from content (WordPress renders it as text)
@@ -130,118 +168,188 @@ class ArticleReoptimizer:
 
         return html, metadata
 
-    def update_article(self, post_id, html, metadata):
-        """Update content + metadata via WP REST API."""
+    @staticmethod
+    def article_payload(html, metadata):
+        """Full update payload: content plus excerpt/meta when present."""
         payload = {'content': html}
         if 'excerpt' in metadata:
             payload['excerpt'] = metadata['excerpt']
         if 'meta' in metadata:
             payload['meta'] = metadata['meta']
-        return self.wp.update_post(post_id, payload)
+        return payload
+
+    def update_article(self, post_id, html, metadata):
+        """Update content + metadata via WP REST API."""
+        self._throttle()
+        return self.wp.update_post(post_id, self.article_payload(html, metadata))
+
+    @staticmethod
+    def changed_fields(post, html, metadata):
+        """Build an update payload with only the fields that differ from the post.
+
+        Content is compared with the rendered HTML, and the excerpt with the
+        rendered excerpt's text (both sides unescaped and whitespace-collapsed).
+        Only meta keys the listing returned are compared; keys WordPress doesn't
+        expose over REST are left out rather than rewritten on every run.
+
+        Returns:
+            Dict payload for update_post() (empty when nothing changed).
+        """
+        payload = {}
+        if html != post.get('content', {}).get('rendered', ''):
+            payload['content'] = html
+
+        excerpt = metadata.get('excerpt')
+        if excerpt is not None:
+            current_excerpt = _normalize_text((post.get('excerpt') or {}).get('rendered', ''))
+            if _normalize_text(excerpt) != current_excerpt:
+                payload['excerpt'] = excerpt
+
+        current_meta = post.get('meta') if isinstance(post.get('meta'), dict) else {}
+        meta = {k: v for k, v in (metadata.get('meta') or {}).items()
+                if k in current_meta and current_meta[k] != v}
+        if meta:
+            payload['meta'] = meta
+        return payload
 
     def fix_media_alt_text(self, media_id, alt_text):
         """Update alt text for a media item in the WP Media Library."""
+        self._throttle()
         return self.wp.update_media(media_id, alt_text)
 
-    def reoptimize_all(self):
-        """Fetch all posts, analyze, fix, and report."""
-        posts = self.wp.get_posts()
-        results = []
+    def _load_posts(self):
+        """All published posts — from the post cache (synced incrementally) when available."""
+        if self.post_cache:
+            self.post_cache.sync(self.wp)
+            return self.post_cache.all_posts(self.post_cache.site_key(self.wp))
+        return self.wp.get_posts(fields=REOPTIMIZE_FIELDS)
+
+    def _media_alt(self, media_id, featured_media_id, media, keyword, clean_title):
+        """Alt text for one media item (author photo gets the author alt)."""
         author_name = self.config.get('author_name', '')
+        if media_id != featured_media_id:
+            source_url = media.get(media_id, {}).get('source_url', '').lower()
+            if 'terapeuta' in source_url or 'marcelo' in source_url:
+                return f"{author_name} - Terapeuta especialista em {keyword}"[:120]
+        return f"{keyword} - {clean_title}"[:120]
+
+    def _reoptimize_post(self, post, position, total, media, batch):
+        """Analyze and fix one post, queueing its writes on batch.
+
+        Returns:
+            (result_dict, post_write, media_writes), or None if the post has no content.
+            The result's status/media counts are filled in by _finish() once the batch is sent.
+        """
+        post_id = post.get('id')
+        post_title = post.get('title', {}).get('rendered', '')
+        html = post.get('content', {}).get('rendered', '')
+        post_url = post.get('link', '')
+        date_published = post.get('date', '')[:10]
+        featured_media_id = post.get('featured_media', 0)
+
+        if not html:
+            logger.warning("[%d/%d] Post %d has no content, skipping", position, total, post_id)
+            return None
+
+        clean_title = _clean_html_entities(post_title)
+
+        # Get the best keyword: Yoast focus keyword > extracted from title > slug
+        keyword = self._get_yoast_keyword(post_id, post)
+        if not keyword:
+            keyword = _extract_keyword_from_title(post_title)
+        if not keyword:
+            keyword = post.get('slug', '').replace('-', ' ')
+        logger.info("[%d/%d] Post %d: '%s' (keyword: '%s')", position, total, post_id, clean_title[:60], keyword)
+
+        # Featured image URL for schema
+        image_url = media.get(featured_media_id, {}).get('source_url', '') if featured_media_id else ""
+
+        # Analyze and fix the HTML content
+        fixed_html, metadata = self.analyze_and_fix(
+            html, keyword, post_title, post_url, date_published, image_url
+        )
+
+        # Update the post — only the fields that actually changed
+        payload = self.changed_fields(post, fixed_html, metadata)
+        post_write = batch.update_post(post_id, payload) if payload else None
+
+        # Fix media items referenced in this post whose alt text differs
+        media_ids = self._get_post_media_ids(html, featured_media_id)
+        media_writes = []
+        media_skipped = 0
+        for mid in media_ids:
+            alt = self._media_alt(mid, featured_media_id, media, keyword, clean_title)
+            if mid in media and media[mid].get('alt_text', '') == alt:
+                media_skipped += 1
+                continue
+            media_writes.append(batch.update_media(mid, alt))
+
+        result = {
+            'post_id': post_id,
+            'title': clean_title,
+            'keyword': keyword,
+            'updated_fields': sorted(payload),
+            'schema_cleaned': True,
+            'media_skipped': media_skipped,
+            'media_total': len(media_ids),
+        }
+        return result, post_write, media_writes
+
+    @staticmethod
+    def _finish(result, post_write, media_writes):
+        """Fill in a post's outcome from its sent writes."""
+        if post_write is None:
+            status = "skipped"
+        else:
+            status = "updated" if post_write.ok else "failed"
+        result['status'] = status
+        result['success'] = status != "failed"
+        result['media_fixed'] = sum(1 for w in media_writes if w.ok)
+
+        logger.info("    Post %d: %s%s | Media alt fixed: %d/%d (%d already set)",
+                    result['post_id'], status.upper(),
+                    f" ({', '.join(result['updated_fields'])})" if result['updated_fields'] else "",
+                    result['media_fixed'], result['media_total'], result['media_skipped'])
+        return result
+
+    def reoptimize_all(self):
+        """Fetch all posts, analyze, fix, and report.
+
+        Posts come with their meta in one listing and every referenced media item
+        is resolved in batched /media?include= requests, so the only per-post
+        requests left are the writes. Those are queued on a WordPress batch
+        (25 writes per /batch/v1 call, individual calls on older sites), paced
+        by the site's rate limiter. Posts are analyzed on max_workers threads.
+        Posts and media whose fixed values equal the current ones are not
+        written at all (status "skipped").
+        """
+        posts = self._load_posts()
 
         logger.info("=" * 60)
         logger.info("Starting re-optimization of %d posts", len(posts))
         logger.info("=" * 60)
 
-        for i, post in enumerate(posts, 1):
-            post_id = post.get('id')
-            post_title = post.get('title', {}).get('rendered', '')
-            html = post.get('content', {}).get('rendered', '')
-            slug = post.get('slug', '')
-            post_url = post.get('link', '')
-            date_published = post.get('date', '')[:10]
-            featured_media_id = post.get('featured_media', 0)
-
-            if not html:
-                logger.warning("[%d/%d] Post %d has no content, skipping", i, len(posts), post_id)
-                continue
-
-            clean_title = _clean_html_entities(post_title)
-            logger.info("[%d/%d] Post %d: '%s'", i, len(posts), post_id, clean_title[:60])
-
-            # Get the best keyword: Yoast focus keyword > extracted from title > slug
-            keyword = self._get_yoast_keyword(post_id)
-            if not keyword:
-                keyword = _extract_keyword_from_title(post_title)
-            logger.info("    Keyword: '%s'", keyword)
-
-            # Get featured image URL for schema
-            image_url = ""
-            if featured_media_id:
-                try:
-                    r = requests.get(f"{self.base_url}/wp-json/wp/v2/media/{featured_media_id}",
-                                     headers=self.headers)
-                    if r.status_code == 200:
-                        image_url = r.json().get('source_url', '')
-                except Exception:
-                    pass
-
-            # Analyze and fix the HTML content
-            fixed_html, metadata = self.analyze_and_fix(
-                html, keyword, post_title, post_url, date_published, image_url
-            )
-
-            # Update the post
-            update_result = self.update_article(post_id, fixed_html, metadata)
-            post_updated = update_result is not None
-
-            # Fix ALL media items referenced in this post
-            media_ids = self._get_post_media_ids(html, featured_media_id)
-            media_fixed = 0
-            for mid in media_ids:
-                try:
-                    # Determine if this is the featured image or body image
-                    if mid == featured_media_id:
-                        alt = f"{keyword} - {clean_title}"[:120]
-                    else:
-                        # Check if it's author photo
-                        r = requests.get(f"{self.base_url}/wp-json/wp/v2/media/{mid}",
-                                         headers=self.headers)
-                        if r.status_code == 200:
-                            media_data = r.json()
-                            source_url = media_data.get('source_url', '')
-                            if 'terapeuta' in source_url.lower() or 'marcelo' in source_url.lower():
-                                alt = f"{author_name} - Terapeuta especialista em {keyword}"
-                            else:
-                                alt = f"{keyword} - {clean_title}"
-                            alt = alt[:120]
-                        else:
-                            alt = f"{keyword} - {clean_title}"[:120]
-
-                    if self.fix_media_alt_text(mid, alt):
-                        media_fixed += 1
-                except Exception as e:
-                    logger.warning("    Failed to fix media %d: %s", mid, e)
-
-            logger.info("    Content updated: %s | Media alt fixed: %d/%d | Schema cleaned from content",
-                         "OK" if post_updated else "FAIL",
-                         media_fixed, len(media_ids))
-
-            results.append({
-                'post_id': post_id,
-                'title': clean_title,
-                'keyword': keyword,
-                'success': post_updated,
-                'schema_cleaned': True,
-                'media_fixed': media_fixed,
-                'media_total': len(media_ids),
-            })
-
-        success_count = sum(1 for r in results if r['success'])
+        media_ids = set()
+        for post in posts:
+            media_ids |= self._get_post_media_ids(post.get('content', {}).get('rendered', ''),
+                                                  post.get('featured_media', 0))
+        media = self.wp.get_media(media_ids, fields=MEDIA_FIELDS) if media_ids else {}
+
+        total = len(posts)
+        with self.wp.batch(rate_limiter=self.rate_limiter) as batch:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+                queued = [q for q in pool.map(
+                    lambda item: self._reoptimize_post(item[1], item[0], total, media, batch),
+                    enumerate(posts, 1)) if q is not None]
+        results = [self._finish(*q) for q in queued]
+
+        counts = summarize_results(results)
         logger.info("=" * 60)
         logger.info("RE-OPTIMIZATION COMPLETE")
-        logger.info("  Posts updated: %d/%d", success_count, len(results))
-        logger.info("  Total media fixed: %d", sum(r['media_fixed'] for r in results))
+        logger.info("  Posts: %d updated, %d unchanged (skipped), %d failed",
+                    counts['updated'], counts['skipped'], counts['failed'])
+        logger.info("  Total media fixed: %d (%d already correct)",
+                    sum(r['media_fixed'] for r in results), sum(r['media_skipped'] for r in results))
         logger.info("  Schema text cleaned from content (Yoast handles schema)")
         logger.info("=" * 60)
         return results
@@ -10,11 +10,29 @@ logger = get_logger(__name__)
 class ContentFreshnessEngine:
     """Detects articles needing refresh based on GSC data and triggers re-optimization."""
 
-    def __init__(self, wp_client, site_config, gsc_property_url=None):
+    def __init__(self, wp_client, site_config, gsc_property_url=None, post_cache=None, gsc_store=None):
         self.wp = wp_client
         self.config = site_config
         self.gsc_url = gsc_property_url or site_config.get('wordpress_url', '')
-        self.reoptimizer = ArticleReoptimizer(wp_client, site_config)
+        self.post_cache = post_cache
+        self.gsc_store = gsc_store
+        self.reoptimizer = ArticleReoptimizer(wp_client, site_config, post_cache=post_cache)
+
+    def _get_post(self, post_id):
+        """One post by ID — a cache lookup, or a single REST request without a cache."""
+        if self.post_cache:
+            self.post_cache.sync(self.wp)
+            post = self.post_cache.get(self.post_cache.site_key(self.wp), post_id)
+            if post:
+                return post
+        return self.wp.get_post(post_id)
+
+    def find_post_by_url(self, url):
+        """Post whose permalink matches url (needs the post cache), or None."""
+        if not self.post_cache:
+            return None
+        self.post_cache.sync(self.wp)
+        return self.post_cache.get_by_url(self.post_cache.site_key(self.wp), url)
 
     def detect_declining_articles(self, days=28):
         """Find articles with declining positions using GSC period comparison.
@@ -22,7 +40,7 @@ class ContentFreshnessEngine:
         Returns:
             List of articles that declined by more than 2 positions.
         """
-        changes = compare_periods(self.gsc_url, days)
+        changes = compare_periods(self.gsc_url, days, store=self.gsc_store)
         declining = [c for c in changes if c['status'] == 'declined' and c['change'] < -2]
 
         if declining:
@@ -40,9 +58,9 @@ class ContentFreshnessEngine:
         Returns:
             List of page-2 articles sorted by impression potential.
         """
-        return find_page2_opportunities(self.gsc_url, days)
+        return find_page2_opportunities(self.gsc_url, days, store=self.gsc_store)
 
-    def refresh_article(self, post_id, reason="content_freshness"):
+    def refresh_article(self, post_id, reason="content_freshness", batch=None):
         """Re-optimize a specific article with freshness updates.
 
         Updates:
@@ -53,19 +71,14 @@ class ContentFreshnessEngine:
         Args:
             post_id: WordPress post ID.
             reason: Why the refresh was triggered.
+            batch: Optional WPBatch to queue the update on. The result then carries
+                the queued "write" and its success is known once the batch is sent.
 
         Returns:
             dict with refresh results.
         """
         try:
-            # Fetch current post
-            posts = self.wp.get_posts(per_page=1, status="publish")
-            post = None
-            for p in self.wp.get_posts():
-                if p.get('id') == post_id:
-                    post = p
-                    break
-
+            post = self._get_post(post_id)
             if not post:
                 logger.warning("Post %d not found", post_id)
                 return {"success": False, "error": "Post not found"}
@@ -74,7 +87,7 @@ class ContentFreshnessEngine:
             title = post.get('title', {}).get('rendered', '')
 
             # Get keyword
-            keyword = self.reoptimizer._get_yoast_keyword(post_id)
+            keyword = self.reoptimizer._get_yoast_keyword(post_id, post)
             if not keyword:
                 from core.reoptimizer import _extract_keyword_from_title
                 keyword = _extract_keyword_from_title(title)
@@ -89,17 +102,24 @@ class ContentFreshnessEngine:
             if 'meta' not in metadata:
                 metadata['meta'] = {}
 
-            # Update the post
-            result = self.reoptimizer.update_article(post_id, fixed_html, metadata)
-
-            logger.info("Article %d refreshed (reason: %s, keyword: %s)", post_id, reason, keyword)
-            return {
-                "success": result is not None,
+            refresh = {
                 "post_id": post_id,
                 "keyword": keyword,
                 "reason": reason,
                 "date": today,
             }
+            if batch is not None:
+                refresh["write"] = batch.update_post(
+                    post_id, self.reoptimizer.article_payload(fixed_html, metadata))
+                logger.info("Article %d refresh queued (reason: %s, keyword: %s)", post_id, reason, keyword)
+                return refresh
+
+            # Update the post
+            result = self.reoptimizer.update_article(post_id, fixed_html, metadata)
+
+            logger.info("Article %d refreshed (reason: %s, keyword: %s)", post_id, reason, keyword)
+            refresh["success"] = result is not None
+            return refresh
 
         except Exception as e:
             logger.error("Failed to refresh article %d: %s", post_id, e)
@@ -125,12 +145,19 @@ class ContentFreshnessEngine:
         refresh_results = []
         if auto_refresh and declining:
             logger.info("Auto-refreshing %d declining articles...", len(declining))
-            for item in declining[:5]:  # Max 5 per run
-                # Extract post ID from URL (last path segment)
-                page_url = item['page']
-                # Would need to look up post ID by URL — simplified for now
-                logger.info("  Would refresh: %s (pos %.1f → %.1f)",
-                            page_url[-50:], item['previous_position'], item['current_position'])
+            with self.wp.batch(rate_limiter=self.reoptimizer.rate_limiter) as batch:
+                for item in declining[:5]:  # Max 5 per run
+                    page_url = item['page']
+                    post = self.find_post_by_url(page_url)
+                    if post:
+                        refresh_results.append(self.refresh_article(post['id'], reason="declining_position",
+                                                                    batch=batch))
+                        continue
+                    logger.info("  Would refresh: %s (pos %.1f → %.1f)",
+                                page_url[-50:], item['previous_position'], item['current_position'])
+            for refresh in refresh_results:
+                if "write" in refresh:
+                    refresh["success"] = bool(refresh.pop("write").ok)
 
         report = {
             "date": time.strftime('%Y-%m-%d'),
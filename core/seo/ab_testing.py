@@ -81,71 +81,74 @@ def evaluate_and_rotate(wp_client, gsc_data, min_days=14, ctr_threshold=2.0):
         gsc_by_url[item.get("page", "")] = item
 
     actions = []
-
-    for test in tests:
-        if test["status"] != "active":
-            continue
-
-        post_id = test["post_id"]
-        current_var = test["current_variation"]
-        created = test["created_at"]
-
-        # Check if enough time has passed
-        days_elapsed = (time.time() - time.mktime(time.strptime(created, '%Y-%m-%d'))) / 86400
-        if days_elapsed < min_days:
-            continue
-
-        # Find CTR for this post
-        # Would need post URL mapping — simplified
-        current_ctr = 0
-        for url, data in gsc_by_url.items():
-            if str(post_id) in url or test["keyword"].replace(" ", "-") in url:
-                current_ctr = data.get("ctr", 0)
-                break
-
-        # Record result
-        test["results"].append({
-            "variation": current_var,
-            "ctr": current_ctr,
-            "measured_at": time.strftime('%Y-%m-%d'),
-        })
-
-        # Rotate if CTR below threshold and more variations available
-        if current_ctr < ctr_threshold:
-            next_var = current_var + 1
-            if next_var < len(test["titles"]):
-                test["current_variation"] = next_var
-                test["created_at"] = time.strftime('%Y-%m-%d')  # Reset timer
-
-                # Update WordPress
-                new_title = test["titles"][next_var]
-                new_meta = test["meta_descriptions"][next_var] if next_var < len(test["meta_descriptions"]) else ""
-
-                payload = {"title": new_title}
-                if new_meta:
-                    payload["meta"] = {"_yoast_wpseo_metadesc": new_meta}
-
-                try:
-                    wp_client.update_post(post_id, payload)
-                    actions.append({
+    writes = []  # (test, action, BatchWrite) — title changes go out in /batch/v1 calls
+
+    with wp_client.batch() as batch:
+        for test in tests:
+            if test["status"] != "active":
+                continue
+
+            post_id = test["post_id"]
+            current_var = test["current_variation"]
+            created = test["created_at"]
+
+            # Check if enough time has passed
+            days_elapsed = (time.time() - time.mktime(time.strptime(created, '%Y-%m-%d'))) / 86400
+            if days_elapsed < min_days:
+                continue
+
+            # Find CTR for this post
+            # Would need post URL mapping — simplified
+            current_ctr = 0
+            for url, data in gsc_by_url.items():
+                if str(post_id) in url or test["keyword"].replace(" ", "-") in url:
+                    current_ctr = data.get("ctr", 0)
+                    break
+
+            # Record result
+            test["results"].append({
+                "variation": current_var,
+                "ctr": current_ctr,
+                "measured_at": time.strftime('%Y-%m-%d'),
+            })
+
+            # Rotate if CTR below threshold and more variations available
+            if current_ctr < ctr_threshold:
+                next_var = current_var + 1
+                if next_var < len(test["titles"]):
+                    # Update WordPress; the test only moves on once the write succeeds
+                    new_title = test["titles"][next_var]
+                    new_meta = test["meta_descriptions"][next_var] if next_var < len(test["meta_descriptions"]) else ""
+
+                    payload = {"title": new_title}
+                    if new_meta:
+                        payload["meta"] = {"_yoast_wpseo_metadesc": new_meta}
+
+                    writes.append((test, {
                         "post_id": post_id,
                         "action": "rotated",
                         "from_variation": current_var,
                         "to_variation": next_var,
                         "old_ctr": current_ctr,
                         "new_title": new_title,
-                    })
-                    logger.info("A/B rotated post %d: var %d→%d (CTR was %.1f%%)",
-                                post_id, current_var, next_var, current_ctr)
-                except Exception as e:
-                    logger.warning("Failed to rotate post %d: %s", post_id, e)
-            else:
-                # All variations tested — pick best
-                best = max(test["results"], key=lambda r: r["ctr"])
-                test["status"] = "completed"
-                test["winner"] = best["variation"]
-                logger.info("A/B test completed for post %d: winner=var %d (CTR %.1f%%)",
-                            post_id, best["variation"], best["ctr"])
+                    }, batch.update_post(post_id, payload)))
+                else:
+                    # All variations tested — pick best
+                    best = max(test["results"], key=lambda r: r["ctr"])
+                    test["status"] = "completed"
+                    test["winner"] = best["variation"]
+                    logger.info("A/B test completed for post %d: winner=var %d (CTR %.1f%%)",
+                                post_id, best["variation"], best["ctr"])
+
+    for test, action, write in writes:
+        if write.ok:
+            test["current_variation"] = action["to_variation"]
+            test["created_at"] = time.strftime('%Y-%m-%d')  # Reset timer
+            actions.append(action)
+            logger.info("A/B rotated post %d: var %d→%d (CTR was %.1f%%)",
+                        action["post_id"], action["from_variation"], action["to_variation"], action["old_ctr"])
+        else:
+            logger.warning("Failed to rotate post %d", action["post_id"])
 
     _save_tests(tests)
     return actions
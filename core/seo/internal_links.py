@@ -2,8 +2,13 @@
 
 Supports cluster-aware linking: cluster links get priority over general links.
 """
+import bisect
 import re
 
+# Elements whose text must never receive a link
+_PROTECTED_TAGS = ('a', 'h1', 'h2', 'h3')
+_TAG_RE = re.compile(r'<[^>]*>')
+
 
 def inject_internal_links(html: str, links_strategy: list, max_links: int = 5,
                            cluster_links: list = None) -> tuple:
@@ -17,6 +22,9 @@ def inject_internal_links(html: str, links_strategy: list, max_links: int = 5,
     3. Falls back to partial match (first 2 words) if exact match fails
     4. Skips if the text is inside an <a> tag, heading (H1-H3), or CTA
 
+    Protected regions are indexed once and all links are spliced in a
+    single rebuild at the end.
+
     Args:
         html: The article HTML content.
         links_strategy: List of dicts with 'text', 'url' keys.
@@ -29,27 +37,28 @@ def inject_internal_links(html: str, links_strategy: list, max_links: int = 5,
     if not html:
         return html, 0
 
-    inserted = 0
+    index = ProtectedSpans(html)
+    insertions = []  # (start, end, url)
+
+    def try_insert(anchor, url):
+        span = _find_insertion_point(html, anchor, index)
+        if span is None:
+            return False
+        index.add(*span)  # the new link protects its own text from later anchors
+        insertions.append((span[0], span[1], url))
+        return True
 
     # Cluster links get priority — insert first
-    if cluster_links:
-        for link_item in cluster_links:
-            if inserted >= max_links:
-                break
-            anchor = link_item.get('text', '').strip()
-            url = link_item.get('url', '').strip()
-            if not anchor or not url:
-                continue
-            new_html = _try_insert_link(html, anchor, url)
-            if new_html:
-                html = new_html
-                inserted += 1
-
-    if not links_strategy:
-        return html, inserted
-
-    for link_item in links_strategy:
-        if inserted >= max_links:
+    for link_item in cluster_links or []:
+        if len(insertions) >= max_links:
+            break
+        anchor = link_item.get('text', '').strip()
+        url = link_item.get('url', '').strip()
+        if anchor and url:
+            try_insert(anchor, url)
+
+    for link_item in links_strategy or []:
+        if len(insertions) >= max_links:
             break
 
         anchor = link_item.get('text', '').strip()
@@ -58,62 +67,78 @@ def inject_internal_links(html: str, links_strategy: list, max_links: int = 5,
         if not anchor or not url:
             continue
 
-        new_html = _try_insert_link(html, anchor, url)
-        if new_html:
-            html = new_html
-            inserted += 1
-        else:
+        if not try_insert(anchor, url):
             # Fallback: try first 2 words
             words = anchor.split()
             if len(words) >= 2:
-                partial = ' '.join(words[:2])
-                new_html = _try_insert_link(html, partial, url)
-                if new_html:
-                    html = new_html
-                    inserted += 1
+                try_insert(' '.join(words[:2]), url)
 
-    return html, inserted
+    return _splice_links(html, insertions), len(insertions)
 
 
-def _try_insert_link(html: str, anchor: str, url: str) -> str | None:
-    """Try to insert a link for the given anchor text.
+class ProtectedSpans:
+    """Sorted, non-overlapping [start, end) intervals where links must not go.
 
-    Returns the modified HTML if successful, None otherwise.
+    Covers every tag's markup, <a>/<h1>-<h3> elements and the CTA box
+    (nothing when html is empty). overlaps() is a binary search, so checking
+    a candidate match is O(log n).
     """
-    escaped = re.escape(anchor)
-    pattern = re.compile(escaped, re.IGNORECASE)
 
-    for match in pattern.finditer(html):
-        start, end = match.start(), match.end()
+    def __init__(self, html: str = ""):
+        spans = [(m.start(), m.end()) for m in _TAG_RE.finditer(html)]
+
+        lowered = html.lower()
+        for tag in _PROTECTED_TAGS:
+            for match in re.finditer(rf'<{tag}[\s>]', lowered):
+                close = lowered.find(f'</{tag}>', match.end())
+                spans.append((match.start(), close + len(tag) + 3 if close != -1 else len(html)))
+
+        # CTA box: from the class attribute to the first </div> after it
+        for match in re.finditer(r'class="cta-box"', html):
+            close = html.find('</div>', match.end())
+            spans.append((match.start(), close if close != -1 else len(html)))
+
+        self._starts = []
+        self._ends = []
+        for start, end in sorted(spans):
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        i = bisect.bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[i] > start:
+            return True
+        j = i + 1
+        return j < len(self._starts) and self._starts[j] < end
 
-        if _is_inside_protected_tag(html, start, end):
-            continue
+    def add(self, start: int, end: int):
+        """Protect a new span (callers only add spans that don't overlap existing ones)."""
+        i = bisect.bisect_left(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
 
-        matched_text = match.group(0)
-        replacement = f'<a href="{url}">{matched_text}</a>'
-        return html[:start] + replacement + html[end:]
 
+def _find_insertion_point(html: str, anchor: str, index: ProtectedSpans):
+    """Return (start, end) of the first unprotected occurrence of anchor, or None."""
+    pattern = re.compile(re.escape(anchor), re.IGNORECASE)
+    for match in pattern.finditer(html):
+        if not index.overlaps(match.start(), match.end()):
+            return match.start(), match.end()
     return None
 
 
-def _is_inside_protected_tag(html: str, start: int, end: int) -> bool:
-    """Check if position is inside an <a>, <h1>, <h2>, <h3> tag or CTA div."""
-    preceding = html[:start]
-
-    # Check headings and anchor tags
-    for tag in ('a', 'h1', 'h2', 'h3'):
-        last_open = preceding.rfind(f'<{tag}')
-        if last_open == -1:
-            continue
-        last_close = preceding.rfind(f'</{tag}>')
-        if last_open > last_close:
-            return True
-
-    # Check if inside cta-box div
-    last_cta_open = preceding.rfind('class="cta-box"')
-    if last_cta_open != -1:
-        last_cta_close = preceding.rfind('</div>', last_cta_open)
-        if last_cta_close == -1:
-            return True
-
-    return False
+def _splice_links(html: str, insertions: list) -> str:
+    """Wrap every (start, end, url) span in an <a> tag in one pass."""
+    if not insertions:
+        return html
+    parts = []
+    cursor = 0
+    for start, end, url in sorted(insertions):
+        parts.append(html[cursor:start])
+        parts.append(f'<a href="{url}">{html[start:end]}</a>')
+        cursor = end
+    parts.append(html[cursor:])
+    return ''.join(parts)
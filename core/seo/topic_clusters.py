@@ -97,26 +97,22 @@ def is_pillar_keyword(keyword, topic_clusters):
     )
 
 
-def generate_toc_html(html):
-    """Generate a Table of Contents from H2 headings in the article.
+def heading_slug(text):
+    """Anchor id for a heading's plain text (used by TOC links and H2 ids)."""
+    slug = re.sub(r'[^\w\s-]', '', text.lower())
+    return re.sub(r'[\s]+', '-', slug).strip('-')
 
-    Args:
-        html: Article HTML content.
+
+def build_toc_html(headings):
+    """Build the TOC markup for a list of plain-text H2 headings.
 
     Returns:
-        TOC HTML string to insert after the first H2.
+        TOC HTML string, or "" if there are fewer than 3 headings.
     """
-    headings = re.findall(r'<h2[^>]*>(.*?)</h2>', html, re.IGNORECASE | re.DOTALL)
     if len(headings) < 3:
         return ""
 
-    toc_items = []
-    for heading in headings:
-        clean = re.sub(r'<[^>]+>', '', heading).strip()
-        slug = re.sub(r'[^\w\s-]', '', clean.lower())
-        slug = re.sub(r'[\s]+', '-', slug).strip('-')
-        toc_items.append(f'<li><a href="#{slug}">{clean}</a></li>')
-
+    toc_items = [f'<li><a href="#{heading_slug(h)}">{h}</a></li>' for h in headings]
     toc = (
         '<nav class="toc-box">\n'
         '<p><strong>Neste artigo:</strong></p>\n'
@@ -128,6 +124,19 @@ def generate_toc_html(html):
     return toc
 
 
+def generate_toc_html(html):
+    """Generate a Table of Contents from H2 headings in the article.
+
+    Args:
+        html: Article HTML content.
+
+    Returns:
+        TOC HTML string to insert after the first H2.
+    """
+    headings = re.findall(r'<h2[^>]*>(.*?)</h2>', html, re.IGNORECASE | re.DOTALL)
+    return build_toc_html([re.sub(r'<[^>]+>', '', h).strip() for h in headings])
+
+
 def inject_toc(html):
     """Inject Table of Contents after the first H2 opening paragraph.
 
@@ -148,9 +157,7 @@ def inject_toc(html):
     def add_id(match):
         tag_content = match.group(1)
         clean = re.sub(r'<[^>]+>', '', tag_content).strip()
-        slug = re.sub(r'[^\w\s-]', '', clean.lower())
-        slug = re.sub(r'[\s]+', '-', slug).strip('-')
-        return f'<h2 id="{slug}">{tag_content}</h2>'
+        return f'<h2 id="{heading_slug(clean)}">{tag_content}</h2>'
 
     html = re.sub(r'<h2>([^<]*(?:<[^/h][^>]*>[^<]*)*)</h2>', add_id, html, flags=re.IGNORECASE)
     return html
@@ -0,0 +1,218 @@
+"""SerpCache — Shared SQLite cache for SerperAPI/Google Suggest results with single-flight fetching."""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SERP_CACHE_PATH = ".cache/serp.sqlite"
+
+
+def make_serp_key(query, gl, hl, num, source="search"):
+    """Cache key for a SERP request — queries differing only in case/spacing share it."""
+    normalized = " ".join(query.lower().split())
+    key = f"{normalized}\0{gl}\0{hl}\0{num}"
+    return key if source == "search" else f"{source}\0{key}"
+
+
+class SerpCache:
+    """Stores parsed SERP data keyed by (query, gl, hl, num) for ttl seconds.
+
+    Other lookups (e.g. Google Suggest) share the file under their own source.
+
+    get_or_fetch() is single-flight: while one caller fetches a key, other
+    threads in the process wait on it, and other processes sharing the file
+    (scheduler, rq workers) see its lock row and poll for the result instead
+    of sending their own request. A lock older than lock_timeout is taken
+    over. Failed fetches (None) are not cached. Thread-safe.
+    """
+
+    def __init__(self, path=DEFAULT_SERP_CACHE_PATH, ttl=24 * 3600, lock_timeout=30, poll_interval=0.2):
+        """
+        Args:
+            path: SQLite file path (":memory:" for a process-local cache).
+            ttl: Seconds a SERP result stays valid (default: 24h).
+            lock_timeout: Seconds after which another process's in-flight lock is ignored.
+            poll_interval: Seconds between checks while another process fetches.
+        """
+        self.path = path
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+        self._poll_interval = poll_interval
+        self._owner = uuid.uuid4().hex
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> threading.Event, for callers in this process
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS serp ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " created_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS serp_inflight ("
+            " key TEXT PRIMARY KEY,"
+            " owner TEXT NOT NULL,"
+            " started_at REAL NOT NULL);"
+        )
+        self._conn.commit()
+
+    # ──────────────────────────────────────────────
+    # Plain get/set
+    # ──────────────────────────────────────────────
+
+    def _read(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT data, created_at FROM serp WHERE key = ?", (key,)).fetchone()
+        if row and time.time() - row[1] < self._ttl:
+            return json.loads(row[0])
+        return None
+
+    def get(self, query, gl, hl, num, source="search"):
+        """Cached SERP data, or None on miss/expiry."""
+        data = self._read(make_serp_key(query, gl, hl, num, source))
+        with self._lock:
+            if data is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return data
+
+    def set(self, query, gl, hl, num, data, source="search"):
+        self._write(make_serp_key(query, gl, hl, num, source), data)
+
+    def _write(self, key, data):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO serp (key, data, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(data, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    # ──────────────────────────────────────────────
+    # Single-flight
+    # ──────────────────────────────────────────────
+
+    def _try_lock(self, key):
+        """Take the cross-process lock for key. True if this process now owns it."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM serp_inflight WHERE key = ? AND started_at < ?", (key, now - self._lock_timeout)
+            )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO serp_inflight (key, owner, started_at) VALUES (?, ?, ?)",
+                (key, self._owner, now),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def _unlock(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM serp_inflight WHERE key = ? AND owner = ?", (key, self._owner))
+            self._conn.commit()
+
+    def get_or_fetch(self, query, gl, hl, num, fetch, source="search"):
+        """Return cached data, or call fetch() once across all concurrent callers.
+
+        Args:
+            fetch: Zero-argument callable returning SERP data (or None on failure).
+            source: Namespace for non-SERP lookups stored in the same cache.
+        """
+        key = make_serp_key(query, gl, hl, num, source)
+        data = self._read(key)
+        if data is not None:
+            with self._lock:
+                self._hits += 1
+            logger.debug("SERP cache HIT: '%s'", query)
+            return data
+
+        # Threads in this process: the first one leads, the rest wait for it
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+        if not leader:
+            event.wait(self._lock_timeout)
+            data = self._read(key)
+            if data is not None:
+                with self._lock:
+                    self._hits += 1
+                return data
+            return None  # the leader's fetch failed; don't retry it here
+
+        try:
+            # Other processes: wait while one of them holds the lock
+            while not self._try_lock(key):
+                time.sleep(self._poll_interval)
+                data = self._read(key)
+                if data is not None:
+                    with self._lock:
+                        self._hits += 1
+                    return data
+            try:
+                data = self._read(key)  # filled while we were taking the lock
+                if data is not None:
+                    return data
+                with self._lock:
+                    self._misses += 1
+                data = fetch()
+                if data is not None:
+                    self._write(key, data)
+                return data
+            finally:
+                self._unlock(key)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM serp")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM serp").fetchone()[0]
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "total": total,
+            "hit_rate": f"{hit_rate:.1f}%",
+            "entries": entries,
+        }
+
+
+def create_serp_cache(enabled=None):
+    """Return a SerpCache configured from settings, or None when disabled.
+
+    Args:
+        enabled: Force on/off (default: SERP_CACHE_ENABLED setting).
+    """
+    from config.settings import SERP_CACHE_ENABLED, SERP_CACHE_PATH, SERP_CACHE_TTL
+
+    if enabled is None:
+        enabled = SERP_CACHE_ENABLED
+    if not enabled:
+        return None
+    try:
+        return SerpCache(SERP_CACHE_PATH, ttl=SERP_CACHE_TTL)
+    except sqlite3.Error as e:
+        logger.warning("SERP cache unavailable (%s). Calling SerperAPI directly.", e)
+        return None
@@ -0,0 +1,295 @@
+"""SheetMirror — Local SQLite mirror of each tenant's keyword spreadsheet."""
+import os
+import sqlite3
+import threading
+import time
+from core.sheets_client import DONE_STATUSES, PRIORITY, pending_rank, is_published
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MIRROR_PATH = ".cache/sheet_mirror.sqlite"
+
+
+class SheetMirror:
+    """Keeps keyword/status/link per sheet row in SQLite and syncs deltas with Sheets.
+
+    Pending and inventory queries run against the indexed local table.
+    Status changes are written locally as dirty rows and pushed back in one
+    batch on sync(). A sync only downloads the sheet when the mirror is older
+    than max_age or has changes to push, and only touches rows whose values
+    changed. Dirty rows are
+    never overwritten by a pull. Thread-safe; the file can be shared by the
+    scheduler and rq workers on the same host.
+    """
+
+    def __init__(self, path=DEFAULT_MIRROR_PATH, max_age=300):
+        """
+        Args:
+            path: SQLite file path (":memory:" for a process-local mirror).
+            max_age: Seconds before sync() downloads the sheet again.
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS sheet_rows ("
+            " spreadsheet_id TEXT NOT NULL,"
+            " row_num INTEGER NOT NULL,"
+            " keyword TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " link TEXT NOT NULL,"
+            " pending_rank INTEGER,"  # 0 priority, 1 regular, NULL not pending
+            " published INTEGER NOT NULL,"
+            " dirty INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL,"
+            " synced_at REAL NOT NULL,"
+            " PRIMARY KEY (spreadsheet_id, row_num));"
+            "CREATE INDEX IF NOT EXISTS idx_sheet_rows_pending"
+            " ON sheet_rows (spreadsheet_id, pending_rank, row_num);"
+            "CREATE INDEX IF NOT EXISTS idx_sheet_rows_published ON sheet_rows (spreadsheet_id, published);"
+            "CREATE INDEX IF NOT EXISTS idx_sheet_rows_dirty ON sheet_rows (spreadsheet_id, dirty);"
+            "CREATE TABLE IF NOT EXISTS sheet_sync ("
+            " spreadsheet_id TEXT PRIMARY KEY,"
+            " pulled_at REAL NOT NULL);"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _derived(keyword, status, link):
+        return pending_rank(keyword, status, DONE_STATUSES), int(is_published(keyword, status, link))
+
+    # ──────────────────────────────────────────────
+    # Sync
+    # ──────────────────────────────────────────────
+
+    def last_pulled(self, spreadsheet_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pulled_at FROM sheet_sync WHERE spreadsheet_id = ?", (spreadsheet_id,)
+            ).fetchone()
+        return row[0] if row else 0.0
+
+    def is_stale(self, spreadsheet_id):
+        return time.time() - self.last_pulled(spreadsheet_id) > self.max_age
+
+    def sync(self, sheets, spreadsheet_id, force=False):
+        """Push local status changes, then pull the sheet if the mirror is stale.
+
+        The sheet is downloaded at most once: the same snapshot checks the
+        pushed rows and is then merged into the mirror (it already carries
+        the pushed values).
+
+        Args:
+            sheets: SheetsClient used for the round trips.
+            force: Pull even if the mirror is fresh.
+
+        Returns:
+            Dict {"pushed": int, "changed": int, "removed": int, "pulled": bool}.
+        """
+        result = {"pushed": 0, "changed": 0, "removed": 0, "pulled": False}
+        if not (force or self.is_stale(spreadsheet_id) or self._dirty_rows(spreadsheet_id)):
+            return result
+        rows = sheets.snapshot(spreadsheet_id, refresh=True).rows
+        result["pushed"] = self.push(sheets, spreadsheet_id, rows=rows)
+        changed, removed = self.apply_rows(spreadsheet_id, rows)
+        result.update(changed=changed, removed=removed, pulled=True)
+        logger.info("Sheet mirror %s: %d changed, %d removed, %d pushed",
+                    spreadsheet_id, changed, removed, result["pushed"])
+        return result
+
+    def apply_rows(self, spreadsheet_id, rows):
+        """Merge downloaded sheet values (rows[0] is the header) into the mirror.
+
+        Returns:
+            (changed_rows, removed_rows).
+        """
+        now = time.time()
+        with self._lock:
+            local = {
+                row_num: (keyword, status, link, dirty)
+                for row_num, keyword, status, link, dirty in self._conn.execute(
+                    "SELECT row_num, keyword, status, link, dirty FROM sheet_rows WHERE spreadsheet_id = ?",
+                    (spreadsheet_id,),
+                )
+            }
+
+            upserts = []
+            for row_num, row in enumerate(rows[1:], start=2):
+                keyword, status, link = (list(row) + ["", "", ""])[:3]
+                current = local.get(row_num)
+                if current and (current[3] or current[:3] == (keyword, status, link)):
+                    continue  # unchanged, or has a local change waiting to be pushed
+                upserts.append((spreadsheet_id, row_num, keyword, status, link,
+                                *self._derived(keyword, status, link), now, now))
+
+            last_row = len(rows)
+            removed = [row_num for row_num in local if row_num > last_row and not local[row_num][3]]
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sheet_rows"
+                " (spreadsheet_id, row_num, keyword, status, link, pending_rank, published, dirty,"
+                "  updated_at, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                upserts,
+            )
+            self._conn.executemany(
+                "DELETE FROM sheet_rows WHERE spreadsheet_id = ? AND row_num = ?",
+                [(spreadsheet_id, row_num) for row_num in removed],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sheet_sync (spreadsheet_id, pulled_at) VALUES (?, ?)",
+                (spreadsheet_id, now),
+            )
+            self._conn.commit()
+        return len(upserts), len(removed)
+
+    def _dirty_rows(self, spreadsheet_id):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT row_num, keyword, status, link, updated_at FROM sheet_rows"
+                " WHERE spreadsheet_id = ? AND dirty = 1 ORDER BY row_num",
+                (spreadsheet_id,),
+            ).fetchall()
+
+    def push(self, sheets, spreadsheet_id, rows=None):
+        """Write dirty rows back to Sheets in one flush. Returns rows pushed.
+
+        Rows are addressed by number, so each one is checked against the
+        sheet first: if rows were inserted or deleted since the last pull,
+        the status goes to the row that now holds the keyword. Rows whose
+        keyword can't be located unambiguously are not written; their local
+        change is dropped and the next pull re-reads them. Rows that were
+        never pulled (no keyword to check) are written by number.
+
+        Args:
+            rows: Freshly downloaded sheet values (default: download a snapshot).
+        """
+        dirty = self._dirty_rows(spreadsheet_id)
+        if not dirty:
+            return 0
+
+        if rows is None:
+            rows = sheets.snapshot(spreadsheet_id, refresh=True).rows
+        located = {}
+        for row_num, row in enumerate(rows[1:], start=2):
+            keyword = row[0].strip().lower() if row else ""
+            if keyword:
+                located[keyword] = None if keyword in located else row_num  # None: ambiguous
+
+        pushed = 0
+        for row_num, keyword, status, link, _ in dirty:
+            sheet_row = rows[row_num - 1] if row_num <= len(rows) else []
+            target = row_num
+            if keyword.strip() and (sheet_row[0].strip() if sheet_row else "") != keyword.strip():
+                target = located.get(keyword.strip().lower())
+                if target is None:
+                    logger.warning("Sheet mirror %s: row %d no longer holds '%s'; status not pushed",
+                                   spreadsheet_id, row_num, keyword)
+                    continue
+                logger.info("Sheet mirror %s: '%s' moved from row %d to %d", spreadsheet_id, keyword, row_num, target)
+            sheets.update_row(spreadsheet_id, target, link, status=status)
+            pushed += 1
+        if pushed:
+            sheets.flush(spreadsheet_id)
+
+        now = time.time()
+        with self._lock:
+            # Rows changed again while pushing keep their dirty flag
+            self._conn.executemany(
+                "UPDATE sheet_rows SET dirty = 0, synced_at = ?"
+                " WHERE spreadsheet_id = ? AND row_num = ? AND updated_at = ?",
+                [(now, spreadsheet_id, row_num, updated_at) for row_num, _, _, _, updated_at in dirty],
+            )
+            self._conn.commit()
+        return pushed
+
+    # ──────────────────────────────────────────────
+    # Local reads / writes
+    # ──────────────────────────────────────────────
+
+    def update_status(self, spreadsheet_id, row_num, status, link=""):
+        """Record a status/link change locally; push() sends it to Sheets."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT keyword FROM sheet_rows WHERE spreadsheet_id = ? AND row_num = ?",
+                (spreadsheet_id, row_num),
+            ).fetchone()
+            keyword = row[0] if row else ""
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sheet_rows"
+                " (spreadsheet_id, row_num, keyword, status, link, pending_rank, published, dirty,"
+                "  updated_at, synced_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?,"
+                "  COALESCE((SELECT synced_at FROM sheet_rows WHERE spreadsheet_id = ? AND row_num = ?), 0))",
+                (spreadsheet_id, row_num, keyword, status, link, *self._derived(keyword, status, link),
+                 now, spreadsheet_id, row_num),
+            )
+            self._conn.commit()
+
+    def get_pending_rows(self, spreadsheet_id):
+        """Same result as SheetsClient.get_pending_rows(), from the local table."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_num, keyword, pending_rank FROM sheet_rows"
+                " WHERE spreadsheet_id = ? AND pending_rank IS NOT NULL"
+                " ORDER BY pending_rank, row_num",
+                (spreadsheet_id,),
+            ).fetchall()
+        pending = [{'row_num': row_num, 'keyword': keyword.strip()} for row_num, keyword, _ in rows]
+        logger.info("Found %d pending keywords (%d priority, %d regular) [mirror].",
+                    len(pending), sum(1 for r in rows if r[2] == PRIORITY),
+                    sum(1 for r in rows if r[2] != PRIORITY))
+        return pending
+
+    def get_all_completed_articles(self, spreadsheet_id):
+        """Same result as SheetsClient.get_all_completed_articles(), from the local table."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT keyword, link FROM sheet_rows WHERE spreadsheet_id = ? AND published = 1"
+                " ORDER BY row_num",
+                (spreadsheet_id,),
+            ).fetchall()
+        return [{'keyword': keyword, 'url': link} for keyword, link in rows]
+
+    def existing_keywords(self, spreadsheet_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT keyword FROM sheet_rows WHERE spreadsheet_id = ?", (spreadsheet_id,)
+            ).fetchall()
+        return {keyword.strip().lower() for (keyword,) in rows if keyword.strip()}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self):
+        with self._lock:
+            rows, dirty, sheets = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(dirty), 0), COUNT(DISTINCT spreadsheet_id) FROM sheet_rows"
+            ).fetchone()
+        return {"rows": rows, "dirty": dirty, "spreadsheets": sheets}
+
+
+def create_sheet_mirror(enabled=None):
+    """Return a SheetMirror configured from settings, or None when disabled.
+
+    Args:
+        enabled: Force on/off (default: SHEET_MIRROR_ENABLED setting).
+    """
+    from config.settings import SHEET_MIRROR_ENABLED, SHEET_MIRROR_PATH, SHEET_MIRROR_MAX_AGE
+
+    if enabled is None:
+        enabled = SHEET_MIRROR_ENABLED
+    if not enabled:
+        return None
+    try:
+        return SheetMirror(SHEET_MIRROR_PATH, max_age=SHEET_MIRROR_MAX_AGE)
+    except sqlite3.Error as e:
+        logger.warning("Sheet mirror unavailable (%s). Reading Sheets directly.", e)
+        return None
@@ -1,59 +1,229 @@
 import gspread
 import os
+import threading
+from gspread.utils import ValueInputOption
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class SheetsWriteBuffer:
+    """Collects cell updates and row appends per spreadsheet and sends them in bulk.
+
+    flush() issues at most one batch_update and one append_rows call per
+    spreadsheet, instead of one API round trip per cell/row. Thread-safe.
+    """
+
+    def __init__(self, flush_threshold=50):
+        """
+        Args:
+            flush_threshold: Pending writes (per spreadsheet) that trigger an automatic flush.
+        """
+        self.flush_threshold = flush_threshold
+        self._updates = {}  # {spreadsheet_id: [{"range": "B5:C5", "values": [[...]]}]}
+        self._appends = {}  # {spreadsheet_id: [[col_a, col_b, col_c], ...]}
+        self._lock = threading.Lock()
+
+    def add_update(self, spreadsheet_id, cell_range, values):
+        """Queue a range update. Returns True when the threshold is reached."""
+        with self._lock:
+            self._updates.setdefault(spreadsheet_id, []).append({"range": cell_range, "values": values})
+            return self._count(spreadsheet_id) >= self.flush_threshold
+
+    def add_append(self, spreadsheet_id, row):
+        """Queue a row append. Returns True when the threshold is reached."""
+        with self._lock:
+            self._appends.setdefault(spreadsheet_id, []).append(list(row))
+            return self._count(spreadsheet_id) >= self.flush_threshold
+
+    def _count(self, spreadsheet_id):
+        return len(self._updates.get(spreadsheet_id, ())) + len(self._appends.get(spreadsheet_id, ()))
+
+    @property
+    def pending(self):
+        """Total queued writes across all spreadsheets."""
+        with self._lock:
+            return sum(self._count(sid) for sid in set(self._updates) | set(self._appends))
+
+    def restore(self, spreadsheet_id, updates, appends):
+        """Put writes back at the front of the queue (after a failed flush)."""
+        with self._lock:
+            self._updates[spreadsheet_id] = list(updates) + self._updates.get(spreadsheet_id, [])
+            self._appends[spreadsheet_id] = list(appends) + self._appends.get(spreadsheet_id, [])
+
+    def take(self, spreadsheet_id=None):
+        """Remove and return queued writes: {spreadsheet_id: (updates, appends)}."""
+        with self._lock:
+            ids = [spreadsheet_id] if spreadsheet_id else list(set(self._updates) | set(self._appends))
+            return {
+                sid: (self._updates.pop(sid, []), self._appends.pop(sid, []))
+                for sid in ids
+            }
+
+
+# Statuses that mean "already done" — everything else is pending
+DONE_STATUSES = {'done', 'error'}
+
+PRIORITY, REGULAR = 0, 1
+
+
+def pending_rank(keyword, status, done_statuses=DONE_STATUSES):
+    """PRIORITY or REGULAR for a row still to be written, None for empty/done/error rows."""
+    if not keyword.strip() or status.strip().lower() in done_statuses:
+        return None
+    # Everything else is pending (empty, Pending, pendente, Sugestão IA, etc.)
+    return PRIORITY if "PRIORIDADE" in status.upper() else REGULAR
+
+
+def is_published(keyword, status, link):
+    """True for rows usable as internal-link targets (Status=Done and has Link)."""
+    return bool(keyword) and "Done" in status and "http" in link
+
+
+class WorksheetSnapshot:
+    """In-memory copy of a worksheet's values, downloaded once per run.
+
+    Pending rows, the completed inventory and the existing-keyword set are all
+    served from it. Our own writes are applied locally (apply_update/apply_append)
+    so it stays consistent without downloading the sheet again.
+    """
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]  # rows[0] is the header; sheet row N is rows[N-1]
+
+    def _cell(self, row, col):
+        return row[col] if len(row) > col else ""
+
+    def pending_rows(self, done_statuses):
+        """Returns (priority, regular) lists of {'row_num', 'keyword'}."""
+        priority = []
+        regular = []
+        for i, row in enumerate(self.rows[1:], start=2):
+            keyword = self._cell(row, 0)
+            rank = pending_rank(keyword, self._cell(row, 1), done_statuses)
+            if rank is None:
+                continue
+            item = {'row_num': i, 'keyword': keyword.strip()}
+            (priority if rank == PRIORITY else regular).append(item)
+        return priority, regular
+
+    def completed_articles(self):
+        completed = []
+        for row in self.rows[1:]:
+            keyword = self._cell(row, 0)
+            link = self._cell(row, 2)
+            if is_published(keyword, self._cell(row, 1), link):
+                completed.append({'keyword': keyword, 'url': link})
+        return completed
+
+    def keywords(self):
+        """Lowercased keywords of every data row (pending and done)."""
+        return {row[0].strip().lower() for row in self.rows[1:] if row and row[0].strip()}
+
+    def apply_update(self, row_num, status, link):
+        while len(self.rows) < row_num:
+            self.rows.append([])
+        row = self.rows[row_num - 1]
+        row.extend([""] * (3 - len(row)))
+        row[1] = status
+        row[2] = link
+
+    def apply_append(self, row):
+        self.rows.append(list(row))
+
+
 class SheetsClient:
-    def __init__(self, credentials_path='config/service_account.json'):
+    def __init__(self, credentials_path='config/service_account.json', buffered=False, flush_threshold=50):
+        """
+        Args:
+            credentials_path: Service account JSON file.
+            buffered: If True, writes are queued until flush() (or flush_threshold is
+                      reached) and sent with batch_update/append_rows. Callers must
+                      flush() at the end of each article/tenant.
+            flush_threshold: Pending writes per spreadsheet that trigger an automatic flush.
+        """
         if not os.path.exists(credentials_path):
             raise FileNotFoundError(f"Credentials file not found at {credentials_path}. Please place your service_account.json there.")
 
         self.gc = gspread.service_account(filename=credentials_path)
+        self.buffered = buffered
+        self._buffer = SheetsWriteBuffer(flush_threshold=flush_threshold)
+        self._worksheets = {}  # {spreadsheet_id: Worksheet} — avoids re-opening per write
+        self._snapshots = {}  # {spreadsheet_id: WorksheetSnapshot} — one download per run
         logger.info("Google Sheets client initialized.")
 
-    # Statuses that mean "already done" — everything else is pending
-    DONE_STATUSES = {'done', 'error'}
+    def _worksheet(self, spreadsheet_id):
+        """First worksheet of a spreadsheet, opened once per client."""
+        worksheet = self._worksheets.get(spreadsheet_id)
+        if worksheet is None:
+            worksheet = self.gc.open_by_key(spreadsheet_id).get_worksheet(0)
+            self._worksheets[spreadsheet_id] = worksheet
+        return worksheet
 
-    def get_pending_rows(self, spreadsheet_id):
-        """
-        Reads the spreadsheet and finds rows where Status is NOT 'Done'.
-        Recognizes: empty, 'Pending', 'pendente', '💡 Sugestão IA' as pending.
-        PRIORIDADE keywords are sorted first.
-        Returns a list of dicts: {'row_num': int, 'keyword': str}
+    def snapshot(self, spreadsheet_id, refresh=False):
+        """WorksheetSnapshot of the first worksheet, downloaded once per client.
+
+        Args:
+            refresh: Re-download even if a snapshot is cached.
         """
-        sh = self.gc.open_by_key(spreadsheet_id)
-        worksheet = sh.get_worksheet(0)
+        snap = self._snapshots.get(spreadsheet_id)
+        if snap is None or refresh:
+            snap = WorksheetSnapshot(self._worksheet(spreadsheet_id).get_all_values())
+            self._snapshots[spreadsheet_id] = snap
+            logger.debug("Sheets snapshot loaded for %s: %d rows", spreadsheet_id, len(snap.rows))
+        return snap
 
-        rows = worksheet.get_all_values()
+    def existing_keywords(self, spreadsheet_id):
+        """Lowercased set of every keyword in the sheet (pending + done), from the snapshot."""
+        return self.snapshot(spreadsheet_id).keywords()
 
-        priority = []
-        regular = []
-        for i, row in enumerate(rows[1:], start=2):
-            keyword = row[0] if len(row) > 0 else ""
-            status = row[1] if len(row) > 1 else ""
+    def _queued(self, spreadsheet_id, threshold_reached):
+        """Flush now when unbuffered or when the buffer is full."""
+        if not self.buffered or threshold_reached:
+            self.flush(spreadsheet_id)
 
-            if not keyword.strip():
-                continue
+    def flush(self, spreadsheet_id=None):
+        """Send queued writes: one batch_update + one append_rows per spreadsheet.
 
-            status_lower = status.strip().lower()
+        Args:
+            spreadsheet_id: Flush only this spreadsheet (default: all).
 
-            # Skip done/error rows
-            if status_lower in self.DONE_STATUSES:
+        Returns:
+            Number of writes sent.
+        """
+        sent = 0
+        for sid, (updates, appends) in self._buffer.take(spreadsheet_id).items():
+            if not updates and not appends:
                 continue
+            count = len(updates) + len(appends)
+            worksheet = self._worksheet(sid)
+            try:
+                if updates:
+                    worksheet.batch_update(updates, value_input_option=ValueInputOption.user_entered)
+                    updates = []
+                if appends:
+                    worksheet.append_rows(appends)
+            except Exception:
+                self._buffer.restore(sid, updates, appends)  # keep unsent writes for the next flush
+                raise
+            sent += count
+            logger.debug("Sheets flush %s: %d write(s)", sid, count)
+        return sent
 
-            if "PRIORIDADE" in status.upper():
-                priority.append({
-                    'row_num': i,
-                    'keyword': keyword.strip()
-                })
-            else:
-                # Everything else is pending (empty, Pending, pendente, Sugestão IA, etc.)
-                regular.append({
-                    'row_num': i,
-                    'keyword': keyword.strip()
-                })
+    @property
+    def pending_writes(self):
+        return self._buffer.pending
+
+    DONE_STATUSES = DONE_STATUSES
+
+    def get_pending_rows(self, spreadsheet_id):
+        """
+        Reads the spreadsheet and finds rows where Status is NOT 'Done'.
+        Recognizes: empty, 'Pending', 'pendente', '💡 Sugestão IA' as pending.
+        PRIORIDADE keywords are sorted first.
+        Returns a list of dicts: {'row_num': int, 'keyword': str}
+        """
+        priority, regular = self.snapshot(spreadsheet_id).pending_rows(self.DONE_STATUSES)
 
         # Priority keywords first, then regular pending
         pending = priority + regular
@@ -63,13 +233,12 @@ class SheetsClient:
 
     def update_row(self, spreadsheet_id, row_num, link, status="Done"):
         """
-        Updates the Status (Col B) and Link (Col C).
+        Updates the Status (Col B) and Link (Col C) in a single range write.
         """
-        sh = self.gc.open_by_key(spreadsheet_id)
-        worksheet = sh.get_worksheet(0)
-
-        worksheet.update_cell(row_num, 2, status)
-        worksheet.update_cell(row_num, 3, link)
+        full = self._buffer.add_update(spreadsheet_id, f"B{row_num}:C{row_num}", [[status, link]])
+        if spreadsheet_id in self._snapshots:
+            self._snapshots[spreadsheet_id].apply_update(row_num, status, link)
+        self._queued(spreadsheet_id, full)
         logger.info("Updated row %d: status='%s'", row_num, status)
 
     def get_all_completed_articles(self, spreadsheet_id):
@@ -77,21 +246,7 @@ class SheetsClient:
         Returns a list of articles that are already published (Status=Done and has Link).
         Used for Internal Linking Strategy.
         """
-        sh = self.gc.open_by_key(spreadsheet_id)
-        worksheet = sh.get_worksheet(0)
-        rows = worksheet.get_all_values()
-
-        completed = []
-        for row in rows[1:]:
-            keyword = row[0] if len(row) > 0 else ""
-            status = row[1] if len(row) > 1 else ""
-            link = row[2] if len(row) > 2 else ""
-
-            if keyword and "Done" in status and "http" in link:
-                completed.append({
-                    'keyword': keyword,
-                    'url': link
-                })
+        completed = self.snapshot(spreadsheet_id).completed_articles()
         logger.info("Found %d completed articles for internal linking.", len(completed))
         return completed
 
@@ -99,9 +254,11 @@ class SheetsClient:
         """
         Appends a new topic suggested by AI to the end of the sheet.
         """
-        sh = self.gc.open_by_key(spreadsheet_id)
-        worksheet = sh.get_worksheet(0)
-        worksheet.append_row([topic, "💡 Sugestão IA", ""])
+        row = [topic, "💡 Sugestão IA", ""]
+        full = self._buffer.add_append(spreadsheet_id, row)
+        if spreadsheet_id in self._snapshots:
+            self._snapshots[spreadsheet_id].apply_append(row)
+        self._queued(spreadsheet_id, full)
         logger.info("New topic added: %s", topic)
 
     def add_priority_keyword(self, spreadsheet_id, keyword, source_article=""):
@@ -109,15 +266,15 @@ class SheetsClient:
         Adds a keyword with PRIORITY flag — needed for internal linking.
         These keywords should be written FIRST to enable link building.
         """
-        sh = self.gc.open_by_key(spreadsheet_id)
-        worksheet = sh.get_worksheet(0)
-
-        # Check if keyword already exists in the sheet to avoid duplicates
-        existing = worksheet.col_values(1)
-        if keyword.strip().lower() in [k.strip().lower() for k in existing]:
+        # Check if keyword already exists in the sheet (snapshot includes our queued rows)
+        snap = self.snapshot(spreadsheet_id)
+        if keyword.strip().lower() in snap.keywords():
             logger.info("Priority keyword '%s' already exists in sheet. Skipping.", keyword)
             return False
 
-        worksheet.append_row([keyword, f"🔗 PRIORIDADE (link de: {source_article[:40]})", ""])
+        row = [keyword, f"🔗 PRIORIDADE (link de: {source_article[:40]})", ""]
+        full = self._buffer.add_append(spreadsheet_id, row)
+        snap.apply_append(row)
+        self._queued(spreadsheet_id, full)
         logger.info("PRIORITY keyword added: '%s' (needed by: %s)", keyword, source_article[:40])
         return True
@@ -0,0 +1,114 @@
+"""StageGraph — Runs pipeline stages as a dependency graph on a thread pool."""
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StageGraphError(Exception):
+    """Raised when the graph is invalid (unknown dependency or cycle)."""
+    pass
+
+
+@dataclass
+class Stage:
+    """A unit of work. func receives the dict of results produced so far."""
+    name: str
+    func: object
+    deps: tuple = field(default_factory=tuple)
+
+
+class StageGraph:
+    """Declares stages with dependencies and runs independent ones concurrently.
+
+    Usage:
+        graph = StageGraph(max_workers=4)
+        graph.add("serp", lambda r: fetch_serp(keyword))
+        graph.add("cluster", lambda r: find_cluster(keyword))
+        graph.add("brief", lambda r: combine(r["serp"], r["cluster"]), deps=("serp", "cluster"))
+        results = graph.run()
+
+    A stage starts as soon as all its deps have finished. If a stage raises,
+    no new stages are started and the exception is re-raised once in-flight
+    stages complete.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._stages = {}
+        self.timings = {}  # {stage_name: duration_ms}
+
+    def add(self, name, func, deps=()):
+        """Register a stage. Returns self for chaining."""
+        if name in self._stages:
+            raise StageGraphError(f"Stage '{name}' already defined")
+        self._stages[name] = Stage(name=name, func=func, deps=tuple(deps))
+        return self
+
+    def _validate(self):
+        for stage in self._stages.values():
+            for dep in stage.deps:
+                if dep not in self._stages:
+                    raise StageGraphError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn's algorithm — detect cycles before running anything
+        remaining = {name: set(stage.deps) for name, stage in self._stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise StageGraphError(f"Cycle detected among stages: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _timed(self, stage, results):
+        start = time.time()
+        try:
+            return stage.func(results)
+        finally:
+            self.timings[stage.name] = (time.time() - start) * 1000
+
+    def run(self, initial=None):
+        """Execute all stages, respecting dependencies.
+
+        Args:
+            initial: Optional dict of precomputed results visible to every stage.
+
+        Returns:
+            Dict {stage_name: result} (including initial entries).
+        """
+        self._validate()
+        results = dict(initial or {})
+        pending = dict(self._stages)
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if error is None:
+                    ready = [s for s in pending.values() if all(d in results for d in s.deps)]
+                    for stage in ready:
+                        del pending[stage.name]
+                        # Stages get a snapshot so concurrent writes never race with reads
+                        running[pool.submit(self._timed, stage, dict(results))] = stage.name
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        if error is None:
+                            error = e
+                            logger.error("Stage '%s' failed: %s", name, e)
+
+        if error is not None:
+            raise error
+
+        logger.debug("Stage timings (ms): %s", {k: round(v) for k, v in self.timings.items()})
+        return results
@@ -253,6 +253,11 @@ class TenantConfig:
         """Return SEO configuration dict."""
         return self._data.get("seo", {"min_score": 40, "max_internal_links": 5})
 
+    def get_kb_config(self):
+        """Return knowledge base retrieval configuration dict."""
+        defaults = {"retrieval": True, "top_k": 8, "max_chars": 12000, "chunk_size": 1200}
+        return _deep_merge(defaults, self._data.get("knowledge_base", {}) or {})
+
     def to_site_config(self):
         """Convert back to legacy site_config dict for backward compatibility."""
         return {
@@ -1,23 +1,145 @@
 import requests
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# (connect, read) timeouts in seconds — uploads get a longer read timeout
+DEFAULT_TIMEOUT = (5, 60)
+UPLOAD_TIMEOUT = (5, 180)
+
+# WordPress caps /batch/v1 at 25 sub-requests per call
+BATCH_LIMIT = 25
+
+
+def build_session(pool_maxsize=10, retries=3, backoff_factor=0.5):
+    """requests.Session with a keep-alive connection pool and retry on 502/503/504.
+
+    Only idempotent methods (GET, PUT, DELETE, ...) are retried on those
+    statuses: a POST that got a 504 may already have created the post or
+    media, and retrying it would create a duplicate. Failed connection
+    attempts are retried for every method.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class WordPressClient:
-    def __init__(self, base_url, username, app_password):
+    def __init__(self, base_url, username, app_password, session=None, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            base_url: WordPress site URL.
+            username: WordPress user.
+            app_password: Application password.
+            session: Optional requests.Session (default: pooled session from build_session()).
+            timeout: (connect, read) timeout applied to every request.
+        """
         self.base_url = base_url.rstrip('/')
         self.username = username
         self.app_password = app_password
         self.headers = {
             "Authorization": "Basic " + base64.b64encode(f"{self.username}:{self.app_password}".encode()).decode()
         }
+        self.timeout = timeout
+        # One session per client: every call reuses the same keep-alive connections
+        self.session = session or build_session()
+        self._batch_supported = None  # unknown until the first send_batch()
+        # Routes whose writes can't go through /batch/v1 (core registers media with allow_batch false)
+        self._unbatchable_routes = {"/wp/v2/media"}
+
+    def batch(self, rate_limiter=None, size=BATCH_LIMIT):
+        """Queue update_post/update_media writes and send them through /batch/v1.
+
+        Usage:
+            with wp.batch() as batch:
+                write = batch.update_post(post_id, {"title": "New"})
+            write.ok  # known once the block exits
+        """
+        return WPBatch(self, rate_limiter=rate_limiter, size=size)
+
+    @property
+    def supports_batch(self):
+        """False once the site is known to have no /batch/v1 endpoint."""
+        return self._batch_supported is not False
+
+    def can_batch(self, route):
+        """True if writes to route (e.g. "/wp/v2/posts") may go through /batch/v1."""
+        return self.supports_batch and route not in self._unbatchable_routes
+
+    def refuse_batch(self, route):
+        """Remember a route that answered rest_batch_not_allowed."""
+        if route not in self._unbatchable_routes:
+            logger.info("Route %s refuses batching on %s. Sending its writes individually.", route, self.base_url)
+            self._unbatchable_routes.add(route)
+
+    def send_batch(self, writes):
+        """POST up to BATCH_LIMIT writes to /wp-json/batch/v1 (WordPress 5.6+).
+
+        Args:
+            writes: List of BatchWrite.
+
+        Returns:
+            List of (status, body) per write, or None when the site has no batch
+            endpoint (or the call failed) and the writes must be sent one by one.
+        """
+        if self._batch_supported is False or not writes:
+            return None
+        payload = {
+            "validation": "normal",
+            "requests": [{"method": w.method, "path": w.path, "body": w.body} for w in writes],
+        }
+        try:
+            r = self.session.post(f"{self.base_url}/wp-json/batch/v1", headers=self.headers,
+                                  json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning("Batch request failed (%d writes): %s. Sending individually.", len(writes), e)
+            return None
+        if r.status_code in (404, 405):
+            logger.info("No /batch/v1 endpoint on %s. Sending writes individually.", self.base_url)
+            self._batch_supported = False
+            return None
+        if r.status_code not in (200, 207):
+            logger.warning("Batch request rejected (status=%d): %s", r.status_code, r.text[:200])
+            return None
+        self._batch_supported = True
+        responses = r.json().get("responses", [])
+        if len(responses) != len(writes):
+            return None
+        return [(item.get("status", 0), item.get("body")) for item in responses]
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def verify_auth(self):
         """Check if connection works."""
         try:
-            r = requests.get(f"{self.base_url}/wp-json/wp/v2/users/me", headers=self.headers)
+            r = self.session.get(f"{self.base_url}/wp-json/wp/v2/users/me", headers=self.headers,
+                                 timeout=self.timeout)
             if r.status_code == 200:
                 logger.info("WordPress auth verified for %s", self.base_url)
                 return True
@@ -30,6 +152,9 @@ class WordPressClient:
     def upload_media(self, image_data, filename, alt_text=""):
         """
         Uploads an image to WordPress Media Library and sets alt text.
+
+        The alt text goes in the upload request itself (?alt_text=); a separate
+        update_media() call is only made if the response shows it wasn't applied.
         """
         url = f"{self.base_url}/wp-json/wp/v2/media"
         headers = self.headers.copy()
@@ -43,16 +168,18 @@ class WordPressClient:
         headers["Content-Type"] = content_types.get(ext, "image/jpeg")
 
         try:
-            r = requests.post(url, headers=headers, data=image_data)
+            r = self.session.post(url, headers=headers, data=image_data,
+                                  params={"alt_text": alt_text} if alt_text else None, timeout=UPLOAD_TIMEOUT)
         except requests.RequestException as e:
             logger.error("Media upload connection failed for '%s': %s", filename, e)
             return None, None
         if r.status_code == 201:
-            media_id = r.json().get('id')
-            media_url = r.json().get('source_url')
+            media = r.json()
+            media_id = media.get('id')
+            media_url = media.get('source_url')
             logger.info("Media uploaded: %s (ID: %s)", filename, media_id)
 
-            if alt_text and media_id:
+            if alt_text and media_id and media.get('alt_text') != alt_text:
                 self.update_media(media_id, alt_text)
 
             return media_id, media_url
@@ -65,7 +192,7 @@ class WordPressClient:
         url = f"{self.base_url}/wp-json/wp/v2/media/{media_id}"
         payload = {"alt_text": alt_text}
         try:
-            r = requests.post(url, headers=self.headers, json=payload)
+            r = self.session.post(url, headers=self.headers, json=payload, timeout=self.timeout)
             if r.status_code == 200:
                 logger.info("Media alt text updated (ID: %s): '%s'", media_id, alt_text[:60])
                 return True
@@ -119,7 +246,7 @@ class WordPressClient:
             payload['featured_media'] = featured_media_id
 
         try:
-            r = requests.post(url, headers=self.headers, json=payload)
+            r = self.session.post(url, headers=self.headers, json=payload, timeout=self.timeout)
         except requests.RequestException as e:
             logger.error("WordPress post creation failed (network): %s", e)
             raise
@@ -130,7 +257,7 @@ class WordPressClient:
             if 'meta' in payload:
                 del payload['meta']
                 try:
-                    r = requests.post(url, headers=self.headers, json=payload)
+                    r = self.session.post(url, headers=self.headers, json=payload, timeout=self.timeout)
                 except requests.RequestException as e:
                     logger.error("WordPress post creation retry failed (network): %s", e)
                     raise
@@ -140,35 +267,184 @@ class WordPressClient:
         logger.info("Post created: '%s' (ID: %s, status: %s)", title, post_data.get('id'), status)
         return post_data
 
-    def get_posts(self, per_page=100, status="publish"):
-        """Fetch all published posts from WordPress."""
-        posts = []
-        page = 1
-        while True:
-            url = f"{self.base_url}/wp-json/wp/v2/posts"
-            params = {"per_page": per_page, "page": page, "status": status}
-            try:
-                r = requests.get(url, headers=self.headers, params=params)
-                if r.status_code != 200:
-                    break
-                batch = r.json()
+    def _get_posts_page(self, page, params, headers=None):
+        """Fetch one page of posts. Returns (response, posts) — posts is None on failure."""
+        url = f"{self.base_url}/wp-json/wp/v2/posts"
+        try:
+            r = self.session.get(url, headers=headers or self.headers, params=dict(params, page=page),
+                                 timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error("Failed to fetch posts (page %d): %s", page, e)
+            return None, None
+        if r.status_code != 200:
+            return r, None
+        return r, r.json()
+
+    @staticmethod
+    def _posts_params(per_page, status, fields):
+        params = {"per_page": per_page, "status": status}
+        if fields:
+            params["_fields"] = ",".join(fields)
+        return params
+
+    def _collect_pages(self, first_response, first_posts, params, max_workers, strict=False):
+        """Add pages 2..N to the first page's posts, fetching them concurrently.
+
+        A page that fails is skipped (and logged); with strict=True the whole
+        listing is discarded instead and None is returned.
+        """
+        posts = list(first_posts)
+        per_page = params["per_page"]
+        try:
+            total_pages = int(first_response.headers.get("X-WP-TotalPages", 0))
+        except (TypeError, ValueError):
+            total_pages = 0
+
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total_pages - 1))) as pool:
+                pages = pool.map(lambda page: self._get_posts_page(page, params)[1],
+                                 range(2, total_pages + 1))
+                for page, batch in enumerate(pages, start=2):
+                    if batch is None:
+                        logger.warning("Posts page %d/%d failed; listing is incomplete", page, total_pages)
+                        if strict:
+                            return None
+                    posts.extend(batch or [])
+        elif not total_pages and len(posts) >= per_page:
+            # No pagination headers (some proxies strip them) — walk pages until a short one
+            page = 2
+            while True:
+                _, batch = self._get_posts_page(page, params)
+                if batch is None and strict:
+                    return None
                 if not batch:
                     break
                 posts.extend(batch)
                 if len(batch) < per_page:
                     break
                 page += 1
-            except requests.RequestException as e:
-                logger.error("Failed to fetch posts (page %d): %s", page, e)
-                break
+        return posts
+
+    def get_posts(self, per_page=100, status="publish", fields=None, max_workers=4, strict=False):
+        """Fetch all posts from WordPress.
+
+        The first page's X-WP-TotalPages header tells how many pages there are;
+        the rest are fetched concurrently (at most max_workers at a time) and
+        returned in page order.
+
+        Args:
+            per_page: Posts per page (WP max 100).
+            status: Post status filter.
+            fields: Optional list of fields to return (_fields projection),
+                e.g. ["id", "link", "title"]. Skips the rendered content when omitted from it.
+            max_workers: Concurrent page requests.
+            strict: Return None instead of a partial list when any page fails.
+        """
+        params = self._posts_params(per_page, status, fields)
+        r, posts = self._get_posts_page(1, params)
+        if posts is None and strict:
+            return None
+        if not posts:
+            logger.info("Fetched 0 posts from WordPress")
+            return []
+        posts = self._collect_pages(r, posts, params, max_workers, strict=strict)
+        if posts is None:
+            return None
         logger.info("Fetched %d posts from WordPress", len(posts))
         return posts
 
+    def get_posts_since(self, modified_after=None, etag=None, per_page=100, status="publish",
+                        fields=None, max_workers=4):
+        """Fetch posts modified after a timestamp, with a conditional first request.
+
+        Args:
+            modified_after: WP-local ISO timestamp ("2024-05-01T10:00:00"); None fetches everything.
+            etag: ETag from the previous call, sent as If-None-Match.
+
+        Returns:
+            (posts, etag). posts is None when the server answered 304 Not Modified
+            or the request failed.
+        """
+        params = self._posts_params(per_page, status, fields)
+        params.update(orderby="modified", order="asc")
+        if modified_after:
+            params["modified_after"] = modified_after
+        headers = dict(self.headers, **({"If-None-Match": etag} if etag else {}))
+
+        r, posts = self._get_posts_page(1, params, headers=headers)
+        if r is None:
+            return None, etag
+        if r.status_code == 304:
+            return None, etag
+        if r.status_code != 200:
+            logger.warning("Incremental post fetch failed (status=%d)", r.status_code)
+            return None, etag
+        new_etag = r.headers.get("ETag") or None
+        if not posts:
+            return [], new_etag
+        posts = self._collect_pages(r, posts, params, max_workers)
+        logger.info("Fetched %d posts modified after %s", len(posts), modified_after or "the beginning")
+        return posts, new_etag
+
+    def get_media(self, media_ids, fields=("id", "source_url"), chunk_size=100):
+        """Fetch many media items with /media?include=... (100 per request).
+
+        Returns:
+            Dict {media_id: media_dict}. IDs that fail or don't exist are missing.
+        """
+        ids = sorted({int(mid) for mid in media_ids if mid})
+        media = {}
+        url = f"{self.base_url}/wp-json/wp/v2/media"
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            params = {"include": ",".join(map(str, chunk)), "per_page": len(chunk)}
+            if fields:
+                params["_fields"] = ",".join(fields)
+            try:
+                r = self.session.get(url, headers=self.headers, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.error("Failed to fetch media batch: %s", e)
+                continue
+            if r.status_code != 200:
+                logger.warning("Failed to fetch media batch (status=%d)", r.status_code)
+                continue
+            for item in r.json():
+                media[item.get("id")] = item
+        return media
+
+    def get_post(self, post_id, fields=None):
+        """Fetch a single post by ID. Returns the post dict or None."""
+        url = f"{self.base_url}/wp-json/wp/v2/posts/{post_id}"
+        params = {"_fields": ",".join(fields)} if fields else None
+        try:
+            r = self.session.get(url, headers=self.headers, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error("Failed to fetch post %s: %s", post_id, e)
+            return None
+        if r.status_code != 200:
+            logger.warning("Post %s not available (status=%d)", post_id, r.status_code)
+            return None
+        return r.json()
+
+    def count_posts(self, status="publish"):
+        """Number of posts, read from X-WP-Total of a single per_page=1 request.
+
+        Returns:
+            int, or None if the count could not be read.
+        """
+        r, _ = self._get_posts_page(1, {"per_page": 1, "status": status, "_fields": "id"})
+        if r is None or r.status_code != 200:
+            return None
+        try:
+            return int(r.headers["X-WP-Total"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
     def update_post(self, post_id, payload):
         """Update an existing post via WP REST API."""
         url = f"{self.base_url}/wp-json/wp/v2/posts/{post_id}"
         try:
-            r = requests.post(url, headers=self.headers, json=payload)
+            r = self.session.post(url, headers=self.headers, json=payload, timeout=self.timeout)
             if r.status_code == 200:
                 logger.info("Post updated (ID: %s)", post_id)
                 return r.json()
@@ -177,3 +453,108 @@ class WordPressClient:
         except requests.RequestException as e:
             logger.error("Failed to update post (ID: %s): %s", post_id, e)
             return None
+
+
+class BatchWrite:
+    """One queued write. ok/response are set once its batch has been sent."""
+
+    def __init__(self, method, path, body, fallback):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.fallback = fallback  # sends the same write on its own
+        self.route = path.rsplit("/", 1)[0]  # "/wp/v2/posts/5" -> "/wp/v2/posts"
+        self.ok = None
+        self.response = None
+
+
+class WPBatch:
+    """Collects writes and sends them BATCH_LIMIT at a time; flushes on exit.
+
+    Sites without /batch/v1 and routes that refuse batching (media, or any
+    route that answered rest_batch_not_allowed) get the same writes as
+    individual update_post/update_media calls. Thread-safe.
+    """
+
+    def __init__(self, client, rate_limiter=None, size=BATCH_LIMIT):
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.size = min(size, BATCH_LIMIT)
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def update_post(self, post_id, payload):
+        return self._queue(BatchWrite("POST", f"/wp/v2/posts/{post_id}", payload,
+                                      lambda: self.client.update_post(post_id, payload)))
+
+    def update_media(self, media_id, alt_text):
+        return self._queue(BatchWrite("POST", f"/wp/v2/media/{media_id}", {"alt_text": alt_text},
+                                      lambda: self.client.update_media(media_id, alt_text)))
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _queue(self, write):
+        with self._lock:
+            self._pending.append(write)
+            ready = self._take() if len(self._pending) >= self.size else None
+        if ready:
+            self._send(ready)
+        return write
+
+    def _take(self):
+        chunk, self._pending = self._pending[:self.size], self._pending[self.size:]
+        return chunk
+
+    def flush(self):
+        """Send everything queued."""
+        while True:
+            with self._lock:
+                chunk = self._take()
+            if not chunk:
+                return
+            self._send(chunk)
+
+    def _throttle(self):
+        if self.rate_limiter:
+            self.rate_limiter.throttle()
+
+    def _send(self, writes):
+        batched = [w for w in writes if self.client.can_batch(w.route)]
+        single = [w for w in writes if not self.client.can_batch(w.route)]
+        results = None
+        if batched:
+            self._throttle()
+            results = self.client.send_batch(batched)
+        if results is None:
+            single = batched + single
+        else:
+            for write, (status, body) in zip(batched, results):
+                if status == 400 and isinstance(body, dict) and body.get("code") == "rest_batch_not_allowed":
+                    self.client.refuse_batch(write.route)
+                    single.append(write)
+                    continue
+                write.ok = 200 <= status < 300
+                write.response = body
+                if not write.ok:
+                    logger.warning("Batched write %s failed (status=%s)", write.path, status)
+        for write in single:
+            self._send_single(write)
+
+    def _send_single(self, write):
+        self._throttle()
+        try:
+            result = write.fallback()
+        except Exception as e:
+            logger.warning("Write %s failed: %s", write.path, e)
+            result = None
+        write.ok = result is not None and result is not False
+        write.response = result
@@ -0,0 +1,264 @@
+"""WPPostCache — Local SQLite store of each site's published WordPress posts."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = ".cache/wp_posts.sqlite"
+
+# Fields kept per post — everything the reoptimizer and freshness engine read
+CACHED_FIELDS = ["id", "slug", "link", "date", "modified", "title", "content", "excerpt",
+                 "featured_media", "meta"]
+
+
+def content_hash(html):
+    """Stable hash of a post's rendered content."""
+    return hashlib.sha1((html or "").encode("utf-8")).hexdigest()
+
+
+def normalize_url(url):
+    """Lookup key for a post URL: no scheme, no trailing slash, lowercase."""
+    url = (url or "").strip().lower()
+    for prefix in ("https://", "http://"):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+    if url.startswith("www."):
+        url = url[4:]
+    return url.split("#")[0].split("?")[0].rstrip("/")
+
+
+class WPPostCache:
+    """Keeps every published post per site, keyed by ID with slug/URL indexes.
+
+    sync() only downloads posts modified since the newest one already stored
+    (modified_after), sending the last ETag so an unchanged site costs a
+    single 304. One count request detects deletions/unpublishes; only then
+    is an id-only listing fetched to prune them. Syncs are skipped while the
+    cache is younger than max_age. Thread-safe.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age=300):
+        """
+        Args:
+            path: SQLite file path (":memory:" for a process-local cache).
+            max_age: Seconds before sync() asks WordPress for changes again.
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS wp_posts ("
+            " site TEXT NOT NULL,"
+            " post_id INTEGER NOT NULL,"
+            " slug TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " modified TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " cached_at REAL NOT NULL,"
+            " PRIMARY KEY (site, post_id));"
+            "CREATE INDEX IF NOT EXISTS idx_wp_posts_slug ON wp_posts (site, slug);"
+            "CREATE INDEX IF NOT EXISTS idx_wp_posts_url ON wp_posts (site, url);"
+            "CREATE TABLE IF NOT EXISTS wp_sync ("
+            " site TEXT PRIMARY KEY,"
+            " synced_at REAL NOT NULL,"
+            " etag TEXT);"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def site_key(wp):
+        return wp.base_url.rstrip("/").lower()
+
+    # ──────────────────────────────────────────────
+    # Sync
+    # ──────────────────────────────────────────────
+
+    def _sync_state(self, site):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at, etag FROM wp_sync WHERE site = ?", (site,)
+            ).fetchone()
+            newest = self._conn.execute(
+                "SELECT MAX(modified) FROM wp_posts WHERE site = ?", (site,)
+            ).fetchone()[0]
+        synced_at, etag = row if row else (0.0, None)
+        return synced_at, etag, newest
+
+    def is_stale(self, wp):
+        synced_at, _, _ = self._sync_state(self.site_key(wp))
+        return time.time() - synced_at > self.max_age
+
+    def sync(self, wp, force=False):
+        """Bring the site's posts up to date.
+
+        Args:
+            wp: WordPressClient for the site.
+            force: Ask WordPress even if the cache is fresh.
+
+        Returns:
+            Dict {"fetched": int, "changed": int, "removed": int, "synced": bool}.
+        """
+        site = self.site_key(wp)
+        synced_at, etag, newest = self._sync_state(site)
+        result = {"fetched": 0, "changed": 0, "removed": 0, "synced": False}
+        if not force and time.time() - synced_at <= self.max_age:
+            return result
+
+        posts, new_etag = wp.get_posts_since(newest, etag=etag if newest else None,
+                                             fields=CACHED_FIELDS)
+        if posts is None and not newest:
+            logger.warning("Post cache sync failed for %s", site)
+            return result
+        posts = posts or []
+
+        remote_total = wp.count_posts()
+        if remote_total is not None and remote_total != self.count(site) + self._new_count(site, posts):
+            # Deleted/unpublished posts, or scheduled posts published with an old modified date
+            listing = wp.get_posts(fields=["id"], strict=True)
+            live_ids = {p.get("id") for p in listing or []}
+            if listing is None or len(live_ids) != remote_total:
+                # A failed page would make live posts look deleted
+                logger.warning("Post cache %s: id listing incomplete (%d of %d); not pruning",
+                               site, len(live_ids), remote_total)
+            else:
+                result["removed"] = self._prune(site, live_ids)
+            if live_ids:
+                known = self._ids(site) | {p.get("id") for p in posts}
+                for post_id in sorted(live_ids - known):
+                    post = wp.get_post(post_id, fields=CACHED_FIELDS)
+                    if post:
+                        posts.append(post)
+
+        if posts:
+            result["fetched"] = len(posts)
+            result["changed"] = self.apply_posts(site, posts)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO wp_sync (site, synced_at, etag) VALUES (?, ?, ?)",
+                (site, time.time(), new_etag),
+            )
+            self._conn.commit()
+        result["synced"] = True
+        logger.info("Post cache %s: %d fetched, %d changed, %d removed",
+                    site, result["fetched"], result["changed"], result["removed"])
+        return result
+
+    def apply_posts(self, site, posts):
+        """Upsert downloaded posts. Returns how many are new or have changed content."""
+        now = time.time()
+        with self._lock:
+            hashes = dict(self._conn.execute(
+                "SELECT post_id, content_hash FROM wp_posts WHERE site = ?", (site,)
+            ))
+            rows, changed = [], 0
+            for post in posts:
+                post_id = post.get("id")
+                if post_id is None:
+                    continue
+                digest = content_hash((post.get("content") or {}).get("rendered", ""))
+                if hashes.get(post_id) != digest:
+                    changed += 1
+                rows.append((site, post_id, post.get("slug", ""), normalize_url(post.get("link", "")),
+                             post.get("modified", ""), digest, json.dumps(post, ensure_ascii=False), now))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO wp_posts"
+                " (site, post_id, slug, url, modified, content_hash, data, cached_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        return changed
+
+    def _ids(self, site):
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT post_id FROM wp_posts WHERE site = ?", (site,))}
+
+    def _new_count(self, site, posts):
+        return len({p.get("id") for p in posts} - self._ids(site))
+
+    def _prune(self, site, live_ids):
+        cached_ids = self._ids(site)
+        with self._lock:
+            removed = [(site, post_id) for post_id in cached_ids if post_id not in live_ids]
+            self._conn.executemany("DELETE FROM wp_posts WHERE site = ? AND post_id = ?", removed)
+            self._conn.commit()
+        return len(removed)
+
+    # ──────────────────────────────────────────────
+    # Lookups
+    # ──────────────────────────────────────────────
+
+    def _one(self, where, params):
+        with self._lock:
+            row = self._conn.execute(f"SELECT data FROM wp_posts WHERE {where}", params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, site, post_id):
+        return self._one("site = ? AND post_id = ?", (site, post_id))
+
+    def get_by_slug(self, site, slug):
+        return self._one("site = ? AND slug = ?", (site, slug))
+
+    def get_by_url(self, site, url):
+        return self._one("site = ? AND url = ?", (site, normalize_url(url)))
+
+    def get_content_hash(self, site, post_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM wp_posts WHERE site = ? AND post_id = ?", (site, post_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def all_posts(self, site):
+        """Every cached post for the site, newest first (like the REST API default)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM wp_posts WHERE site = ? ORDER BY post_id DESC", (site,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def count(self, site):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM wp_posts WHERE site = ?", (site,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self):
+        with self._lock:
+            posts, sites = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT site) FROM wp_posts"
+            ).fetchone()
+        return {"posts": posts, "sites": sites}
+
+
+def create_wp_post_cache(enabled=None):
+    """Return a WPPostCache configured from settings, or None when disabled.
+
+    Args:
+        enabled: Force on/off (default: WP_POST_CACHE_ENABLED setting).
+    """
+    from config.settings import WP_POST_CACHE_ENABLED, WP_POST_CACHE_PATH, WP_POST_CACHE_MAX_AGE
+
+    if enabled is None:
+        enabled = WP_POST_CACHE_ENABLED
+    if not enabled:
+        return None
+    try:
+        return WPPostCache(WP_POST_CACHE_PATH, max_age=WP_POST_CACHE_MAX_AGE)
+    except sqlite3.Error as e:
+        logger.warning("WordPress post cache unavailable (%s). Fetching posts directly.", e)
+        return None
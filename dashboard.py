@@ -3,6 +3,7 @@ import argparse
 import sys
 from core.logger import setup_logger, get_logger
 from core.dashboard.dashboard import PerformanceDashboard
+from core.integrations.gsc_store import create_gsc_store
 
 setup_logger()
 logger = get_logger("dashboard")
@@ -41,17 +42,22 @@ def main():
         except Exception as e:
             logger.error("Failed to load tenant '%s': %s", args.tenant, e)
 
+    # Period metrics and comparisons are computed from the local daily GSC store
+    gsc_store = create_gsc_store()
     dashboard = PerformanceDashboard(
         wp_client=wp,
         gsc_property_url=gsc_url,
+        gsc_store=gsc_store,
     )
 
     if args.freshness:
         from core.reoptimizer_v2 import ContentFreshnessEngine
+        from core.wp_post_cache import create_wp_post_cache
         if not wp:
             logger.error("WordPress client required for freshness check. Use --tenant.")
             return 1
-        engine = ContentFreshnessEngine(wp, {}, gsc_url)
+        engine = ContentFreshnessEngine(wp, {}, gsc_url, post_cache=create_wp_post_cache(),
+                                        gsc_store=gsc_store)
         report = engine.run_freshness_check(days=args.days)
         print(f"\nDeclining: {report['declining_count']} | Page 2 Opportunities: {report['page2_opportunities']}")
         return 0
@@ -2,7 +2,7 @@
 import os
 import re
 import time
-from core.llm_client import LLMClient
+from core.llm_client import LLMClient, create_key_pool, create_gemini_rate_limiter
 from core.knowledge_base import KnowledgeBase
 from core.pipeline import ArticlePipeline, clean_orphan_placeholders
 from core.agents.visual import VisualAgent
@@ -10,7 +10,10 @@ from core.agents.growth import GrowthAgent
 from core.tenant_config import TenantConfig
 from core.prompt_engine import PromptEngine
 from core.kb_cache import KnowledgeBaseCache
-from core.rate_limiter import RateLimiter
+from core.llm_cache import create_response_cache
+from core.checkpoint import create_checkpoint_store
+from core.sheet_mirror import create_sheet_mirror
+from core.serp_cache import create_serp_cache
 from core.circuit_breaker import CircuitBreaker
 from core.sheets_client import SheetsClient
 from core.wordpress_client import WordPressClient
@@ -20,8 +23,13 @@ from config.settings import load_wp_credentials
 
 # Shared across jobs in the same worker process
 _kb_cache = KnowledgeBaseCache(ttl=3600)
-_rate_limiter = RateLimiter(rpm=15)
+_rate_limiter = create_gemini_rate_limiter()
 _circuit_breaker = CircuitBreaker(name="gemini", failure_threshold=5, cooldown=60)
+_key_pool = create_key_pool()
+_response_cache = create_response_cache()
+_checkpoints = create_checkpoint_store()  # rq retries resume from the last completed stage
+_sheet_mirror = create_sheet_mirror()
+_serp_cache = create_serp_cache()  # shared with the scheduler and other workers on this host
 
 setup_logger()
 logger = get_logger("jobs.article")
@@ -63,7 +71,10 @@ def process_article(tenant_id, keyword, row_num=0, dry_run=False, priority="norm
         if not os.path.exists(kb_path):
             kb_path = f"config/companies/{tenant_id}/knowledge_base"
 
-        llm = LLMClient(rate_limiter=_rate_limiter, circuit_breaker=_circuit_breaker)
+        llm = LLMClient(
+            rate_limiter=_rate_limiter, circuit_breaker=_circuit_breaker,
+            key_pool=_key_pool, response_cache=_response_cache,
+        )
         kb = KnowledgeBase(kb_path)
         prompt_engine = PromptEngine(tc)
         site = tc.to_site_config()
@@ -74,11 +85,19 @@ def process_article(tenant_id, keyword, row_num=0, dry_run=False, priority="norm
             "tenant_config": tc,
         }
 
+        enabled_agents = tc.get_enabled_agents()
+        visual = VisualAgent(llm, kb, **agent_kwargs) if not dry_run and "visual" in enabled_agents else None
+        growth = GrowthAgent(llm, kb, **agent_kwargs) if "growth" in enabled_agents else None
+
         pipeline = ArticlePipeline(
             llm, kb,
             prompt_engine=prompt_engine,
             kb_cache=_kb_cache,
             tenant_config=tc,
+            visual=visual,
+            growth=growth,
+            checkpoints=_checkpoints,
+            serp_cache=_serp_cache,
         )
 
         # Get inventory for internal linking
@@ -86,8 +105,12 @@ def process_article(tenant_id, keyword, row_num=0, dry_run=False, priority="norm
         sheets = None
         if not dry_run:
             try:
-                sheets = SheetsClient('config/service_account.json')
-                inventory = sheets.get_all_completed_articles(tc.spreadsheet_id)
+                sheets = SheetsClient('config/service_account.json', buffered=True)
+                if _sheet_mirror:
+                    _sheet_mirror.sync(sheets, tc.spreadsheet_id)
+                    inventory = _sheet_mirror.get_all_completed_articles(tc.spreadsheet_id)
+                else:
+                    inventory = sheets.get_all_completed_articles(tc.spreadsheet_id)
             except Exception as e:
                 logger.warning("[JOB] Could not load inventory: %s", e)
 
@@ -105,16 +128,18 @@ def process_article(tenant_id, keyword, row_num=0, dry_run=False, priority="norm
             pipeline_result.content = final_content
             html_path, json_path = save_dry_run_output(tenant_id, keyword, pipeline_result)
             logger.info("[JOB] DRY-RUN saved: %s", html_path)
+            if _checkpoints:
+                _checkpoints.clear(tc.company_id, keyword)
             result_data["url"] = html_path
         else:
             # Visual (images)
             featured_media_id = 0
-            if "visual" in tc.get_enabled_agents():
+            if visual:
                 try:
-                    visual = VisualAgent(llm, kb, **agent_kwargs)
                     final_content, featured_media_id, _ = visual.process_images(
                         final_content, final_title, keyword, None, kb_path,
-                        site_config=site, outline=pipeline_result.outline
+                        site_config=site, outline=pipeline_result.outline,
+                        image_prompts=pipeline_result.image_prompts,
                     )
                 except Exception as e:
                     logger.warning("[JOB] Visual agent failed: %s", e)
@@ -144,22 +169,43 @@ def process_article(tenant_id, keyword, row_num=0, dry_run=False, priority="norm
             )
             result_data["url"] = post.get('link', '')
             logger.info("[JOB] Published: %s", result_data["url"])
+            if _checkpoints:
+                _checkpoints.clear(tc.company_id, keyword)
 
             # Update Sheets
             if sheets and row_num > 0:
-                sheets.update_row(tc.spreadsheet_id, row_num, result_data["url"], status="Done")
+                if _sheet_mirror:
+                    _sheet_mirror.update_status(tc.spreadsheet_id, row_num, "Done", result_data["url"])
+                else:
+                    sheets.update_row(tc.spreadsheet_id, row_num, result_data["url"], status="Done")
 
         # Growth suggestions
-        if "growth" in tc.get_enabled_agents():
+        if growth:
             try:
-                growth = GrowthAgent(llm, kb, **agent_kwargs)
-                growth_result = growth.execute({"title": final_title})
-                if growth_result.success and sheets and not dry_run:
-                    for topic in growth_result.content:
+                growth_topics = pipeline_result.growth_topics
+                if growth_topics is None:
+                    growth_result = growth.execute({"title": final_title})
+                    growth_topics = growth_result.content if growth_result.success else None
+                if growth_topics and sheets and not dry_run:
+                    for topic in growth_topics:
                         sheets.add_new_topic(tc.spreadsheet_id, topic)
             except Exception as e:
                 logger.warning("[JOB] Growth agent failed: %s", e)
 
+        # Status update + suggested topics go out as one batch_update and one append_rows
+        if sheets:
+            if _sheet_mirror:
+                try:
+                    _sheet_mirror.push(sheets, tc.spreadsheet_id)
+                except Exception as e:
+                    # The row stays dirty in the mirror and is pushed on the next sync
+                    logger.warning("[JOB] Could not push status to Sheets: %s", e)
+            try:
+                sheets.flush()
+            except Exception as e:
+                # The article is already published — failing the job would let rq publish it again
+                logger.warning("[JOB] Could not flush Sheets writes: %s", e)
+
         result_data["status"] = "success"
         result_data["seo_score"] = pipeline_result.seo_score
 
@@ -3,9 +3,9 @@ import json
 import os
 import re
 import sys
-from core.llm_client import LLMClient
+from core.llm_client import LLMClient, create_key_pool, create_gemini_rate_limiter
 from core.knowledge_base import KnowledgeBase
-from core.pipeline import ArticlePipeline, validate_keyword, clean_orphan_placeholders
+from core.pipeline import ArticlePipeline, validate_keyword, prefetchable_keywords, clean_orphan_placeholders
 from core.seo.schema import inject_schema_into_html
 from core.agents.visual import VisualAgent
 from core.agents.growth import GrowthAgent
@@ -17,7 +17,11 @@ from config.settings import load_wp_credentials
 from core.tenant_config import TenantConfig
 from core.prompt_engine import PromptEngine
 from core.kb_cache import KnowledgeBaseCache
-from core.rate_limiter import RateLimiter
+from core.llm_cache import create_response_cache
+from core.checkpoint import create_checkpoint_store
+from core.sheet_mirror import create_sheet_mirror
+from core.serp_cache import create_serp_cache
+from core.agents.serp_analyzer import prefetch_serp_data
 from core.circuit_breaker import CircuitBreaker
 
 # Initialize logging before anything else
@@ -45,6 +49,12 @@ def parse_args(argv=None):
         default=None,
         help='Path to a JSON file with keywords (used with --dry-run to skip Sheets read)'
     )
+    parser.add_argument(
+        '--llm-cache',
+        action='store_true',
+        default=False,
+        help='Cache LLM responses in SQLite so identical prompts (replays, dry-runs) skip the API'
+    )
     parser.add_argument(
         '--reoptimize',
         action='store_true',
@@ -72,14 +82,22 @@ def parse_args(argv=None):
     parser.add_argument(
         '--discover-keywords',
         type=str,
+        nargs='+',
         default=None,
         metavar='SEED',
-        help='Discover new keyword opportunities from a seed keyword'
+        help='Discover new keyword opportunities from one or more seed keywords'
+    )
+    parser.add_argument(
+        '--discover-depth',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Keyword discovery rounds: each round expands the best new keywords of the previous one'
     )
     return parser.parse_args(argv)
 
 
-def main(dry_run=False, keywords_file=None):
+def main(dry_run=False, keywords_file=None, llm_cache=False):
     logger.info("=" * 80)
     if dry_run:
         logger.info("SEO Orchestrator (Multi-Tenant) Starting in DRY-RUN mode...")
@@ -102,9 +120,13 @@ def main(dry_run=False, keywords_file=None):
         return 1
 
     # Shared infrastructure
-    rate_limiter = RateLimiter(rpm=15)
+    rate_limiter = create_gemini_rate_limiter()
     circuit_breaker = CircuitBreaker(name="gemini", failure_threshold=5, cooldown=60)
     kb_cache = KnowledgeBaseCache(ttl=3600)
+    key_pool = create_key_pool()
+    response_cache = create_response_cache(enabled=True if llm_cache else None)
+    checkpoints = create_checkpoint_store()
+    serp_cache = create_serp_cache()
 
     total_processed = 0
     total_success = 0
@@ -130,15 +152,12 @@ def main(dry_run=False, keywords_file=None):
             kb_path = f"config/companies/{company_id}/knowledge_base"
 
         try:
-            llm = LLMClient(rate_limiter=rate_limiter, circuit_breaker=circuit_breaker)
+            llm = LLMClient(
+                rate_limiter=rate_limiter, circuit_breaker=circuit_breaker,
+                key_pool=key_pool, response_cache=response_cache,
+            )
             kb = KnowledgeBase(kb_path)
             prompt_engine = PromptEngine(tc)
-            pipeline = ArticlePipeline(
-                llm, kb,
-                prompt_engine=prompt_engine,
-                kb_cache=kb_cache,
-                tenant_config=tc,
-            )
             agent_kwargs = {
                 "prompt_engine": prompt_engine,
                 "kb_cache": kb_cache,
@@ -152,6 +171,17 @@ def main(dry_run=False, keywords_file=None):
                 growth = GrowthAgent(llm, kb, **agent_kwargs)
             else:
                 growth = None
+            # Image prompts and growth topics run inside the pipeline, alongside SEO scoring
+            pipeline = ArticlePipeline(
+                llm, kb,
+                prompt_engine=prompt_engine,
+                kb_cache=kb_cache,
+                tenant_config=tc,
+                visual=visual,
+                growth=growth,
+                checkpoints=checkpoints,
+                serp_cache=serp_cache,
+            )
             logger.info("Pipeline initialized for '%s' with KB path: %s", company_id, kb_path)
         except Exception as e:
             logger.error("Error initializing pipeline for '%s': %s", company_id, e)
@@ -161,6 +191,7 @@ def main(dry_run=False, keywords_file=None):
         site = tc.to_site_config()
 
         # --- Keywords source ---
+        sheets = None
         if keywords_file:
             try:
                 pending_keywords = load_keywords_from_file(keywords_file)
@@ -168,7 +199,7 @@ def main(dry_run=False, keywords_file=None):
                 inventory = []
                 if not dry_run and os.path.exists('config/service_account.json'):
                     try:
-                        sheets = SheetsClient('config/service_account.json')
+                        sheets = SheetsClient('config/service_account.json', buffered=True)
                         inventory = sheets.get_all_completed_articles(tc.spreadsheet_id)
                         logger.info("Loaded %d existing articles for linking.", len(inventory))
                     except Exception:
@@ -182,7 +213,8 @@ def main(dry_run=False, keywords_file=None):
                 logger.error("'config/service_account.json' missing. Skipping '%s'.", company_id)
                 continue
             try:
-                sheets = SheetsClient('config/service_account.json')
+                # Buffered: each article's status/topic/priority writes go out in one flush
+                sheets = SheetsClient('config/service_account.json', buffered=True)
                 pending_keywords = sheets.get_pending_rows(tc.spreadsheet_id)
                 logger.info("Fetching Article Inventory for Link Building...")
                 inventory = sheets.get_all_completed_articles(tc.spreadsheet_id)
@@ -206,6 +238,7 @@ def main(dry_run=False, keywords_file=None):
                 logger.error("Cannot authenticate with WordPress for '%s'. Skipping.", company_id)
                 continue
 
+        pipeline.prefetch_serp([item['keyword'] for item in pending_keywords])
         seen_keywords = set()
 
         for item in pending_keywords:
@@ -230,7 +263,15 @@ def main(dry_run=False, keywords_file=None):
 
             try:
                 # Run the 4-agent article pipeline
-                result = pipeline.run(keyword, inventory, site_config=site)
+                existing_kws = set(seen_keywords)
+                if growth and sheets:
+                    # Also ALL keywords from sheet (pending + done) to avoid duplicate ideas —
+                    # served from the run's snapshot, which includes topics we added
+                    try:
+                        existing_kws.update(sheets.existing_keywords(tc.spreadsheet_id))
+                    except Exception:
+                        pass
+                result = pipeline.run(keyword, inventory, site_config=site, existing_keywords=existing_kws)
 
                 if not result.success:
                     if result.seo_grade == "D":
@@ -256,6 +297,8 @@ def main(dry_run=False, keywords_file=None):
                     html_path, json_path = save_dry_run_output(company_id, keyword, result)
                     logger.info("  [DRY-RUN] Article saved to %s", html_path)
                     company_success += 1
+                    if checkpoints:
+                        checkpoints.clear(company_id, keyword)
 
                     # Log priority keywords for missing internal links
                     if result.missing_link_keywords:
@@ -268,7 +311,8 @@ def main(dry_run=False, keywords_file=None):
                     if visual:
                         final_content, featured_media_id, img_failures = visual.process_images(
                             final_content, final_title, keyword, wp, kb_path,
-                            site_config=site, outline=result.outline
+                            site_config=site, outline=result.outline,
+                            image_prompts=result.image_prompts,
                         )
                         company_images_failed += img_failures
 
@@ -301,6 +345,8 @@ def main(dry_run=False, keywords_file=None):
                     )
                     link = post.get('link')
                     logger.info("  POSTED SUCCESSFULLY! Link: %s", link)
+                    if checkpoints:
+                        checkpoints.clear(company_id, keyword)
 
                     sheets.update_row(tc.spreadsheet_id, row_num, link, status="Done")
                     company_success += 1
@@ -313,32 +359,23 @@ def main(dry_run=False, keywords_file=None):
                             )
 
                 # GROWTH HACKER (both modes — but skip Sheets write in dry-run)
+                # Topics were generated inside the pipeline; retry here only if that call failed
                 if growth:
                     logger.info("  6. Growth Hacker Agent: Suggesting new topics...")
                     try:
-                        # Collect all existing keywords to avoid duplicates
-                        existing_kws = set()
-                        existing_kws.add(keyword.lower())
-                        for inv_item in inventory:
-                            kw = inv_item.get('keyword', '')
-                            if kw:
-                                existing_kws.add(kw.lower())
-                        existing_kws.update(seen_keywords)
-                        # Also read ALL keywords from sheet (pending + done)
-                        try:
-                            all_sheet_rows = sheets.gc.open_by_key(tc.spreadsheet_id).sheet1.get_all_values()
-                            for row in all_sheet_rows[1:]:
-                                if row and row[0].strip():
-                                    existing_kws.add(row[0].strip().lower())
-                        except Exception:
-                            pass
-
-                        growth_result = growth.execute({
-                            "title": final_title,
-                            "existing_keywords": "\n".join(sorted(existing_kws)),
-                        })
-                        if growth_result.success:
-                            for topic in growth_result.content:
+                        growth_topics = result.growth_topics
+                        if growth_topics is None:
+                            existing_kws.add(keyword.lower())
+                            existing_kws.update(
+                                inv_item.get('keyword', '').lower() for inv_item in inventory if inv_item.get('keyword')
+                            )
+                            growth_result = growth.execute({
+                                "title": final_title,
+                                "existing_keywords": "\n".join(sorted(existing_kws)),
+                            })
+                            growth_topics = growth_result.content if growth_result.success else None
+                        if growth_topics:
+                            for topic in growth_topics:
                                 # Handle both dict format (cluster map) and plain string
                                 if isinstance(topic, dict):
                                     topic_text = topic.get("keyword", "")
@@ -368,6 +405,9 @@ def main(dry_run=False, keywords_file=None):
                     except Exception as sheet_err:
                         logger.error("Could not update sheet with error status: %s", sheet_err)
 
+            _flush_sheets(sheets)
+
+        _flush_sheets(sheets)
         logger.info("=" * 60)
         logger.info("COMPANY SUMMARY: %s", site_name)
         logger.info("  Processed: %d | Success: %d | Errors: %d | Images Failed: %d",
@@ -386,12 +426,25 @@ def main(dry_run=False, keywords_file=None):
     logger.info("  Total Errors:    %d", total_errors)
     logger.info("  Images Failed:   %d", total_images_failed)
     logger.info("  KB Cache: %s", kb_cache.stats)
+    if response_cache:
+        logger.info("  LLM Cache: %s", response_cache.stats)
     logger.info("  Rate Limiter: %s", rate_limiter.stats)
+    logger.info("  API Key Pool: %s", key_pool.stats)
     logger.info("=" * 80)
 
     return 1 if total_errors > 0 else 0
 
 
+def _flush_sheets(sheets):
+    """Send buffered Sheets writes; a failed flush is logged, not fatal."""
+    if not sheets:
+        return
+    try:
+        sheets.flush()
+    except Exception as e:
+        logger.error("Could not flush %d pending Sheets write(s): %s", sheets.pending_writes, e)
+
+
 def _load_tenant_configs():
     """Load tenant configs from config/tenants/ or fallback to sites.json.
 
@@ -425,7 +478,10 @@ def _load_tenant_configs():
 
 def reoptimize():
     """Re-optimize all existing WordPress articles."""
-    from core.reoptimizer import ArticleReoptimizer
+    from core.reoptimizer import ArticleReoptimizer, summarize_results
+    from core.wp_post_cache import create_wp_post_cache
+    from core.rate_limiter import RateLimiter
+    from config.settings import REOPTIMIZE_WORKERS, REOPTIMIZE_RPM
 
     logger.info("=" * 80)
     logger.info("SEO Re-Optimizer Starting...")
@@ -438,6 +494,8 @@ def reoptimize():
         logger.error("Failed to load sites.json: %s", e)
         return 1
 
+    post_cache = create_wp_post_cache()
+
     for site in sites:
         company_id = site.get('company_id', 'default')
         site_name = site.get('site_name', 'Unknown')
@@ -455,11 +513,13 @@ def reoptimize():
             logger.error("Cannot authenticate with WordPress for '%s'. Skipping.", company_id)
             continue
 
-        optimizer = ArticleReoptimizer(wp, site)
+        optimizer = ArticleReoptimizer(wp, site, post_cache=post_cache, max_workers=REOPTIMIZE_WORKERS,
+                                       rate_limiter=RateLimiter(rpm=REOPTIMIZE_RPM))
         results = optimizer.reoptimize_all()
 
-        success_count = sum(1 for r in results if r['success'])
-        logger.info("Site '%s': %d/%d posts re-optimized", site_name, success_count, len(results))
+        counts = summarize_results(results)
+        logger.info("Site '%s': %d updated, %d unchanged, %d failed (of %d posts)",
+                    site_name, counts['updated'], counts['skipped'], counts['failed'], len(results))
 
     logger.info("=" * 80)
     logger.info("Re-optimization complete!")
@@ -489,11 +549,17 @@ def main_queue(dry_run=False, tenant_filter=None):
         return 1
 
     total_enqueued = 0
+    sheet_mirror = create_sheet_mirror()
+    serp_cache = create_serp_cache()
 
     for tc in tenant_configs:
         try:
-            sheets = SheetsClient('config/service_account.json')
-            pending = sheets.get_pending_rows(tc.spreadsheet_id)
+            sheets = SheetsClient('config/service_account.json', buffered=True)
+            if sheet_mirror:
+                sheet_mirror.sync(sheets, tc.spreadsheet_id)
+                pending = sheet_mirror.get_pending_rows(tc.spreadsheet_id)
+            else:
+                pending = sheets.get_pending_rows(tc.spreadsheet_id)
             max_per_run = tc.get_schedule().get("max_articles_per_run", 1)
             pending = pending[:max_per_run]
 
@@ -501,6 +567,9 @@ def main_queue(dry_run=False, tenant_filter=None):
                 logger.info("[%s] No pending keywords.", tc.company_id)
                 continue
 
+            # One batched SerperAPI call; the workers' pipelines read the briefs from the cache
+            prefetch_serp_data(prefetchable_keywords(row['keyword'] for row in pending), serp_cache)
+
             jobs = qm.enqueue_tenant_batch(
                 tenant_id=tc.company_id,
                 keywords=pending,
@@ -520,12 +589,15 @@ def main_queue(dry_run=False, tenant_filter=None):
     return 0
 
 
-def discover_keywords_cmd(seed_keyword, tenant_id=None):
-    """Discover new keyword opportunities from a seed keyword."""
+def discover_keywords_cmd(seed_keywords, tenant_id=None, depth=1):
+    """Discover new keyword opportunities from one or more seed keywords."""
     from core.keyword_discovery.discovery import discover_keywords
 
+    if isinstance(seed_keywords, str):
+        seed_keywords = [seed_keywords]
+
     logger.info("=" * 60)
-    logger.info("Keyword Discovery for: '%s'", seed_keyword)
+    logger.info("Keyword Discovery for: %s (depth %d)", ", ".join(f"'{s}'" for s in seed_keywords), depth)
     logger.info("=" * 60)
 
     # Get existing keywords from sheets if tenant provided
@@ -540,7 +612,8 @@ def discover_keywords_cmd(seed_keyword, tenant_id=None):
         except Exception as e:
             logger.warning("Could not load existing keywords: %s", e)
 
-    results = discover_keywords(seed_keyword, existing_keywords=existing)
+    results = discover_keywords(seed_keywords, existing_keywords=existing,
+                                serp_cache=create_serp_cache(), depth=depth)
 
     logger.info("Found %d new keyword opportunities:", len(results))
     for i, kw in enumerate(results, 1):
@@ -552,12 +625,12 @@ def discover_keywords_cmd(seed_keyword, tenant_id=None):
 if __name__ == "__main__":
     args = parse_args()
     if args.discover_keywords:
-        discover_keywords_cmd(args.discover_keywords, tenant_id=args.tenant)
+        discover_keywords_cmd(args.discover_keywords, tenant_id=args.tenant, depth=args.discover_depth)
         sys.exit(0)
     elif args.reoptimize:
         exit_code = reoptimize()
     elif args.queue:
         exit_code = main_queue(dry_run=args.dry_run, tenant_filter=args.tenant)
     else:
-        exit_code = main(dry_run=args.dry_run, keywords_file=args.keywords)
+        exit_code = main(dry_run=args.dry_run, keywords_file=args.keywords, llm_cache=args.llm_cache)
     sys.exit(exit_code)
@@ -15,11 +15,20 @@ from core.tenant_config import TenantConfig
 from core.queue_manager import QueueManager
 from core.queue_config import is_redis_available
 from core.sheets_client import SheetsClient
+from core.sheet_mirror import create_sheet_mirror
+from core.serp_cache import create_serp_cache
+from core.agents.serp_analyzer import prefetch_serp_data
+from core.pipeline import prefetchable_keywords
 from core.logger import setup_logger, get_logger
 
 setup_logger()
 logger = get_logger("scheduler")
 
+# Pending rows come from the local mirror; Sheets is only re-read when it is stale
+_sheet_mirror = create_sheet_mirror()
+# SERP briefs for each batch are fetched in one SerperAPI request; workers read them from the cache
+_serp_cache = create_serp_cache()
+
 
 def schedule_tenant(tc, qm, dry_run=False):
     """Enqueue pending keywords for a single tenant.
@@ -36,8 +45,12 @@ def schedule_tenant(tc, qm, dry_run=False):
     max_articles = schedule.get("max_articles_per_run", 1)
 
     try:
-        sheets = SheetsClient('config/service_account.json')
-        pending = sheets.get_pending_rows(tc.spreadsheet_id)
+        sheets = SheetsClient('config/service_account.json', buffered=True)
+        if _sheet_mirror:
+            _sheet_mirror.sync(sheets, tc.spreadsheet_id)
+            pending = _sheet_mirror.get_pending_rows(tc.spreadsheet_id)
+        else:
+            pending = sheets.get_pending_rows(tc.spreadsheet_id)
 
         if not pending:
             logger.info("[%s] No pending keywords.", tc.company_id)
@@ -47,6 +60,7 @@ def schedule_tenant(tc, qm, dry_run=False):
         batch = pending[:max_articles]
         logger.info("[%s] Found %d pending, scheduling %d (max=%d)",
                     tc.company_id, len(pending), len(batch), max_articles)
+        prefetch_serp_data(prefetchable_keywords(row['keyword'] for row in batch), _serp_cache)
 
         jobs = qm.enqueue_tenant_batch(
             tenant_id=tc.company_id,
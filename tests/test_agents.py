@@ -1,4 +1,5 @@
 """Tests for modular agents (Story 2.2)."""
+import asyncio
 import json
 import pytest
 from unittest.mock import MagicMock, patch
@@ -83,6 +84,23 @@ class TestAnalystAgent:
         assert result.agent_name == "analyst"
         assert result.duration_ms > 0
 
+    def test_execute_async_parses_json(self):
+        response = json.dumps({"title": "Test", "sections": [{"h2": "Intro"}]})
+        llm = make_llm_client()
+
+        async def fake_generate_async(prompt, json_mode=False, cache=True):
+            assert json_mode is True
+            assert cache is False  # the agent caches only after parsing
+            return response
+        llm.generate_async = fake_generate_async
+
+        agent = AnalystAgent(llm, make_kb())
+        result = asyncio.run(agent.execute_async({"keyword": "ansiedade", "links_inventory": []}))
+
+        assert result.success is True
+        assert result.content["title"] == "Test"
+        llm.generate.assert_not_called()
+
     def test_execute_handles_markdown_wrapped_json(self):
         response = '```json\n{"title": "Test", "sections": []}\n```'
         llm = make_llm_client(response)
@@ -125,6 +143,38 @@ class TestWriterAgent:
         assert result.success is True
         assert "<h1>Article</h1>" in result.content
 
+    def test_uses_kb_retrieval_with_outline_query(self):
+        llm = make_llm_client("<h1>Article</h1>")
+        kb_cache = MagicMock()
+        kb_cache.retrieve.return_value = "relevant passages"
+        tc = MagicMock()
+        tc.company_id = "mjesus"
+        tc.kb_path = "/kb"
+        tc.get_kb_config.return_value = {"retrieval": True, "top_k": 4, "max_chars": 5000, "chunk_size": 800}
+
+        agent = WriterAgent(llm, make_kb(), kb_cache=kb_cache, tenant_config=tc)
+        agent.execute({"title": "Ansiedade tem cura", "outline": ["H2. Conflito visceral"]})
+
+        kb_cache.get.assert_not_called()
+        args, kwargs = kb_cache.retrieve.call_args
+        assert "Ansiedade tem cura" in args[2]
+        assert "Conflito visceral" in args[2]
+        assert kwargs["top_k"] == 4
+        assert kwargs["max_chars"] == 5000
+
+    def test_retrieval_disabled_loads_full_kb(self):
+        llm = make_llm_client("<h1>Article</h1>")
+        kb_cache = MagicMock()
+        kb_cache.get.return_value = "full kb"
+        tc = MagicMock()
+        tc.get_kb_config.return_value = {"retrieval": False}
+
+        agent = WriterAgent(llm, make_kb(), kb_cache=kb_cache, tenant_config=tc)
+        agent.execute({"title": "Test", "sections": []})
+
+        kb_cache.get.assert_called_once()
+        kb_cache.retrieve.assert_not_called()
+
 
 # ──────────────────────────────────────────────
 # HumanizerAgent
@@ -233,6 +283,144 @@ class TestVisualAgent:
         assert VisualAgent._is_valid_image(img) is False
 
 
+class TestVisualImages:
+    def _agent(self):
+        llm = make_llm_client()
+        llm._run_with_key_pool.side_effect = lambda task: task(0)
+        return VisualAgent(llm, make_kb())
+
+    def test_generate_image_uses_key_pool(self):
+        agent = self._agent()
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"predictions": [{"bytesBase64Encoded": "aGk="}]}
+        with patch("core.agents.visual.requests.post", return_value=response) as mock_post:
+            assert agent.generate_image("a cat") == "aGk="
+        assert mock_post.call_args[0][0].endswith("key=key1")
+        assert mock_post.call_args[1]["timeout"]
+
+    def test_generate_image_key_error_is_raised_to_pool(self):
+        agent = self._agent()
+        with patch("core.agents.visual.requests.post", return_value=MagicMock(status_code=429)):
+            assert agent.generate_image("a cat") is None
+
+    def test_process_images_runs_concurrently_and_injects_in_order(self):
+        import base64
+        import threading
+        import time
+        agent = self._agent()
+        started = []
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_generate(prompt):
+            started.append(prompt)
+            barrier.wait()  # all three requests are in flight at once
+            if prompt == "body":
+                time.sleep(0.05)  # body finishes last
+            return base64.b64encode(prompt.encode()).decode()
+
+        agent.generate_image = fake_generate
+        wp = MagicMock()
+        wp.upload_media.side_effect = lambda data, filename, alt_text="": (
+            {"capa": 1, "corpo": 2, "final": 3}[filename.rsplit("-", 1)[1][:-4]],
+            f"https://x.com/{filename}",
+        )
+        html = "<h2>A</h2><!-- IMG_PLACEHOLDER --><p>x</p><!-- IMG_PLACEHOLDER --><div class=\"cta-box\">c</div>"
+
+        content, featured_id, failed = agent.process_images(
+            html, "Title", "kw", wp, "/tmp", image_prompts=["cover", "body", "final"])
+
+        assert sorted(started) == ["body", "cover", "final"]
+        assert featured_id == 1
+        assert failed == 0
+        assert content.index("kw-corpo.png") < content.index("kw-final.png")
+        assert "IMG_PLACEHOLDER" not in content
+        alts = {c[0][1]: c[1]["alt_text"] for c in wp.upload_media.call_args_list}
+        assert alts["kw-capa.png"] == "kw - Title"
+
+    def test_process_images_failed_body_leaves_placeholder_to_final(self):
+        agent = self._agent()
+        agent.generate_image = lambda prompt: None if prompt == "body" else "aGk="
+        wp = MagicMock()
+        wp.upload_media.side_effect = lambda data, filename, alt_text="": (7, f"https://x.com/{filename}")
+        html = "<h2>A</h2><!-- IMG_PLACEHOLDER --><p>x</p><!-- IMG_PLACEHOLDER -->"
+
+        content, featured_id, failed = agent.process_images(
+            html, "Title", "kw", wp, "/tmp", image_prompts=["cover", "body", "final"])
+
+        assert failed == 1
+        assert content.startswith("<h2>A</h2><figure class='wp-block-image'><img src='https://x.com/kw-final.png'")
+
+
+class TestImagenBatching:
+    def _agent(self, mode):
+        llm = make_llm_client()
+        llm._run_with_key_pool.side_effect = lambda task: task(0)
+        return VisualAgent(llm, make_kb(), batch_mode=mode)
+
+    def _response(self, images):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"predictions": [
+            {"bytesBase64Encoded": image} if image else {"raiFilteredReason": "filtered"} for image in images
+        ]}
+        return response
+
+    def test_instances_mode_sends_one_request(self):
+        agent = self._agent("instances")
+        with patch("core.agents.visual.requests.post", return_value=self._response(["a", "b", "c"])) as mock_post:
+            assert agent.generate_images(["p1", "p2", "p3"]) == ["a", "b", "c"]
+        mock_post.assert_called_once()
+        payload = mock_post.call_args[1]["json"]
+        assert payload["instances"] == [{"prompt": "p1"}, {"prompt": "p2"}, {"prompt": "p3"}]
+        assert payload["parameters"]["sampleCount"] == 1
+
+    def test_samples_mode_uses_sample_count(self):
+        agent = self._agent("samples")
+        with patch("core.agents.visual.requests.post", return_value=self._response(["a", "b", "c"])) as mock_post:
+            assert agent.generate_images(["p1", "p2", "p3"]) == ["a", "b", "c"]
+        payload = mock_post.call_args[1]["json"]
+        assert payload["instances"] == [{"prompt": "p1"}]
+        assert payload["parameters"]["sampleCount"] == 3
+
+    def test_filtered_slot_is_generated_individually(self):
+        agent = self._agent("instances")
+        responses = [self._response(["a", None, "c"]), self._response(["b2"])]
+        with patch("core.agents.visual.requests.post", side_effect=responses) as mock_post:
+            assert agent.generate_images(["p1", "p2", "p3"]) == ["a", "b2", "c"]
+        assert mock_post.call_args[1]["json"]["instances"] == [{"prompt": "p2"}]
+
+    def test_rejected_batch_falls_back_without_benching_key(self):
+        agent = self._agent("instances")
+        rejected = MagicMock(status_code=400, text="Only one instance is supported")
+
+        def fake_post(url, headers=None, json=None, timeout=None):
+            if len(json["instances"]) > 1:
+                return rejected
+            return self._response([json["instances"][0]["prompt"].upper()])
+
+        with patch("core.agents.visual.requests.post", side_effect=fake_post):
+            assert agent.generate_images(["p1", "p2"]) == ["P1", "P2"]
+
+    def test_process_images_batched_mode(self):
+        agent = self._agent("instances")
+        agent.generate_images = MagicMock(return_value=["YQ==", "Yg==", "Yw=="])
+        agent.generate_image = MagicMock()
+        wp = MagicMock()
+        wp.upload_media.side_effect = lambda data, filename, alt_text="": (data, f"https://x.com/{filename}")
+
+        content, featured_id, failed = agent.process_images(
+            "<h2>A</h2><!-- IMG_PLACEHOLDER --><p>x</p><!-- IMG_PLACEHOLDER -->", "Title", "kw", wp, "/tmp",
+            image_prompts=["cover", "body", "final"])
+
+        agent.generate_images.assert_called_once_with(["cover", "body", "final"])
+        agent.generate_image.assert_not_called()
+        assert featured_id == b"a"
+        assert failed == 0
+        assert content.index("kw-corpo.png") < content.index("kw-final.png")
+
+    def test_unknown_mode_falls_back_to_off(self):
+        assert self._agent("bogus").batch_mode == "off"
+
+
 class TestBuildAltText:
     """Tests for alt text generation (Story 1.2)."""
 
@@ -14,12 +14,27 @@ class TestUploadMediaAltText(unittest.TestCase):
         mock_response.status_code = 201
         mock_response.json.return_value = {"id": 42, "source_url": "https://example.com/img.png"}
 
-        with patch("requests.post", return_value=mock_response):
+        with patch.object(wp.session, "post", return_value=mock_response):
             with patch.object(wp, "update_media") as mock_update:
                 media_id, media_url = wp.upload_media(b"fake", "test.png", alt_text="My alt text")
                 mock_update.assert_called_once_with(42, "My alt text")
                 assert media_id == 42
 
+    def test_upload_media_sets_alt_text_in_upload_request(self):
+        from core.wordpress_client import WordPressClient
+        wp = WordPressClient("https://example.com", "user", "pass")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 201
+        mock_response.json.return_value = {"id": 42, "source_url": "https://example.com/img.png",
+                                           "alt_text": "My alt text"}
+
+        with patch.object(wp.session, "post", return_value=mock_response) as mock_post:
+            with patch.object(wp, "update_media") as mock_update:
+                wp.upload_media(b"fake", "test.png", alt_text="My alt text")
+                mock_update.assert_not_called()
+        assert mock_post.call_args[1]["params"] == {"alt_text": "My alt text"}
+
     def test_upload_media_no_alt_text_skips_update(self):
         from core.wordpress_client import WordPressClient
         wp = WordPressClient("https://example.com", "user", "pass")
@@ -28,7 +43,7 @@ class TestUploadMediaAltText(unittest.TestCase):
         mock_response.status_code = 201
         mock_response.json.return_value = {"id": 42, "source_url": "https://example.com/img.png"}
 
-        with patch("requests.post", return_value=mock_response):
+        with patch.object(wp.session, "post", return_value=mock_response):
             with patch.object(wp, "update_media") as mock_update:
                 wp.upload_media(b"fake", "test.png")
                 mock_update.assert_not_called()
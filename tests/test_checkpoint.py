@@ -0,0 +1,79 @@
+"""Tests for CheckpointStore — stage persistence, staleness, discard/clear."""
+import json
+import os
+from unittest.mock import patch
+from core.checkpoint import CheckpointStore, make_run_id, create_checkpoint_store
+
+
+class TestMakeRunId:
+    def test_stable_and_case_insensitive(self):
+        assert make_run_id("acme", "Terapia Online") == make_run_id("acme", " terapia online ")
+
+    def test_differs_per_tenant(self):
+        assert make_run_id("acme", "terapia") != make_run_id("other", "terapia")
+
+    def test_readable_prefix(self):
+        assert make_run_id("acme", "Terapia Online").startswith("terapia-online-")
+
+
+class TestCheckpointStore:
+    def test_empty_when_missing(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        assert store.load("acme", "kw") == {}
+
+    def test_save_and_load_stages(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save("acme", "kw", "serp", None)
+        store.save("acme", "kw", "outline", {"title": "T"})
+        assert store.load("acme", "kw") == {"serp": None, "outline": {"title": "T"}}
+
+    def test_runs_are_isolated(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save("acme", "kw1", "draft", "<p>1</p>")
+        assert store.load("acme", "kw2") == {}
+
+    def test_stale_checkpoint_ignored(self, tmp_path):
+        store = CheckpointStore(str(tmp_path), ttl=60)
+        with patch("core.checkpoint.time.time", return_value=1000.0):
+            store.save("acme", "kw", "draft", "<p>old</p>")
+        with patch("core.checkpoint.time.time", return_value=2000.0):
+            assert store.load("acme", "kw") == {}
+
+    def test_discard_stage(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save("acme", "kw", "draft", "<p>d</p>")
+        store.save("acme", "kw", "edited", "<p>e</p>")
+        store.discard("acme", "kw", "edited")
+        assert store.load("acme", "kw") == {"draft": "<p>d</p>"}
+
+    def test_clear(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save("acme", "kw", "draft", "<p>d</p>")
+        store.clear("acme", "kw")
+        store.clear("acme", "kw")  # no error when already gone
+        assert store.load("acme", "kw") == {}
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save("acme", "kw", "draft", "<p>d</p>")
+        path = store._path("acme", "kw")
+        with open(path, "w") as f:
+            f.write("{not json")
+        assert store.load("acme", "kw") == {}
+
+    def test_file_is_json(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        store.save("acme", "kw", "outline", {"title": "Á"})
+        with open(store._path("acme", "kw"), encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["keyword"] == "kw"
+        assert data["stages"]["outline"]["title"] == "Á"
+        assert os.path.dirname(store._path("acme", "kw")).endswith("acme")
+
+
+class TestCreateCheckpointStore:
+    def test_disabled(self):
+        assert create_checkpoint_store(enabled=False) is None
+
+    def test_enabled(self):
+        assert isinstance(create_checkpoint_store(enabled=True), CheckpointStore)
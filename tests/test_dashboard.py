@@ -16,10 +16,19 @@ class TestDashboard:
 
     def test_generate_report_with_wp(self):
         wp = MagicMock()
-        wp.get_posts.return_value = [{"id": 1}, {"id": 2}, {"id": 3}]
+        wp.count_posts.return_value = 3
         dashboard = PerformanceDashboard(wp_client=wp)
         report = dashboard.generate_report()
         assert report["articles"]["total"] == 3
+        wp.get_posts.assert_not_called()
+
+    def test_article_count_falls_back_to_id_listing(self):
+        wp = MagicMock()
+        wp.count_posts.return_value = None
+        wp.get_posts.return_value = [{"id": 1}, {"id": 2}]
+        dashboard = PerformanceDashboard(wp_client=wp)
+        assert dashboard._get_article_metrics()["total"] == 2
+        wp.get_posts.assert_called_once_with(fields=["id"])
 
     def test_save_json_report(self, tmp_path):
         dashboard = PerformanceDashboard()
@@ -22,24 +22,6 @@ class TestGeminiBrainInit:
                 LLMClient(api_keys=[])
 
 
-class TestKeyRotation:
-    def test_rotate_key_cycles(self):
-        with patch("core.llm_client.GOOGLE_API_KEYS_LIST", ["key1", "key2"]):
-            from core.gemini_brain import GeminiBrain
-            brain = GeminiBrain(knowledge_base_path="/tmp/nonexistent_kb")
-            initial_index = brain.llm.current_key_index
-            result = brain._rotate_key()
-            assert result is True
-            assert brain.llm.current_key_index != initial_index
-
-    def test_rotate_key_single_key_fails(self):
-        with patch("core.llm_client.GOOGLE_API_KEYS_LIST", ["only_one_key"]):
-            from core.gemini_brain import GeminiBrain
-            brain = GeminiBrain(knowledge_base_path="/tmp/nonexistent_kb")
-            result = brain._rotate_key()
-            assert result is False
-
-
 class TestKnowledgeBase:
     def test_load_kb_nonexistent_path(self):
         with patch("core.llm_client.GOOGLE_API_KEYS_LIST", ["key1"]):
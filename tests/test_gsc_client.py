@@ -56,3 +56,77 @@ class TestComparePeriods:
     def test_empty_data(self, mock_perf):
         mock_perf.return_value = []
         assert compare_periods("https://example.com") == []
+
+
+class TestPagination:
+
+    def test_follows_start_row_until_short_page(self):
+        from core.integrations.gsc_client import query_search_analytics
+        service = MagicMock()
+        pages = [{"rows": [{"keys": ["a"]}, {"keys": ["b"]}]}, {"rows": [{"keys": ["c"]}]}]
+        service.searchanalytics.return_value.query.return_value.execute.side_effect = pages
+
+        rows = query_search_analytics(service, "https://example.com", "2024-05-01", "2024-05-28",
+                                      ["page"], row_limit=2)
+
+        assert [r["keys"][0] for r in rows] == ["a", "b", "c"]
+        bodies = [c[1]["body"] for c in service.searchanalytics.return_value.query.call_args_list]
+        assert [b["startRow"] for b in bodies] == [0, 2]
+
+
+class TestComparePeriodWindows:
+
+    @patch("core.integrations.gsc_client.get_article_performance")
+    def test_previous_period_does_not_overlap(self, mock_perf):
+        mock_perf.return_value = []
+        compare_periods("https://example.com", days=28)
+        current, previous = mock_perf.call_args_list
+        assert current[1].get("offset_days", 0) == 0
+        assert previous[1]["offset_days"] == 28
+        assert previous[0][1] == 28  # same length as the current window
+
+
+class TestServiceRegistry:
+
+    def setup_method(self):
+        from core.integrations.gsc_client import clear_gsc_services
+        clear_gsc_services()
+
+    teardown_method = setup_method
+
+    @patch("core.integrations.gsc_client._build_gsc_service")
+    def test_service_built_once_per_credentials_file(self, mock_build):
+        from core.integrations.gsc_client import _get_gsc_service
+        mock_build.side_effect = lambda path: MagicMock(name=path)
+
+        first = _get_gsc_service("config/a.json")
+        assert _get_gsc_service("config/a.json") is first
+        assert _get_gsc_service("config/b.json") is not first
+        assert mock_build.call_count == 2
+
+    @patch("core.integrations.gsc_client._build_gsc_service")
+    def test_failures_are_retried(self, mock_build):
+        from core.integrations.gsc_client import _get_gsc_service
+        mock_build.side_effect = [None, MagicMock()]
+        assert _get_gsc_service("config/a.json") is None
+        assert _get_gsc_service("config/a.json") is not None
+
+    @patch("googleapiclient.discovery.build")
+    @patch("google.oauth2.service_account.Credentials.from_service_account_file")
+    def test_uses_static_discovery(self, _, mock_build):
+        from core.integrations.gsc_client import _get_gsc_service
+        _get_gsc_service("config/a.json")
+        assert mock_build.call_args[1]["static_discovery"] is True
+
+    @patch("core.integrations.gsc_client._build_gsc_service")
+    def test_dashboard_helpers_share_one_service(self, mock_build):
+        from core.integrations.gsc_client import get_article_performance, get_keyword_performance
+        service = MagicMock()
+        service.searchanalytics.return_value.query.return_value.execute.return_value = {"rows": []}
+        mock_build.return_value = service
+
+        get_article_performance("https://example.com")
+        get_keyword_performance("https://example.com")
+        compare_periods("https://example.com")
+
+        mock_build.assert_called_once()
@@ -0,0 +1,140 @@
+"""Tests for GSCStore — daily sync of missing days, local aggregation."""
+import time
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+from core.integrations.gsc_store import GSCStore, create_gsc_store
+from core.integrations.gsc_client import get_article_performance, compare_periods
+
+SITE = "https://example.com"
+
+
+def make_service(rows_by_call):
+    service = MagicMock()
+    service.searchanalytics.return_value.query.return_value.execute.side_effect = [
+        {"rows": rows} for rows in rows_by_call
+    ]
+    return service
+
+
+def query_bodies(service):
+    return [c[1]["body"] for c in service.searchanalytics.return_value.query.call_args_list]
+
+
+def row(day, page, clicks, impressions, position):
+    return {"keys": [day.isoformat(), page], "clicks": clicks, "impressions": impressions, "position": position}
+
+
+class TestGSCStore:
+    def test_sync_fetches_range_with_date_dimension(self):
+        store = GSCStore(":memory:")
+        start, end = date(2024, 5, 1), date(2024, 5, 3)
+        service = make_service([[row(start, "/a", 1, 10, 5.0)]])
+
+        assert store.sync(service, SITE, start, end) == 3
+
+        body = query_bodies(service)[0]
+        assert body["dimensions"] == ["date", "page"]
+        assert (body["startDate"], body["endDate"]) == ("2024-05-01", "2024-05-03")
+
+    def test_only_missing_days_are_fetched(self):
+        store = GSCStore(":memory:")
+        store.sync(make_service([[]]), SITE, date(2024, 5, 1), date(2024, 5, 3))
+
+        service = make_service([[]])
+        store.sync(service, SITE, date(2024, 5, 1), date(2024, 5, 5))
+
+        body = query_bodies(service)[0]
+        assert (body["startDate"], body["endDate"]) == ("2024-05-04", "2024-05-05")
+
+    def test_recent_days_are_refetched_until_final(self):
+        store = GSCStore(":memory:", final_after_days=3, recent_max_age=0)
+        today = date.today()
+        store.sync(make_service([[]]), SITE, today - timedelta(days=5), today)
+
+        assert store.missing_days(SITE, today - timedelta(days=5), today) == [
+            today - timedelta(days=2), today - timedelta(days=1), today,
+        ]
+
+    def test_recent_days_are_reused_within_max_age(self):
+        store = GSCStore(":memory:", final_after_days=3, recent_max_age=3600)
+        today = date.today()
+        now = time.time()
+        with patch("core.integrations.gsc_store.time.time", return_value=now):
+            store.sync(make_service([[]]), SITE, today - timedelta(days=5), today)
+        with patch("core.integrations.gsc_store.time.time", return_value=now + 60):
+            assert store.missing_days(SITE, today - timedelta(days=5), today) == []
+        with patch("core.integrations.gsc_store.time.time", return_value=now + 3601):
+            assert len(store.missing_days(SITE, today - timedelta(days=5), today)) == 3
+
+    def test_failed_query_keeps_days_missing(self):
+        store = GSCStore(":memory:")
+        service = MagicMock()
+        service.searchanalytics.return_value.query.return_value.execute.side_effect = Exception("quota")
+        assert store.sync(service, SITE, date(2024, 5, 1), date(2024, 5, 2)) is None
+        assert len(store.missing_days(SITE, date(2024, 5, 1), date(2024, 5, 2))) == 2
+
+    def test_performance_aggregates_days(self):
+        store = GSCStore(":memory:")
+        d1, d2 = date(2024, 5, 1), date(2024, 5, 2)
+        store.apply_rows(SITE, "page", d1, d2, [
+            row(d1, "/a", 2, 100, 10.0),
+            row(d2, "/a", 8, 300, 14.0),
+            row(d2, "/b", 1, 10, 3.0),
+        ])
+
+        pages = store.performance(SITE, d1, d2)
+
+        assert pages[0] == {"page": "/a", "clicks": 10, "impressions": 400, "ctr": 2.5, "position": 13.0}
+        assert [p["page"] for p in pages] == ["/a", "/b"]
+        assert store.performance(SITE, d2, d2)[0]["position"] == 14.0
+        assert store.daily_totals(SITE, d1, d2) == [
+            {"date": "2024-05-01", "clicks": 2, "impressions": 100},
+            {"date": "2024-05-02", "clicks": 9, "impressions": 310},
+        ]
+
+    def test_factory_disabled(self):
+        assert create_gsc_store(enabled=False) is None
+
+
+class TestStoreBackedHelpers:
+    @patch("core.integrations.gsc_client._get_gsc_service")
+    def test_compare_periods_reads_both_windows_from_store(self, mock_service):
+        store = GSCStore(":memory:", recent_max_age=0)
+        today = date.today()
+        store.apply_rows(SITE, "page", today - timedelta(days=13), today, [
+            row(today - timedelta(days=10), "/a", 1, 50, 8.0),   # previous week
+            row(today - timedelta(days=5), "/a", 1, 50, 15.0),   # current week
+        ])
+        service = make_service([[] for _ in range(4)])
+        mock_service.return_value = service
+
+        changes = compare_periods(SITE, days=7, store=store)
+
+        assert changes[0]["previous_position"] == 8.0
+        assert changes[0]["current_position"] == 15.0
+        assert changes[0]["status"] == "declined"
+        # Only the not-yet-final recent days were re-queried
+        assert len(query_bodies(service)) == 1
+
+    @patch("core.integrations.gsc_client._get_gsc_service")
+    def test_failed_sync_falls_back_to_direct_query(self, mock_service):
+        store = GSCStore(":memory:")
+        today = date.today()
+        store.apply_rows(SITE, "page", today, today, [row(today, "/a", 3, 30, 4.0)])
+        service = mock_service.return_value
+        service.searchanalytics.return_value.query.return_value.execute.side_effect = [
+            Exception("quota"), {"rows": [{"keys": ["/a"], "clicks": 9, "impressions": 90, "position": 2.0}]},
+        ]
+
+        results = get_article_performance(SITE, days=2, store=store)
+
+        # The partially stored window is not served
+        assert results[0]["clicks"] == 9
+        assert query_bodies(service)[1]["dimensions"] == ["page"]
+
+    @patch("core.integrations.gsc_client._get_gsc_service", return_value=None)
+    def test_store_answers_without_service(self, _):
+        store = GSCStore(":memory:")
+        today = date.today()
+        store.apply_rows(SITE, "page", today, today, [row(today, "/a", 3, 30, 4.0)])
+        assert get_article_performance(SITE, days=1, store=store)[0]["clicks"] == 3
@@ -0,0 +1,124 @@
+"""Tests for the single-pass HTML post-processor (parity with the string helpers)."""
+from core.html_postprocessor import (
+    HtmlDocument, tokenize, remove_placeholders, place_image_placeholders, insert_toc,
+    insert_internal_links, add_whatsapp_tracking, extract_faq_items,
+)
+from core.pipeline import fix_image_placement
+from core.seo.internal_links import inject_internal_links
+from core.seo.schema import extract_faq_from_html
+from core.seo.topic_clusters import inject_toc
+
+ARTICLE = """<h1>Guia de terapia</h1>
+<p>A terapia online ajuda na ansiedade. <!-- IMG_PLACEHOLDER --></p>
+<h2>O que é ansiedade</h2>
+<p>Ansiedade é comum. Terapia online e terapia presencial.</p>
+
+
+<h2>Sintomas</h2>
+<p>Os sintomas da ansiedade variam.</p>
+<h2>Tratamento</h2>
+<p>O tratamento com terapia online funciona.</p>
+<h2>Perguntas Frequentes</h2>
+<h3>Terapia online funciona?</h3>
+<p>Sim, <strong>funciona</strong> bem.</p>
+<h3>Quanto custa?</h3><p>Depende.</p>
+<div class="cta-box"><p>Fale sobre ansiedade</p><a href="https://wa.me/5511999">WhatsApp</a></div>
+"""
+
+LINKS = [
+    {"text": "terapia online", "url": "https://x.com/1"},
+    {"text": "sintomas da ansiedade grave", "url": "https://x.com/2"},
+    {"text": "Fale sobre", "url": "https://x.com/3"},
+]
+
+
+class TestHtmlDocument:
+    def test_roundtrip_is_lossless(self):
+        assert HtmlDocument(ARTICLE).render() == ARTICLE
+
+    def test_tokenize_kinds(self):
+        kinds = [(t.kind, t.name, t.closing) for t in tokenize("<p>a<!-- c --></p>")]
+        assert kinds == [("tag", "p", False), ("text", "", False), ("comment", "", False), ("tag", "p", True)]
+
+    def test_stray_angle_bracket_kept(self):
+        assert HtmlDocument("<p>1 < 2</p>").render() == "<p>1 < 2</p>"
+
+
+class TestPassesMatchStringHelpers:
+    def test_image_placement(self):
+        doc = HtmlDocument(ARTICLE)
+        place_image_placeholders(doc)
+        assert doc.render() == fix_image_placement(ARTICLE)
+
+    def test_toc(self):
+        doc = HtmlDocument(ARTICLE)
+        assert insert_toc(doc) is True
+        assert doc.render() == inject_toc(ARTICLE)
+
+    def test_internal_links(self):
+        doc = HtmlDocument(ARTICLE)
+        inserted = insert_internal_links(doc, LINKS)
+        expected, expected_count = inject_internal_links(ARTICLE, LINKS)
+        assert doc.render() == expected
+        assert inserted == expected_count == 2
+
+    def test_full_tail(self):
+        doc = HtmlDocument(ARTICLE)
+        place_image_placeholders(doc)
+        insert_toc(doc)
+        insert_internal_links(doc, LINKS, cluster_links=[{"text": "tratamento", "url": "https://x.com/c"}])
+        expected = inject_toc(fix_image_placement(ARTICLE))
+        expected, _ = inject_internal_links(expected, LINKS, cluster_links=[{"text": "tratamento", "url": "https://x.com/c"}])
+        assert doc.render() == expected
+
+    def test_faq(self):
+        assert extract_faq_items(HtmlDocument(ARTICLE)) == extract_faq_from_html(ARTICLE)
+
+
+class TestPasses:
+    def test_links_skip_protected_text(self):
+        doc = HtmlDocument('<h2>terapia</h2><div class="cta-box"><p>terapia</p></div><p>terapia</p>')
+        assert insert_internal_links(doc, [{"text": "terapia", "url": "u"}]) == 1
+        assert doc.render().endswith('<p><a href="u">terapia</a></p>')
+
+    def test_links_never_match_inside_attributes(self):
+        doc = HtmlDocument('<p class="terapia">Texto</p>')
+        assert insert_internal_links(doc, [{"text": "terapia", "url": "u"}]) == 0
+
+    def test_linked_text_not_relinked(self):
+        doc = HtmlDocument("<p>terapia online</p>")
+        insert_internal_links(doc, [{"text": "terapia online", "url": "a"}, {"text": "online", "url": "b"}])
+        assert doc.render() == '<p><a href="a">terapia online</a></p>'
+
+    def test_several_links_in_one_text_run(self):
+        doc = HtmlDocument("<p>terapia e ansiedade e terapia</p><p>depressão</p>")
+        links = [{"text": "ansiedade", "url": "a"}, {"text": "terapia", "url": "t"}, {"text": "depressão", "url": "d"}]
+        assert insert_internal_links(doc, links) == 3
+        assert doc.render() == ('<p><a href="t">terapia</a> e <a href="a">ansiedade</a> e terapia</p>'
+                                '<p><a href="d">depressão</a></p>')
+
+    def test_links_never_span_tags(self):
+        doc = HtmlDocument("<p>terapia <b>online</b></p>")
+        assert insert_internal_links(doc, [{"text": "terapia online", "url": "u"}]) == 0
+        assert doc.render() == "<p>terapia <b>online</b></p>"
+
+    def test_toc_needs_three_headings(self):
+        doc = HtmlDocument("<h2>A</h2><h2>B</h2>")
+        assert insert_toc(doc) is False
+        assert doc.render() == "<h2>A</h2><h2>B</h2>"
+
+    def test_remove_placeholders(self):
+        doc = HtmlDocument("<p>a</p>\n<!--IMG_PLACEHOLDER-->\n\n\n<p>b</p>")
+        remove_placeholders(doc)
+        assert doc.render() == "<p>a</p>\n\n<p>b</p>"
+
+    def test_whatsapp_tracking(self):
+        doc = HtmlDocument('<a href="https://wa.me/55?x=1">W</a><a href="https://wa.me/55?text=oi">W</a><p>https://wa.me/1</p>')
+        add_whatsapp_tracking(doc, "guia")
+        assert doc.render() == (
+            '<a href="https://wa.me/55?x=1&text=Vim+do+artigo+guia">W</a>'
+            '<a href="https://wa.me/55?text=oi">W</a><p>https://wa.me/1</p>'
+        )
+
+    def test_no_faq_section(self):
+        assert extract_faq_items(HtmlDocument("<h2>Intro</h2><h3>Q?</h3><p>A</p>")) == []
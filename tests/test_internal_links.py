@@ -90,3 +90,52 @@ class TestInjectInternalLinks:
         assert count == 2
         assert '<a href="http://a.com">' in result
         assert '<a href="http://d.com">' in result
+
+    def test_skips_text_inside_cta_box(self):
+        html = '<div class="cta-box"><p>Agende terapia</p></div><p>Sobre terapia.</p>'
+        result, count = inject_internal_links(html, [{"text": "terapia", "url": "http://x.com"}])
+        assert count == 1
+        assert result.endswith('<p>Sobre <a href="http://x.com">terapia</a>.</p>')
+
+    def test_skips_attribute_values(self):
+        html = '<p class="ansiedade">Texto sem o termo.</p>'
+        result, count = inject_internal_links(html, [{"text": "ansiedade", "url": "http://x.com"}])
+        assert count == 0
+        assert result == html
+
+    def test_new_link_protects_its_text(self):
+        html = "<p>terapia online</p>"
+        strategy = [
+            {"text": "terapia online", "url": "http://a.com"},
+            {"text": "online", "url": "http://b.com"},
+        ]
+        result, count = inject_internal_links(html, strategy)
+        assert count == 1
+        assert result == '<p><a href="http://a.com">terapia online</a></p>'
+
+    def test_links_spliced_in_document_order(self):
+        html = "<p>depressão e ansiedade</p>"
+        strategy = [
+            {"text": "ansiedade", "url": "http://a.com"},
+            {"text": "depressão", "url": "http://d.com"},
+        ]
+        result, _ = inject_internal_links(html, strategy)
+        assert result == '<p><a href="http://d.com">depressão</a> e <a href="http://a.com">ansiedade</a></p>'
+
+
+class TestProtectedSpans:
+    def test_overlaps(self):
+        from core.seo.internal_links import ProtectedSpans
+        html = "<h2>Título</h2><p>texto livre</p>"
+        spans = ProtectedSpans(html)
+        assert spans.overlaps(4, 10)  # inside <h2>
+        free = html.index("texto")
+        assert not spans.overlaps(free, free + 5)
+        spans.add(free, free + 5)
+        assert spans.overlaps(free + 1, free + 2)
+
+    def test_unclosed_heading_protects_to_end(self):
+        from core.seo.internal_links import ProtectedSpans
+        html = "<p>x</p><h3>sem fechamento"
+        spans = ProtectedSpans(html)
+        assert spans.overlaps(len(html) - 3, len(html) - 1)
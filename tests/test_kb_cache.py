@@ -98,3 +98,20 @@ class TestKnowledgeBaseCache:
 
         assert v1 == v2 == "Voice guide content"
         assert mock_kb.load_voice_guide.call_count == 1  # Cached
+
+    @patch("core.kb_cache.KnowledgeBaseIndex")
+    def test_index_built_once_per_tenant(self, MockIndex):
+        MockIndex.build.return_value.retrieve.return_value = "passages"
+
+        r1 = self.cache.retrieve("mjesus", "/path/to/kb", "ansiedade", file_filter=["premium"])
+        r2 = self.cache.retrieve("mjesus", "/path/to/kb", "depressão", file_filter=["premium"])
+
+        assert r1 == r2 == "passages"
+        assert MockIndex.build.call_count == 1
+        assert self.cache.stats["indexes"] == 1
+
+    @patch("core.kb_cache.KnowledgeBaseIndex")
+    def test_invalidate_drops_index(self, MockIndex):
+        self.cache.get_index("mjesus", "/path/to/kb")
+        self.cache.invalidate("mjesus")
+        assert self.cache.stats["indexes"] == 0
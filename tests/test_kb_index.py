@@ -0,0 +1,70 @@
+"""Tests for KnowledgeBaseIndex — chunking, BM25 ranking, char budget."""
+import pytest
+from core.kb_index import KnowledgeBaseIndex, KBChunk, split_into_chunks, tokenize
+
+
+@pytest.fixture
+def kb_dir(tmp_path):
+    (tmp_path / "TRI_ESSENCIA.txt").write_text(
+        "A ansiedade é uma adaptação do sistema nervoso.\n\n"
+        "O conflito visceral nasce de demandas emocionais inibidas.\n\n"
+        "Receita de bolo de cenoura com cobertura de chocolate.",
+        encoding="utf-8",
+    )
+    (tmp_path / "TRI_VOZ.txt").write_text(
+        "Fale com o leitor de forma próxima, sem jargão clínico sobre ansiedade.",
+        encoding="utf-8",
+    )
+    return str(tmp_path)
+
+
+class TestTokenize:
+    def test_strips_accents_and_stopwords(self):
+        assert tokenize("A Ansiedade é uma adaptação") == ["ansiedade", "adaptacao"]
+
+
+class TestSplitIntoChunks:
+    def test_merges_small_paragraphs(self):
+        chunks = split_into_chunks("um\n\ndois\n\ntres", chunk_size=100)
+        assert chunks == ["um\n\ndois\n\ntres"]
+
+    def test_splits_long_paragraph(self):
+        text = "Frase curta. " * 50
+        chunks = split_into_chunks(text, chunk_size=100)
+        assert len(chunks) > 1
+        assert all(len(c) <= 100 for c in chunks)
+
+
+class TestKnowledgeBaseIndex:
+    def test_build_missing_path_is_empty(self, tmp_path):
+        index = KnowledgeBaseIndex.build(str(tmp_path / "missing"))
+        assert len(index) == 0
+        assert index.retrieve("ansiedade") == ""
+
+    def test_search_ranks_relevant_passage(self, kb_dir):
+        index = KnowledgeBaseIndex.build(kb_dir, chunk_size=60)
+        passages = index.search("conflito visceral", top_k=1)
+        assert len(passages) == 1
+        assert "conflito visceral" in passages[0].text
+
+    def test_search_respects_file_filter(self, kb_dir):
+        index = KnowledgeBaseIndex.build(kb_dir, chunk_size=60)
+        passages = index.search("ansiedade", file_filter=["voz"])
+        assert passages
+        assert all(p.source == "TRI_VOZ.txt" for p in passages)
+
+    def test_search_respects_char_budget(self):
+        chunks = [KBChunk("a.txt", i, f"ansiedade {'x' * 90}") for i in range(5)]
+        index = KnowledgeBaseIndex(chunks)
+        passages = index.search("ansiedade", top_k=10, max_chars=250)
+        assert len(passages) == 2
+
+    def test_no_match_returns_empty(self, kb_dir):
+        index = KnowledgeBaseIndex.build(kb_dir)
+        assert index.search("astronomia") == []
+
+    def test_retrieve_formats_with_file_header(self, kb_dir):
+        index = KnowledgeBaseIndex.build(kb_dir, chunk_size=60)
+        text = index.retrieve("bolo cenoura", top_k=1)
+        assert "--- ARQUIVO: TRI_ESSENCIA.txt" in text
+        assert "cenoura" in text
@@ -0,0 +1,149 @@
+"""Tests for ApiKeyPool and LLMClient key selection (sync and async)."""
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from core.key_pool import ApiKeyPool
+from core.llm_client import LLMClient
+
+
+class TestApiKeyPool:
+    def test_spreads_requests_across_keys(self):
+        pool = ApiKeyPool(["k1", "k2", "k3"], rpm_per_key=10)
+        picks = [pool.acquire() for _ in range(6)]
+        assert sorted(picks) == [0, 0, 1, 1, 2, 2]
+
+    def test_picks_key_with_most_token_headroom(self):
+        pool = ApiKeyPool(["k1", "k2"], rpm_per_key=100, tpm_per_key=1000)
+        pool.record_tokens(0, 800)
+        assert pool.acquire(estimated_tokens=100) == 1
+
+    def test_penalized_key_is_skipped(self):
+        pool = ApiKeyPool(["k1", "k2"], rpm_per_key=10)
+        pool.penalize(0)
+        assert [pool.acquire() for _ in range(3)] == [1, 1, 1]
+        assert pool.stats["keys"][0]["cooling_down"] is True
+
+    @patch("core.key_pool.time.sleep")
+    @patch("core.key_pool.time.time")
+    def test_waits_when_all_keys_saturated(self, mock_time, mock_sleep):
+        mock_time.return_value = 100.0
+        pool = ApiKeyPool(["k1"], rpm_per_key=1)
+        pool.acquire()
+
+        def advance(seconds):
+            mock_time.return_value += seconds
+        mock_sleep.side_effect = advance
+
+        assert pool.acquire() == 0
+        assert mock_sleep.called
+
+    def test_stats(self):
+        pool = ApiKeyPool(["k1", "k2"], rpm_per_key=10)
+        pool.acquire(estimated_tokens=50)
+        keys = pool.stats["keys"]
+        assert keys[0]["current_rpm"] == 1
+        assert keys[0]["current_tpm"] == 50
+        assert keys[1]["total_requests"] == 0
+
+
+class TestLLMClientKeyPool:
+    def _client(self, keys):
+        return LLMClient(api_keys=keys, model_name="gemini-test")
+
+    @patch("core.llm_client.glm.GenerativeServiceClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_generate_uses_per_key_client(self, MockModel, MockService):
+        MockModel.return_value.generate_content.return_value = MagicMock(text="ok", usage_metadata=None)
+        llm = self._client(["k1", "k2"])
+
+        assert llm.generate("prompt") == "ok"
+        assert llm.generate("prompt") == "ok"
+
+        api_keys = [c.kwargs["client_options"]["api_key"] for c in MockService.call_args_list]
+        assert api_keys == ["k1", "k2"]
+
+    @patch("core.llm_client.glm.GenerativeServiceClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_quota_error_benches_key_and_retries(self, MockModel, MockService):
+        MockModel.return_value.generate_content.side_effect = [
+            Exception("429 Resource exhausted"),
+            MagicMock(text="ok", usage_metadata=None),
+        ]
+        llm = self._client(["k1", "k2"])
+
+        assert llm.generate("prompt") == "ok"
+        assert llm.stats["keys"][0]["cooling_down"] is True
+        assert llm.current_key_index == 1
+
+    @patch("core.llm_client.glm.GenerativeServiceClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_non_quota_error_raises(self, MockModel, MockService):
+        MockModel.return_value.generate_content.side_effect = ValueError("boom")
+        llm = self._client(["k1", "k2"])
+
+        with pytest.raises(ValueError):
+            llm.generate("prompt")
+
+    @patch("core.llm_client.GEMINI_RPM_PER_KEY", 15)
+    @patch("core.llm_client.create_rate_limiter")
+    def test_global_limiter_sized_to_pool(self, mock_create):
+        from core.llm_client import create_gemini_rate_limiter
+        create_gemini_rate_limiter(["k1", "k2", "k3"])
+        mock_create.assert_called_once_with(rpm=45)
+
+
+class TestLLMClientAsync:
+    @patch("core.llm_client.glm.GenerativeServiceAsyncClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_generate_async_uses_pool_and_limiter(self, MockModel, MockAsyncService):
+        async def fake_generate(prompt, generation_config=None):
+            return MagicMock(text=f"ok:{prompt}", usage_metadata=None)
+        MockModel.return_value.generate_content_async.side_effect = fake_generate
+        rate_limiter = MagicMock()
+        llm = LLMClient(api_keys=["k1", "k2"], model_name="gemini-test", rate_limiter=rate_limiter)
+
+        async def run():
+            return await asyncio.gather(*(llm.generate_async(f"p{i}") for i in range(4)))
+
+        results = asyncio.run(run())
+
+        assert results == ["ok:p0", "ok:p1", "ok:p2", "ok:p3"]
+        assert rate_limiter.throttle.call_count == 4
+        assert [k["total_requests"] for k in llm.stats["keys"]] == [2, 2]
+
+    @patch("core.llm_client.GEMINI_MAX_CONCURRENCY", 2)
+    @patch("core.llm_client.glm.GenerativeServiceAsyncClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_concurrency_is_bounded(self, MockModel, MockAsyncService):
+        in_flight = {"now": 0, "max": 0}
+
+        async def fake_generate(prompt, generation_config=None):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return MagicMock(text="ok", usage_metadata=None)
+        MockModel.return_value.generate_content_async.side_effect = fake_generate
+        llm = LLMClient(api_keys=["k1", "k2", "k3"], model_name="gemini-test")
+
+        async def run():
+            await asyncio.gather(*(llm.generate_async("p") for _ in range(6)))
+
+        asyncio.run(run())
+        assert in_flight["max"] == 2
+
+    @patch("core.llm_client.glm.GenerativeServiceAsyncClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_generate_async_benches_key_on_quota_error(self, MockModel, MockAsyncService):
+        responses = [Exception("429 quota"), MagicMock(text="ok", usage_metadata=None)]
+
+        async def fake_generate(prompt, generation_config=None):
+            r = responses.pop(0)
+            if isinstance(r, Exception):
+                raise r
+            return r
+        MockModel.return_value.generate_content_async.side_effect = fake_generate
+        llm = LLMClient(api_keys=["k1", "k2"], model_name="gemini-test")
+
+        assert asyncio.run(llm.generate_async("p")) == "ok"
+        assert llm.stats["keys"][0]["cooling_down"] is True
@@ -0,0 +1,109 @@
+"""Tests for LLMResponseCache — hits, TTL, LRU eviction, LLMClient integration."""
+import pytest
+from unittest.mock import patch, MagicMock
+from core.llm_cache import LLMResponseCache, make_cache_key, create_response_cache
+from core.llm_client import LLMClient
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = LLMResponseCache(str(tmp_path / "cache" / "llm.sqlite"), ttl=3600, max_entries=3)
+    yield c
+    c.close()
+
+
+class TestLLMResponseCache:
+    def test_miss_then_hit(self, cache):
+        assert cache.get("gemini", "prompt", False) is None
+        cache.set("gemini", "prompt", False, "response")
+
+        assert cache.get("gemini", "prompt", False) == "response"
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_key_includes_model_and_json_mode(self, cache):
+        cache.set("gemini", "prompt", False, "text")
+        assert cache.get("gemini", "prompt", True) is None
+        assert cache.get("other-model", "prompt", False) is None
+        assert make_cache_key("m", "p", True) != make_cache_key("m", "p", False)
+
+    @patch("core.llm_cache.time.time")
+    def test_ttl_expiration(self, mock_time, cache):
+        mock_time.return_value = 1000
+        cache.set("gemini", "prompt", False, "response")
+
+        mock_time.return_value = 4601
+        assert cache.get("gemini", "prompt", False) is None
+        assert cache.stats["entries"] == 0
+
+    @patch("core.llm_cache.time.time")
+    def test_lru_eviction(self, mock_time, cache):
+        for i, t in enumerate([100, 101, 102]):
+            mock_time.return_value = t
+            cache.set("gemini", f"p{i}", False, f"r{i}")
+
+        # Touch p0 so p1 becomes least recently used
+        mock_time.return_value = 103
+        cache.get("gemini", "p0", False)
+
+        mock_time.return_value = 104
+        cache.set("gemini", "p3", False, "r3")
+
+        assert cache.stats["entries"] == 3
+        assert cache.get("gemini", "p1", False) is None
+        assert cache.get("gemini", "p0", False) == "r0"
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "llm.sqlite")
+        first = LLMResponseCache(path)
+        first.set("gemini", "prompt", True, '{"a": 1}')
+        first.close()
+
+        second = LLMResponseCache(path)
+        assert second.get("gemini", "prompt", True) == '{"a": 1}'
+        second.close()
+
+    def test_create_disabled_returns_none(self):
+        assert create_response_cache(enabled=False) is None
+
+
+class TestLLMClientResponseCache:
+    @patch("core.llm_client.glm.GenerativeServiceClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_identical_prompt_served_from_cache(self, MockModel, MockService, cache):
+        MockModel.return_value.generate_content.return_value = MagicMock(text="fresh", usage_metadata=None)
+        rate_limiter = MagicMock()
+        llm = LLMClient(api_keys=["k1"], model_name="gemini-test",
+                        rate_limiter=rate_limiter, response_cache=cache)
+
+        assert llm.generate("same prompt", json_mode=True) == "fresh"
+        assert llm.generate("same prompt", json_mode=True) == "fresh"
+
+        assert MockModel.return_value.generate_content.call_count == 1
+        assert rate_limiter.throttle.call_count == 1
+        assert cache.stats["hits"] == 1
+
+    @patch("core.llm_client.glm.GenerativeServiceClient")
+    @patch("core.llm_client.genai.GenerativeModel")
+    def test_unparseable_agent_response_is_not_cached(self, MockModel, MockService, cache):
+        from core.agents.analyst import AnalystAgent
+        MockModel.return_value.generate_content.side_effect = [
+            MagicMock(text="not json", usage_metadata=None),
+            MagicMock(text='{"title": "T", "sections": []}', usage_metadata=None),
+        ]
+        llm = LLMClient(api_keys=["k1"], model_name="gemini-test",
+                        rate_limiter=MagicMock(), response_cache=cache)
+        agent = AnalystAgent(llm)
+
+        result = agent.execute({"keyword": "ansiedade", "links_inventory": []})
+
+        # The retry reached the model instead of replaying the malformed response
+        assert result.success is True
+        assert MockModel.return_value.generate_content.call_count == 2
+        assert cache.stats["entries"] == 1
+
+    def test_discard_response_removes_poisoned_entry(self, cache):
+        llm = LLMClient(api_keys=["k1"], model_name="gemini-test", response_cache=cache)
+        cache.set("gemini-test", "p", True, "not json")
+        llm.discard_response("p", True)
+        assert cache.get("gemini-test", "p", True) is None
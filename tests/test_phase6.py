@@ -11,7 +11,7 @@ from core.seo.featured_snippets import (
     detect_snippet_opportunities, format_paragraph_snippet,
     format_list_snippet, format_table_snippet,
 )
-from core.seo.ab_testing import create_ab_test, get_active_tests
+from core.seo.ab_testing import create_ab_test, get_active_tests, evaluate_and_rotate
 from core.seo.entity_mapping import _parse_kg_response
 
 
@@ -129,6 +129,32 @@ class TestABTesting:
         active = get_active_tests()
         assert len(active) == 2
 
+    def test_evaluate_and_rotate_batches_title_updates(self, tmp_path, monkeypatch):
+        from core.wordpress_client import WPBatch
+        monkeypatch.setattr("core.seo.ab_testing.AB_TESTS_FILE", str(tmp_path / "tests.json"))
+        for post_id in (1, 2):
+            create_ab_test(post_id, f"kw{post_id}", {"titles": ["A", "B"], "meta_descriptions": ["Ma", "Mb"]})
+        tests = json.loads((tmp_path / "tests.json").read_text())
+        for test in tests:
+            test["created_at"] = "2020-01-01"
+        (tmp_path / "tests.json").write_text(json.dumps(tests))
+
+        wp = MagicMock()
+        wp.batch.side_effect = lambda **kwargs: WPBatch(wp, **kwargs)
+        wp.send_batch.side_effect = lambda writes: [(200, {}), (500, {})]
+
+        actions = evaluate_and_rotate(wp, [], min_days=14)
+
+        wp.send_batch.assert_called_once()
+        assert [w.path for w in wp.send_batch.call_args[0][0]] == ["/wp/v2/posts/1", "/wp/v2/posts/2"]
+        assert [a["post_id"] for a in actions] == [1]
+        wp.update_post.assert_not_called()
+
+        # The failed write leaves post 2 on the variation WordPress still serves
+        saved = {t["post_id"]: t for t in json.loads((tmp_path / "tests.json").read_text())}
+        assert saved[1]["current_variation"] == 1
+        assert (saved[2]["current_variation"], saved[2]["created_at"]) == (0, "2020-01-01")
+
 
 # === Story 6.4 — Entity Mapping ===
 
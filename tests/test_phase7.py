@@ -84,6 +84,41 @@ class TestDiscoverKeywords:
         keywords = [r["keyword"].lower() for r in results]
         assert "ansiedade generalizada" not in keywords
 
+    @patch("core.keyword_discovery.discovery.google_suggest")
+    @patch("core.keyword_discovery.discovery.generate_serp_brief")
+    def test_multiple_seeds_deduplicated(self, mock_serp, mock_suggest):
+        mock_suggest.side_effect = lambda kw, cache=None: ["terapia online"] if kw in ("ansiedade", "depressao") else []
+        mock_serp.return_value = {}
+
+        results = discover_keywords(["ansiedade", "depressao"])
+
+        assert [r["keyword"] for r in results] == ["terapia online"]
+        assert {c[0][0] for c in mock_serp.call_args_list} == {"ansiedade", "depressao"}
+
+    @patch("core.keyword_discovery.discovery.google_suggest")
+    @patch("core.keyword_discovery.discovery.generate_serp_brief")
+    def test_depth_expands_new_keywords(self, mock_serp, mock_suggest):
+        graph = {"ansiedade": ["ansiedade noturna"], "ansiedade noturna": ["ansiedade noturna sintomas", "ansiedade"]}
+        mock_suggest.side_effect = lambda kw, cache=None: graph.get(kw, [])
+        mock_serp.return_value = {}
+
+        shallow = discover_keywords("ansiedade", depth=1)
+        deep = discover_keywords("ansiedade", depth=2)
+
+        assert [r["keyword"] for r in shallow] == ["ansiedade noturna"]
+        assert {r["keyword"]: r["depth"] for r in deep} == {"ansiedade noturna": 1, "ansiedade noturna sintomas": 2}
+
+    @patch("core.keyword_discovery.discovery.requests.get")
+    def test_suggest_uses_cache(self, mock_get):
+        from core.serp_cache import SerpCache
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: ["ansiedade", ["ansiedade sintomas"]])
+        cache = SerpCache(":memory:")
+
+        assert google_suggest("ansiedade", cache=cache) == ["ansiedade sintomas"]
+        assert google_suggest("ansiedade", cache=cache) == ["ansiedade sintomas"]
+        mock_get.assert_called_once()
+        assert cache.get("ansiedade", "br", "pt-br", 10) is None  # separate from SERP entries
+
 
 # === Story 7.3 — Multi-Language ===
 
@@ -6,6 +6,7 @@ from core.pipeline import (
     ArticlePipeline,
     PipelineResult,
     validate_keyword,
+    prefetchable_keywords,
     validate_analyst_output,
     validate_html_output,
     clean_orphan_placeholders,
@@ -48,6 +49,18 @@ class TestValidateKeyword:
         assert ok is False
 
 
+class TestPrefetchableKeywords:
+    def test_drops_invalid_and_duplicate_keywords(self):
+        keywords = ["Terapia TRI", "", "   ", "x" * 201, "terapia  tri ", "ansiedade", None]
+        assert prefetchable_keywords(keywords) == ["Terapia TRI", "ansiedade"]
+
+    @patch("core.pipeline.prefetch_serp_data", return_value=1)
+    def test_pipeline_prefetch_filters_keywords(self, mock_prefetch):
+        pipeline = ArticlePipeline(make_mock_llm(), make_mock_kb(), serp_cache=MagicMock())
+        pipeline.prefetch_serp(["ansiedade", "", "Ansiedade"])
+        assert mock_prefetch.call_args[0][0] == ["ansiedade"]
+
+
 class TestValidateAnalystOutput:
     def test_valid(self):
         ok, _ = validate_analyst_output({"title": "T", "sections": []})
@@ -239,6 +252,117 @@ class TestArticlePipelineE2E:
             assert metric.agent_name != ""
 
 
+    def test_visual_and_growth_run_inside_pipeline(self):
+        from core.agents.base import AgentResult
+        meta = "This is a meta description that is exactly long enough to pass the SEO scorer check for proper length validation here."
+        analyst_json = json.dumps({"title": "Test keyword guide", "sections": [], "meta_description": meta})
+        words = " ".join(["test keyword"] * 5 + ["word"] * 200)
+        long_content = (
+            f'<h1>Test keyword guide</h1><p>test keyword {words}</p>'
+            f'<h2>Section</h2><p>{words}</p>'
+            f'<a href="https://example.com/1">link1</a>'
+            f'<a href="https://example.com/2">link2</a>'
+            f'<!-- IMG_PLACEHOLDER -->'
+            f'<div class="cta-box"><p>CTA</p></div>'
+        )
+        llm = make_mock_llm()
+        llm.generate.side_effect = [analyst_json, long_content, long_content, long_content]
+        visual = MagicMock()
+        visual.execute.return_value = AgentResult(content="cover ||| section", duration_ms=1, agent_name="VisualAgent", success=True)
+        growth = MagicMock()
+        growth.execute.return_value = AgentResult(content=["novo tema"], duration_ms=1, agent_name="GrowthAgent", success=True)
+
+        pipeline = ArticlePipeline(llm, make_mock_kb(), visual=visual, growth=growth)
+        result = pipeline.run("test keyword", [{"keyword": "Outro"}], existing_keywords={"ja feito"})
+
+        assert result.success is True
+        assert result.image_prompts == ["cover", "section"]
+        assert result.growth_topics == ["novo tema"]
+        existing = growth.execute.call_args[0][0]["existing_keywords"].split("\n")
+        assert set(existing) == {"ja feito", "outro", "test keyword"}
+
+    def test_seo_gate_block_skips_visual_and_growth(self):
+        analyst_json = json.dumps({"title": "T", "sections": [{"h2": "S"}], "meta_description": "M"})
+        html = "<h1>T</h1><p>" + "Conteudo. " * 30 + "</p>"
+        llm = make_mock_llm()
+        llm.generate.side_effect = [analyst_json, html, html]
+        visual, growth = MagicMock(), MagicMock()
+        pipeline = ArticlePipeline(llm, make_mock_kb(), visual=visual, growth=growth)
+
+        with patch("core.pipeline.SeoScorer") as scorer_cls:
+            scorer_cls.return_value.score.return_value = MagicMock(total=10, grade="D", checks=[], warnings=[])
+            result = pipeline.run("t", [])
+
+        assert result.success is False
+        visual.execute.assert_not_called()
+        growth.execute.assert_not_called()
+
+    def test_optional_stages_default_to_none(self):
+        analyst_json = json.dumps({"title": "T", "sections": [{"h2": "S"}], "meta_description": "M"})
+        html = "<h1>T</h1><p>" + "Conteudo. " * 30 + "</p>"
+        pipeline = self._setup_pipeline_with_responses(analyst_json, html, html, html)
+        result = pipeline.run("t", [])
+        assert result.image_prompts is None
+        assert result.growth_topics is None
+
+
+class TestArticlePipelineCheckpoints:
+    ANALYST_JSON = json.dumps({"title": "T", "sections": [{"h2": "S"}], "meta_description": "M"})
+    HTML = "<h1>T</h1><p>" + "Conteudo. " * 30 + "</p>"
+
+    @patch("core.pipeline.generate_serp_brief", return_value={"keyword": "t", "people_also_ask": []})
+    def test_failed_run_resumes_after_last_stage(self, mock_serp, tmp_path):
+        from core.checkpoint import CheckpointStore
+        store = CheckpointStore(str(tmp_path))
+
+        llm = make_mock_llm()
+        llm.generate.side_effect = [self.ANALYST_JSON, self.HTML, Exception("editor down")]
+        result = ArticlePipeline(llm, make_mock_kb(), checkpoints=store).run("t", [])
+        assert result.success is False
+        assert set(store.load("default", "t")) == {"serp", "outline", "draft"}
+
+        # Retry: only the editor is called again
+        llm = make_mock_llm()
+        llm.generate.side_effect = [self.HTML]
+        result = ArticlePipeline(llm, make_mock_kb(), checkpoints=store).run("t", [])
+        assert result.success is True
+        assert llm.generate.call_count == 1
+        assert [m.agent_name for m in result.agent_metrics] == ["editor"]
+        mock_serp.assert_called_once()
+
+    @patch("core.pipeline.generate_serp_brief", side_effect=[{}, {"keyword": "t"}])
+    def test_empty_serp_brief_is_not_checkpointed(self, mock_serp, tmp_path):
+        from core.checkpoint import CheckpointStore
+        store = CheckpointStore(str(tmp_path))
+
+        llm = make_mock_llm()
+        llm.generate.side_effect = [self.ANALYST_JSON, self.HTML, Exception("editor down")]
+        ArticlePipeline(llm, make_mock_kb(), checkpoints=store).run("t", [])
+        assert set(store.load("default", "t")) == {"outline", "draft"}
+
+        # Retry: the failed SERP fetch runs again
+        llm = make_mock_llm()
+        llm.generate.side_effect = [self.HTML]
+        ArticlePipeline(llm, make_mock_kb(), checkpoints=store).run("t", [])
+        assert mock_serp.call_count == 2
+        assert store.load("default", "t")["serp"] == {"keyword": "t"}
+
+    def test_seo_gate_block_discards_edited_html(self, tmp_path):
+        from core.checkpoint import CheckpointStore
+        store = CheckpointStore(str(tmp_path))
+        llm = make_mock_llm()
+        llm.generate.side_effect = [self.ANALYST_JSON, self.HTML, self.HTML]
+        pipeline = ArticlePipeline(llm, make_mock_kb(), checkpoints=store)
+
+        with patch("core.pipeline.SeoScorer") as scorer_cls:
+            scorer_cls.return_value.score.return_value = MagicMock(total=10, grade="D", checks=[], warnings=[])
+            result = pipeline.run("t", [])
+
+        assert result.success is False
+        assert "SEO score too low" in result.error
+        assert set(store.load("default", "t")) == {"outline", "draft"}  # no SERP brief to keep
+
+
 # ──────────────────────────────────────────────
 # GeminiBrain facade backward compat
 # ──────────────────────────────────────────────
@@ -278,4 +402,3 @@ class TestGeminiBrainFacade:
             assert hasattr(brain, 'identify_new_topics')
             assert hasattr(brain, '_load_knowledge_base')
             assert hasattr(brain, '_load_voice_guide')
-            assert hasattr(brain, '_rotate_key')
@@ -1,7 +1,7 @@
 """Tests for RateLimiter — sliding window, threading, throttle."""
 import pytest
-from unittest.mock import patch
-from core.rate_limiter import RateLimiter
+from unittest.mock import patch, MagicMock
+from core.rate_limiter import RateLimiter, RedisRateLimiter, create_rate_limiter
 
 
 class TestRateLimiter:
@@ -59,3 +59,69 @@ class TestRateLimiter:
         mock_time.return_value = 161.0
         waited = rl.wait_if_needed()
         assert waited == 0.0  # Old entries expired, no wait needed
+
+
+def make_redis(script_results):
+    """Mock Redis whose registered Lua script returns the given wait values (ms)."""
+    redis = MagicMock()
+    script = MagicMock(side_effect=script_results)
+    redis.register_script.return_value = script
+    return redis, script
+
+
+class TestRedisRateLimiter:
+    def test_acquires_without_wait(self):
+        redis, script = make_redis([0])
+        rl = RedisRateLimiter(redis, rpm=15, name="gemini")
+
+        assert rl.throttle() == 0.0
+        kwargs = script.call_args.kwargs
+        assert kwargs["keys"] == ["ratelimit:gemini"]
+        assert kwargs["args"][:2] == [60, 15]
+
+    @patch("core.rate_limiter.time.sleep")
+    def test_waits_until_shared_slot_frees(self, mock_sleep):
+        redis, script = make_redis([1500, 0])
+        rl = RedisRateLimiter(redis, rpm=15)
+
+        waited = rl.throttle()
+
+        assert waited == pytest.approx(1.6)
+        mock_sleep.assert_called_once()
+        assert script.call_count == 2
+        assert rl.stats["total_waits"] == 1
+
+    def test_falls_back_to_local_limiter_on_redis_error(self):
+        redis, _ = make_redis(ConnectionError("down"))
+        rl = RedisRateLimiter(redis, rpm=15)
+
+        assert rl.throttle() == 0.0
+        redis.zcount.side_effect = ConnectionError("down")
+        assert rl.stats["current_rpm"] == 1
+
+    def test_stats_reads_shared_count(self):
+        redis, _ = make_redis([0])
+        redis.zcount.return_value = 7
+        redis.time.return_value = (1_000_000, 500_000)  # Redis server clock, not the local one
+        rl = RedisRateLimiter(redis, rpm=15)
+
+        stats = rl.stats
+        assert stats["current_rpm"] == 7
+        assert stats["backend"] == "redis"
+        redis.zcount.assert_called_once_with(rl.key, 1_000_000.5 - 60, "+inf")
+
+
+class TestCreateRateLimiter:
+    @patch("core.queue_config.get_redis_connection", return_value=None)
+    def test_memory_when_redis_unavailable(self, _):
+        assert isinstance(create_rate_limiter(rpm=10), RateLimiter)
+
+    @patch("core.queue_config.get_redis_connection")
+    def test_redis_when_available(self, mock_conn):
+        assert isinstance(create_rate_limiter(rpm=10), RedisRateLimiter)
+
+    @patch("core.queue_config.get_redis_connection")
+    def test_memory_backend_env_override(self, mock_conn, monkeypatch):
+        monkeypatch.setenv("RATE_LIMITER_BACKEND", "memory")
+        assert isinstance(create_rate_limiter(rpm=10), RateLimiter)
+        mock_conn.assert_not_called()
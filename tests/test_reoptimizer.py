@@ -7,7 +7,12 @@ class TestReoptimizer(unittest.TestCase):
 
     def _make_reoptimizer(self):
         from core.reoptimizer import ArticleReoptimizer
+        from core.wordpress_client import WPBatch
         wp = MagicMock()
+        # Real batch queue over a site without /batch/v1 — writes go out as update_post/update_media
+        wp.supports_batch = False
+        wp.can_batch.return_value = False
+        wp.batch.side_effect = lambda **kwargs: WPBatch(wp, **kwargs)
         config = {
             "wordpress_url": "https://example.com",
             "author_name": "Test Author",
@@ -70,8 +75,10 @@ class TestReoptimizer(unittest.TestCase):
                 'content': {'rendered': '<p>Hello world. Test content.</p>'},
                 'slug': 'post-1',
                 'featured_media': 10,
+                'meta': {},
             }
         ]
+        opt.wp.get_media.return_value = {10: {'id': 10, 'source_url': 'https://example.com/a.png'}}
         opt.wp.update_post.return_value = {'id': 1}
         opt.wp.update_media.return_value = True
 
@@ -81,6 +88,158 @@ class TestReoptimizer(unittest.TestCase):
         opt.wp.update_post.assert_called_once()
         opt.wp.update_media.assert_called_once()
 
+    def test_reoptimize_all_batches_reads(self):
+        """Keyword comes from the listed meta and media is resolved in one batch."""
+        opt = self._make_reoptimizer()
+        opt.rate_limiter = MagicMock()
+        opt.wp.get_posts.return_value = [
+            {
+                'id': i,
+                'title': {'rendered': f'Post {i}'},
+                'content': {'rendered': f'<p>Text.</p><img class="wp-image-{100 + i}" src="x.png">'},
+                'featured_media': 10 + i,
+                'meta': {'_yoast_wpseo_focuskw': f'kw {i}'},
+            }
+            for i in range(1, 4)
+        ]
+        opt.wp.get_media.return_value = {
+            101: {'id': 101, 'source_url': 'https://example.com/marcelo-terapeuta.jpg'},
+        }
+        opt.wp.update_post.return_value = {'id': 1}
+        opt.wp.update_media.return_value = True
+
+        results = opt.reoptimize_all()
+
+        assert [r['post_id'] for r in results] == [1, 2, 3]
+        assert [r['keyword'] for r in results] == ['kw 1', 'kw 2', 'kw 3']
+        opt.wp.get_post.assert_not_called()
+        opt.wp.get_media.assert_called_once()
+        assert opt.wp.get_media.call_args[0][0] == {11, 12, 13, 101, 102, 103}
+        assert opt.wp.update_post.call_count == 3
+        assert opt.wp.update_media.call_count == 6
+        # Every write goes through the site's rate limiter
+        assert opt.rate_limiter.throttle.call_count == 9
+        author_alt = [c[0][1] for c in opt.wp.update_media.call_args_list if c[0][0] == 101]
+        assert author_alt == ["Test Author - Terapeuta especialista em kw 1"]
+
+    def test_yoast_keyword_not_refetched_for_listed_post(self):
+        opt = self._make_reoptimizer()
+        # Stock WordPress: Yoast meta isn't REST-registered, so "meta" is an empty list
+        assert opt._get_yoast_keyword(5, {'id': 5, 'meta': []}) is None
+        assert opt._get_yoast_keyword(5, {'id': 5}) is None
+        opt.wp.get_post.assert_not_called()
+
+    def test_yoast_keyword_fetched_without_post(self):
+        opt = self._make_reoptimizer()
+        opt.wp.get_post.return_value = {'meta': {'_yoast_wpseo_focuskw': 'ansiedade'}}
+        assert opt._get_yoast_keyword(5) == 'ansiedade'
+        opt.wp.get_post.assert_called_once_with(5, fields=["meta"])
+
+    def test_reoptimize_all_with_list_meta_falls_back_to_title(self):
+        opt = self._make_reoptimizer()
+        opt.wp.get_posts.return_value = [{
+            'id': 1, 'title': {'rendered': 'Ansiedade: guia completo'},
+            'content': {'rendered': '<p>Text.</p>'}, 'featured_media': 0, 'meta': [],
+        }]
+        opt.wp.get_media.return_value = {}
+        opt.wp.update_post.return_value = {'id': 1}
+
+        results = opt.reoptimize_all()
+
+        assert results[0]['keyword'] == 'Ansiedade'
+        opt.wp.get_post.assert_not_called()
+
+    def _post(self):
+        opt = self._make_reoptimizer()
+        html = '<p>Hello world. Test content.</p>'
+        fixed, meta = opt.analyze_and_fix(html, "kw", "Post 1")
+        post = {
+            'id': 1,
+            'title': {'rendered': 'Post 1'},
+            'content': {'rendered': fixed},
+            'excerpt': {'rendered': f"<p>{meta['excerpt']}</p>\n"},
+            'featured_media': 10,
+            'meta': dict(meta['meta'], _yoast_wpseo_focuskw='kw'),
+        }
+        return opt, post
+
+    def test_changed_fields_empty_when_already_optimized(self):
+        opt, post = self._post()
+        fixed, meta = opt.analyze_and_fix(post['content']['rendered'], "kw", "Post 1")
+        assert opt.changed_fields(post, fixed, meta) == {}
+
+    def test_changed_fields_sends_only_differences(self):
+        opt, post = self._post()
+        post['meta']['_yoast_wpseo_metadesc'] = 'old description'
+        fixed, meta = opt.analyze_and_fix(post['content']['rendered'], "kw", "Post 1")
+        payload = opt.changed_fields(post, fixed + '<p>x</p>', meta)
+        assert set(payload) == {'content', 'meta'}
+        assert list(payload['meta']) == ['_yoast_wpseo_metadesc']
+
+    def test_changed_fields_ignores_entities_and_unregistered_meta(self):
+        opt = self._make_reoptimizer()
+        html = '<p>Ansiedade &#8211; o que &#233; e como tratar. Veja   mais.</p>'
+        fixed, meta = opt.analyze_and_fix(html, "ansiedade", "Ansiedade")
+        post = {
+            'id': 1,
+            'content': {'rendered': fixed},
+            'excerpt': {'rendered': '<p>Ansiedade \u2013 o que \u00e9 e como tratar. Veja mais.</p>\n'},
+            'meta': [],  # Yoast keys not REST-registered
+        }
+        assert opt.changed_fields(post, fixed, meta) == {}
+
+    def test_reoptimize_all_skips_unchanged_posts_and_media(self):
+        from core.reoptimizer import summarize_results
+        opt, post = self._post()
+        alt = "kw - Post 1"
+        opt.wp.get_posts.return_value = [post]
+        opt.wp.get_media.return_value = {10: {'id': 10, 'source_url': 'a.png', 'alt_text': alt}}
+
+        results = opt.reoptimize_all()
+
+        assert results[0]['status'] == 'skipped'
+        assert results[0]['success'] is True
+        assert results[0]['media_skipped'] == 1
+        opt.wp.update_post.assert_not_called()
+        opt.wp.update_media.assert_not_called()
+        assert summarize_results(results) == {'updated': 0, 'skipped': 1, 'failed': 0}
+
+    def test_failed_update_is_reported(self):
+        from core.reoptimizer import summarize_results
+        opt, post = self._post()
+        post['content']['rendered'] = '<p>Changed.</p><script type="application/ld+json">{}</script>'
+        opt.wp.get_posts.return_value = [post]
+        opt.wp.get_media.return_value = {}
+        opt.wp.update_post.return_value = None
+
+        results = opt.reoptimize_all()
+
+        assert results[0]['status'] == 'failed'
+        assert 'content' in results[0]['updated_fields']
+        assert summarize_results(results)['failed'] == 1
+
+    def test_reoptimize_all_sends_writes_in_one_batch(self):
+        opt = self._make_reoptimizer()
+        opt.wp.supports_batch = True
+        opt.wp.can_batch.side_effect = lambda route: route != "/wp/v2/media"
+        opt.wp.update_media.return_value = True
+        opt.wp.send_batch.side_effect = lambda writes: [(200, {}) for _ in writes]
+        opt.wp.get_posts.return_value = [
+            {'id': i, 'title': {'rendered': f'Post {i}'}, 'content': {'rendered': '<p>Text.</p>'},
+             'featured_media': 10 + i, 'meta': {}}
+            for i in range(1, 4)
+        ]
+        opt.wp.get_media.return_value = {}
+
+        results = opt.reoptimize_all()
+
+        opt.wp.send_batch.assert_called_once()
+        assert len(opt.wp.send_batch.call_args[0][0]) == 3
+        opt.wp.update_post.assert_not_called()
+        assert opt.wp.update_media.call_count == 3  # media refuses batching
+        assert [r['status'] for r in results] == ['updated'] * 3
+        assert [r['media_fixed'] for r in results] == [1, 1, 1]
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,8 +4,9 @@ import pytest
 from unittest.mock import patch, MagicMock
 from core.agents.serp_analyzer import (
     get_serp_data, _parse_serp_response, _estimate_word_count,
-    generate_serp_brief,
+    generate_serp_brief, get_serp_data_batch, generate_serp_briefs, prefetch_serp_data,
 )
+from core.serp_cache import SerpCache
 
 
 # Mock SerperAPI response
@@ -124,3 +125,58 @@ class TestGenerateSerpBrief:
         mock_get.return_value = None
         brief = generate_serp_brief("ansiedade")
         assert brief == {}
+
+
+class TestSerpBatch:
+
+    @patch("core.agents.serp_analyzer.requests.post")
+    def test_sends_one_request_for_all_keywords(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=200, json=lambda: [MOCK_SERPER_RESPONSE, {}])
+
+        results = get_serp_data_batch(["ansiedade", "depressao"], api_key="k")
+
+        mock_post.assert_called_once()
+        payload = mock_post.call_args[1]["json"]
+        assert [q["q"] for q in payload] == ["ansiedade", "depressao"]
+        assert payload[0]["gl"] == "br" and payload[0]["num"] == 10
+        assert len(results["ansiedade"]["organic"]) == 2
+        assert results["depressao"]["organic"] == []
+
+    @patch("core.agents.serp_analyzer.SERPER_BATCH_LIMIT", 2)
+    @patch("core.agents.serp_analyzer.requests.post")
+    def test_splits_into_batch_limit(self, mock_post):
+        mock_post.side_effect = lambda url, headers, json, timeout: MagicMock(
+            status_code=200, json=lambda: [{} for _ in json])
+
+        results = get_serp_data_batch(["a", "b", "c"], api_key="k")
+
+        assert mock_post.call_count == 2
+        assert all(results[kw] is not None for kw in "abc")
+
+    @patch("core.agents.serp_analyzer.requests.post")
+    def test_error_returns_none_per_keyword(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=500, text="boom")
+        assert get_serp_data_batch(["a", "b"], api_key="k") == {"a": None, "b": None}
+
+    @patch("core.agents.serp_analyzer.requests.post")
+    def test_skips_cached_keywords_and_fills_cache(self, mock_post):
+        cache = SerpCache(":memory:")
+        cache.set("ansiedade", "br", "pt-br", 10, _parse_serp_response(MOCK_SERPER_RESPONSE))
+        mock_post.return_value = MagicMock(status_code=200, json=lambda: [{}])
+
+        prefetched = prefetch_serp_data(["ansiedade", "depressao"], cache, api_key="k")
+
+        assert prefetched == 2
+        assert [q["q"] for q in mock_post.call_args[1]["json"]] == ["depressao"]
+        # The pipeline's single-keyword lookup is now a cache hit
+        with patch.dict("os.environ", {"SERPER_API_KEY": "k"}):
+            brief = generate_serp_brief("depressao", cache=cache)
+        assert brief["keyword"] == "depressao"
+        mock_post.assert_called_once()
+
+    @patch("core.agents.serp_analyzer.requests.post")
+    def test_generate_serp_briefs(self, mock_post):
+        mock_post.return_value = MagicMock(status_code=200, json=lambda: [MOCK_SERPER_RESPONSE])
+        briefs = generate_serp_briefs(["ansiedade", "depressao"], api_key="k")
+        assert briefs["ansiedade"]["keyword"] == "ansiedade"
+        assert briefs["depressao"] == {}
@@ -0,0 +1,111 @@
+"""Tests for SerpCache — TTL, key normalization, single-flight fetching."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from core.serp_cache import SerpCache, make_serp_key, create_serp_cache
+
+SERP = {"organic": [], "people_also_ask": [], "related_searches": ["a"], "total_results": 0}
+
+
+class TestSerpCache:
+    def test_get_or_fetch_caches_result(self):
+        cache = SerpCache(":memory:")
+        fetch = MagicMock(return_value=SERP)
+
+        assert cache.get_or_fetch("terapia", "br", "pt-br", 10, fetch) == SERP
+        assert cache.get_or_fetch("terapia", "br", "pt-br", 10, fetch) == SERP
+
+        fetch.assert_called_once()
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_key_normalizes_query_but_not_locale(self):
+        assert make_serp_key("Terapia  Online ", "br", "pt-br", 10) == make_serp_key("terapia online", "br", "pt-br", 10)
+        assert make_serp_key("terapia", "br", "pt-br", 10) != make_serp_key("terapia", "pt", "pt-br", 10)
+        assert make_serp_key("terapia", "br", "pt-br", 10) != make_serp_key("terapia", "br", "pt-br", 20)
+
+    def test_expired_entry_is_refetched(self):
+        cache = SerpCache(":memory:", ttl=0)
+        fetch = MagicMock(return_value=SERP)
+        cache.get_or_fetch("terapia", "br", "pt-br", 10, fetch)
+        cache.get_or_fetch("terapia", "br", "pt-br", 10, fetch)
+        assert fetch.call_count == 2
+
+    def test_failures_are_not_cached(self):
+        cache = SerpCache(":memory:")
+        assert cache.get_or_fetch("terapia", "br", "pt-br", 10, lambda: None) is None
+        assert cache.get_or_fetch("terapia", "br", "pt-br", 10, lambda: SERP) == SERP
+
+    def test_concurrent_callers_share_one_fetch(self):
+        cache = SerpCache(":memory:")
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return SERP
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(cache.get_or_fetch, "terapia", "br", "pt-br", 10, fetch) for _ in range(5)]
+            time.sleep(0.1)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert len(calls) == 1
+        assert results == [SERP] * 5
+
+    def test_waits_for_other_process_lock(self, tmp_path):
+        path = str(tmp_path / "serp.sqlite")
+        other = SerpCache(path)
+        cache = SerpCache(path, poll_interval=0.01)
+        assert other._try_lock(make_serp_key("terapia", "br", "pt-br", 10))
+
+        def finish_other():
+            time.sleep(0.1)
+            other.set("terapia", "br", "pt-br", 10, SERP)
+
+        threading.Thread(target=finish_other).start()
+        fetch = MagicMock(return_value={"other": True})
+
+        assert cache.get_or_fetch("terapia", "br", "pt-br", 10, fetch) == SERP
+        fetch.assert_not_called()
+
+    def test_stale_lock_is_taken_over(self, tmp_path):
+        path = str(tmp_path / "serp.sqlite")
+        SerpCache(path)._try_lock(make_serp_key("terapia", "br", "pt-br", 10))
+        cache = SerpCache(path, lock_timeout=0)
+        assert cache.get_or_fetch("terapia", "br", "pt-br", 10, lambda: SERP) == SERP
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "serp.sqlite")
+        SerpCache(path).set("terapia", "br", "pt-br", 10, SERP)
+        assert SerpCache(path).get("terapia", "br", "pt-br", 10) == SERP
+
+    def test_factory_disabled(self):
+        assert create_serp_cache(enabled=False) is None
+
+
+class TestSerpCacheConsumers:
+    @patch("core.agents.serp_analyzer.requests.post")
+    def test_generate_serp_brief_uses_cache(self, mock_post):
+        from core.agents.serp_analyzer import generate_serp_brief
+        mock_post.return_value = MagicMock(status_code=200, json=lambda: {"relatedSearches": [{"query": "x"}]})
+        cache = SerpCache(":memory:")
+
+        with patch.dict("os.environ", {"SERPER_API_KEY": "k"}):
+            first = generate_serp_brief("terapia", cache=cache)
+            second = generate_serp_brief("terapia", cache=cache)
+
+        assert first == second
+        assert first["related_searches"] == ["x"]
+        mock_post.assert_called_once()
+
+    @patch("core.keyword_discovery.discovery.google_suggest", return_value=[])
+    @patch("core.keyword_discovery.discovery.generate_serp_brief", return_value={})
+    def test_discover_keywords_passes_cache(self, mock_brief, _):
+        from core.keyword_discovery.discovery import discover_keywords
+        cache = SerpCache(":memory:")
+        discover_keywords("terapia", serp_cache=cache)
+        assert mock_brief.call_args[1]["cache"] is cache
@@ -0,0 +1,153 @@
+"""Tests for SheetMirror — local queries, delta pulls, batched push."""
+from unittest.mock import MagicMock, patch
+from core.sheet_mirror import SheetMirror, create_sheet_mirror
+
+ROWS = [
+    ["Keyword", "Status", "Link"],
+    ["ansiedade", "Done", "http://a.com"],
+    ["depressão", "", ""],
+    ["terapia", "🔗 PRIORIDADE (link de: X)", ""],
+    ["", "", ""],
+    ["falhou", "Error", ""],
+]
+
+
+def make_sheets(rows):
+    sheets = MagicMock()
+    sheets.snapshot.return_value.rows = rows
+    return sheets
+
+
+class TestSheetMirror:
+    def test_queries_match_sheets_client(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("sid", ROWS)
+        assert mirror.get_pending_rows("sid") == [
+            {"row_num": 4, "keyword": "terapia"},
+            {"row_num": 3, "keyword": "depressão"},
+        ]
+        assert mirror.get_all_completed_articles("sid") == [{"keyword": "ansiedade", "url": "http://a.com"}]
+        assert mirror.existing_keywords("sid") == {"ansiedade", "depressão", "terapia", "falhou"}
+
+    def test_delta_pull_only_touches_changed_rows(self):
+        mirror = SheetMirror(":memory:")
+        assert mirror.apply_rows("sid", ROWS) == (5, 0)
+        changed = [list(r) for r in ROWS]
+        changed[2] = ["depressão", "Done", "http://d.com"]
+        assert mirror.apply_rows("sid", changed) == (1, 0)
+        assert mirror.apply_rows("sid", changed[:4]) == (0, 2)
+
+    def test_sync_skips_download_when_fresh(self):
+        mirror = SheetMirror(":memory:", max_age=300)
+        sheets = make_sheets(ROWS)
+        assert mirror.sync(sheets, "sid")["pulled"] is True
+        assert mirror.sync(sheets, "sid")["pulled"] is False
+        assert sheets.snapshot.call_count == 1
+        assert mirror.sync(sheets, "sid", force=True)["pulled"] is True
+
+    def test_sync_pulls_when_stale(self):
+        mirror = SheetMirror(":memory:", max_age=60)
+        sheets = make_sheets(ROWS)
+        with patch("core.sheet_mirror.time.time", return_value=1000.0):
+            mirror.sync(sheets, "sid")
+        with patch("core.sheet_mirror.time.time", return_value=1100.0):
+            assert mirror.sync(sheets, "sid")["pulled"] is True
+
+    def test_status_change_is_local_until_push(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("sid", ROWS)
+        mirror.update_status("sid", 3, "Done", "http://d.com")
+
+        assert {"row_num": 3, "keyword": "depressão"} not in mirror.get_pending_rows("sid")
+        assert {"keyword": "depressão", "url": "http://d.com"} in mirror.get_all_completed_articles("sid")
+        assert mirror.stats["dirty"] == 1
+
+        sheets = make_sheets(ROWS)
+        assert mirror.push(sheets, "sid") == 1
+        sheets.update_row.assert_called_once_with("sid", 3, "http://d.com", status="Done")
+        sheets.flush.assert_called_once_with("sid")
+        assert mirror.stats["dirty"] == 0
+        assert mirror.push(sheets, "sid") == 0
+
+    def test_pull_does_not_overwrite_dirty_rows(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("sid", ROWS)
+        mirror.update_status("sid", 3, "Done", "http://d.com")
+        mirror.apply_rows("sid", ROWS)  # sheet still shows the old status
+        assert {"keyword": "depressão", "url": "http://d.com"} in mirror.get_all_completed_articles("sid")
+
+    def test_failed_push_keeps_dirty(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("sid", ROWS)
+        mirror.update_status("sid", 3, "Done", "http://d.com")
+        sheets = make_sheets(ROWS)
+        sheets.flush.side_effect = Exception("quota")
+        try:
+            mirror.push(sheets, "sid")
+        except Exception:
+            pass
+        assert mirror.stats["dirty"] == 1
+
+    def test_push_follows_keyword_to_its_new_row(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("sid", ROWS)
+        mirror.update_status("sid", 3, "Done", "http://d.com")
+        shifted = ROWS[:1] + [["nova", "", ""]] + ROWS[1:]  # a row was inserted above
+
+        sheets = make_sheets(shifted)
+        assert mirror.push(sheets, "sid") == 1
+        sheets.update_row.assert_called_once_with("sid", 4, "http://d.com", status="Done")
+        sheets.snapshot.assert_called_once_with("sid", refresh=True)
+
+    def test_push_skips_row_whose_keyword_is_gone(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("sid", ROWS)
+        mirror.update_status("sid", 3, "Done", "http://d.com")
+        sheets = make_sheets([r for r in ROWS if r[0] != "depressão"])
+
+        assert mirror.push(sheets, "sid") == 0
+        sheets.update_row.assert_not_called()
+        sheets.flush.assert_not_called()
+        assert mirror.stats["dirty"] == 0  # the next pull re-reads the row
+
+    def test_sync_downloads_once_to_push_and_pull(self):
+        mirror = SheetMirror(":memory:", max_age=0)
+        mirror.apply_rows("sid", ROWS)
+        mirror.update_status("sid", 3, "Done", "http://d.com")
+        rows = [list(r) for r in ROWS]
+        sheets = make_sheets(rows)
+
+        def update_row(sid, row_num, link, status):
+            rows[row_num - 1][1:3] = [status, link]  # like SheetsClient: the snapshot sees the write
+
+        sheets.update_row.side_effect = update_row
+
+        result = mirror.sync(sheets, "sid")
+
+        assert result["pushed"] == 1 and result["pulled"] is True
+        sheets.snapshot.assert_called_once_with("sid", refresh=True)
+        assert mirror.stats["dirty"] == 0
+        assert {"keyword": "depressão", "url": "http://d.com"} in mirror.get_all_completed_articles("sid")
+
+    def test_push_writes_unmirrored_row_by_number(self):
+        mirror = SheetMirror(":memory:")
+        mirror.update_status("sid", 7, "Done", "http://x.com")  # row never pulled: no keyword to check
+        sheets = make_sheets(ROWS)
+
+        assert mirror.push(sheets, "sid") == 1
+        sheets.update_row.assert_called_once_with("sid", 7, "http://x.com", status="Done")
+
+    def test_spreadsheets_isolated(self):
+        mirror = SheetMirror(":memory:")
+        mirror.apply_rows("a", ROWS)
+        assert mirror.get_pending_rows("b") == []
+
+    def test_persists_to_file(self, tmp_path):
+        path = str(tmp_path / "mirror.sqlite")
+        SheetMirror(path).apply_rows("sid", ROWS)
+        assert len(SheetMirror(path).get_pending_rows("sid")) == 2
+
+
+class TestCreateSheetMirror:
+    def test_disabled(self):
+        assert create_sheet_mirror(enabled=False) is None
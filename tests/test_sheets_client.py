@@ -124,5 +124,125 @@ class TestUpdateRow:
                 client = SheetsClient()
             client.update_row("test_id", 5, "http://new-link.com", status="Done")
 
-        mock_worksheet.update_cell.assert_any_call(5, 2, "Done")
-        mock_worksheet.update_cell.assert_any_call(5, 3, "http://new-link.com")
+        # Status and link go out in a single range write
+        mock_worksheet.batch_update.assert_called_once()
+        data = mock_worksheet.batch_update.call_args[0][0]
+        assert data == [{"range": "B5:C5", "values": [["Done", "http://new-link.com"]]}]
+
+
+def make_client(mock_worksheet, **kwargs):
+    mock_spreadsheet = MagicMock()
+    mock_spreadsheet.get_worksheet.return_value = mock_worksheet
+    with patch("core.sheets_client.gspread") as mock_gspread:
+        mock_gc = MagicMock()
+        mock_gc.open_by_key.return_value = mock_spreadsheet
+        mock_gspread.service_account.return_value = mock_gc
+
+        from core.sheets_client import SheetsClient
+        with patch("os.path.exists", return_value=True):
+            return SheetsClient(**kwargs)
+
+
+class TestBufferedWrites:
+    def test_writes_held_until_flush(self):
+        ws = MagicMock()
+        ws.get_all_values.return_value = [["Keyword", "Status", "Link"]]
+        client = make_client(ws, buffered=True)
+
+        client.update_row("sid", 5, "http://x.com")
+        client.add_new_topic("sid", "novo tema")
+        client.add_priority_keyword("sid", "prioridade", source_article="Artigo")
+        ws.batch_update.assert_not_called()
+        ws.append_rows.assert_not_called()
+        assert client.pending_writes == 3
+
+        assert client.flush() == 3
+        ws.batch_update.assert_called_once()
+        ws.append_rows.assert_called_once()
+        rows = ws.append_rows.call_args[0][0]
+        assert [r[0] for r in rows] == ["novo tema", "prioridade"]
+        assert client.pending_writes == 0
+
+    def test_spreadsheet_opened_once(self):
+        ws = MagicMock()
+        client = make_client(ws, buffered=True)
+        client.update_row("sid", 2, "a")
+        client.flush()
+        client.update_row("sid", 3, "b")
+        client.flush()
+        assert client.gc.open_by_key.call_count == 1
+
+    def test_threshold_triggers_flush(self):
+        ws = MagicMock()
+        client = make_client(ws, buffered=True, flush_threshold=2)
+        client.add_new_topic("sid", "a")
+        ws.append_rows.assert_not_called()
+        client.add_new_topic("sid", "b")
+        ws.append_rows.assert_called_once_with([["a", "💡 Sugestão IA", ""], ["b", "💡 Sugestão IA", ""]])
+
+    def test_priority_dedupes_against_queued_rows(self):
+        ws = MagicMock()
+        ws.get_all_values.return_value = [["Keyword", "Status", "Link"]]
+        client = make_client(ws, buffered=True)
+        assert client.add_priority_keyword("sid", "Terapia") is True
+        assert client.add_priority_keyword("sid", "terapia ") is False
+        assert client.pending_writes == 1
+
+    def test_failed_flush_keeps_writes(self):
+        ws = MagicMock()
+        ws.append_rows.side_effect = Exception("quota")
+        client = make_client(ws, buffered=True)
+        client.update_row("sid", 2, "a")
+        client.add_new_topic("sid", "t")
+        with pytest.raises(Exception, match="quota"):
+            client.flush()
+        # Updates were sent; the append is retried on the next flush
+        assert client.pending_writes == 1
+        ws.append_rows.side_effect = None
+        assert client.flush() == 1
+
+
+class TestWorksheetSnapshot:
+    ROWS = [
+        ["Keyword", "Status", "Link"],
+        ["ansiedade", "Done", "http://a.com"],
+        ["depressão", "", ""],
+        ["terapia", "🔗 PRIORIDADE (link de: X)", ""],
+    ]
+
+    def test_sheet_downloaded_once_for_all_reads(self):
+        ws = MagicMock()
+        ws.get_all_values.return_value = self.ROWS
+        client = make_client(ws)
+
+        pending = client.get_pending_rows("sid")
+        completed = client.get_all_completed_articles("sid")
+        existing = client.existing_keywords("sid")
+
+        assert [p["keyword"] for p in pending] == ["terapia", "depressão"]
+        assert completed == [{"keyword": "ansiedade", "url": "http://a.com"}]
+        assert existing == {"ansiedade", "depressão", "terapia"}
+        assert ws.get_all_values.call_count == 1
+
+    def test_own_writes_applied_locally(self):
+        ws = MagicMock()
+        ws.get_all_values.return_value = self.ROWS
+        client = make_client(ws, buffered=True)
+        client.get_pending_rows("sid")
+
+        client.update_row("sid", 3, "http://d.com", status="Done")
+        client.add_new_topic("sid", "novo tema")
+        client.add_priority_keyword("sid", "outro")
+
+        assert {"keyword": "depressão", "url": "http://d.com"} in client.get_all_completed_articles("sid")
+        assert {"novo tema", "outro"} <= client.existing_keywords("sid")
+        assert [p["row_num"] for p in client.get_pending_rows("sid")] == [4, 6, 5]
+        assert ws.get_all_values.call_count == 1
+
+    def test_refresh(self):
+        ws = MagicMock()
+        ws.get_all_values.return_value = self.ROWS
+        client = make_client(ws)
+        client.snapshot("sid")
+        client.snapshot("sid", refresh=True)
+        assert ws.get_all_values.call_count == 2
@@ -0,0 +1,81 @@
+"""Tests for StageGraph — dependency ordering, concurrency, error propagation."""
+import threading
+import time
+import pytest
+from core.stage_graph import StageGraph, StageGraphError
+
+
+class TestStageGraph:
+    def test_runs_all_stages(self):
+        graph = StageGraph()
+        graph.add("a", lambda r: 1)
+        graph.add("b", lambda r: 2)
+        assert graph.run() == {"a": 1, "b": 2}
+
+    def test_dependency_receives_upstream_results(self):
+        graph = StageGraph()
+        graph.add("a", lambda r: 2)
+        graph.add("b", lambda r: 3)
+        graph.add("sum", lambda r: r["a"] + r["b"], deps=("a", "b"))
+        assert graph.run()["sum"] == 5
+
+    def test_initial_results_visible(self):
+        graph = StageGraph()
+        graph.add("double", lambda r: r["x"] * 2)
+        results = graph.run(initial={"x": 21})
+        assert results["double"] == 42
+        assert results["x"] == 21
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+        graph = StageGraph(max_workers=2)
+        # Each stage waits for the other: only passes if both run at the same time
+        graph.add("a", lambda r: barrier.wait())
+        graph.add("b", lambda r: barrier.wait())
+        graph.run()
+
+    def test_dependent_stage_waits(self):
+        order = []
+        graph = StageGraph(max_workers=4)
+        graph.add("slow", lambda r: (time.sleep(0.05), order.append("slow")))
+        graph.add("after", lambda r: order.append("after"), deps=("slow",))
+        graph.run()
+        assert order == ["slow", "after"]
+
+    def test_error_is_reraised_and_stops_dependents(self):
+        called = []
+
+        def boom(_):
+            raise ValueError("stage failed")
+
+        graph = StageGraph()
+        graph.add("a", boom)
+        graph.add("b", lambda r: called.append("b"), deps=("a",))
+        with pytest.raises(ValueError, match="stage failed"):
+            graph.run()
+        assert called == []
+
+    def test_unknown_dependency(self):
+        graph = StageGraph()
+        graph.add("a", lambda r: 1, deps=("missing",))
+        with pytest.raises(StageGraphError, match="unknown stage"):
+            graph.run()
+
+    def test_cycle_detected(self):
+        graph = StageGraph()
+        graph.add("a", lambda r: 1, deps=("b",))
+        graph.add("b", lambda r: 1, deps=("a",))
+        with pytest.raises(StageGraphError, match="Cycle"):
+            graph.run()
+
+    def test_duplicate_stage(self):
+        graph = StageGraph()
+        graph.add("a", lambda r: 1)
+        with pytest.raises(StageGraphError):
+            graph.add("a", lambda r: 2)
+
+    def test_timings_recorded(self):
+        graph = StageGraph()
+        graph.add("a", lambda r: 1)
+        graph.run()
+        assert graph.timings["a"] >= 0
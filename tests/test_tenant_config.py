@@ -107,6 +107,15 @@ class TestTenantConfig:
         assert "humanizer" not in agents  # Overridden
         assert "visual" not in agents
 
+    def test_get_kb_config_defaults_and_override(self, tenant_dir):
+        tc = TenantConfig.load("mjesus", tenants_dir=tenant_dir)
+        assert tc.get_kb_config()["retrieval"] is True
+        assert tc.get_kb_config()["top_k"] == 8
+
+        tc = TenantConfig({"knowledge_base": {"max_chars": 4000}})
+        assert tc.get_kb_config()["max_chars"] == 4000
+        assert tc.get_kb_config()["retrieval"] is True
+
     def test_get_agent_config_inherits_default(self, tenant_dir):
         tc = TenantConfig.load("mjesus", tenants_dir=tenant_dir)
         analyst_config = tc.get_agent_config("analyst")
@@ -11,18 +11,18 @@ def wp_client():
 
 class TestVerifyAuth:
     def test_auth_success(self, wp_client):
-        with patch("core.wordpress_client.requests.get") as mock_get:
+        with patch.object(wp_client.session, "get") as mock_get:
             mock_get.return_value = MagicMock(status_code=200)
             assert wp_client.verify_auth() is True
 
     def test_auth_failure(self, wp_client):
-        with patch("core.wordpress_client.requests.get") as mock_get:
+        with patch.object(wp_client.session, "get") as mock_get:
             mock_get.return_value = MagicMock(status_code=401)
             assert wp_client.verify_auth() is False
 
     def test_auth_connection_error(self, wp_client):
         import requests as req_lib
-        with patch("core.wordpress_client.requests.get") as mock_get:
+        with patch.object(wp_client.session, "get") as mock_get:
             mock_get.side_effect = req_lib.RequestException("Connection refused")
             assert wp_client.verify_auth() is False
 
@@ -33,7 +33,7 @@ class TestUploadMedia:
         mock_response.status_code = 201
         mock_response.json.return_value = {"id": 42, "source_url": "https://example.com/image.png"}
 
-        with patch("core.wordpress_client.requests.post", return_value=mock_response):
+        with patch.object(wp_client.session, "post", return_value=mock_response):
             media_id, media_url = wp_client.upload_media(b"fake-image-data", "test.png")
 
         assert media_id == 42
@@ -44,7 +44,7 @@ class TestUploadMedia:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        with patch("core.wordpress_client.requests.post", return_value=mock_response):
+        with patch.object(wp_client.session, "post", return_value=mock_response):
             media_id, media_url = wp_client.upload_media(b"fake-image-data", "test.png")
 
         assert media_id is None
@@ -62,7 +62,7 @@ class TestCreatePost:
         }
         mock_response.raise_for_status = MagicMock()
 
-        with patch("core.wordpress_client.requests.post", return_value=mock_response):
+        with patch.object(wp_client.session, "post", return_value=mock_response):
             result = wp_client.create_post(
                 title="Test Post",
                 content="<p>Content</p>",
@@ -79,7 +79,7 @@ class TestCreatePost:
         mock_response.json.return_value = {"id": 100, "link": "https://example.com/post/"}
         mock_response.raise_for_status = MagicMock()
 
-        with patch("core.wordpress_client.requests.post", return_value=mock_response) as mock_post:
+        with patch.object(wp_client.session, "post", return_value=mock_response) as mock_post:
             wp_client.create_post(
                 title="Post with Image",
                 content="<p>Content</p>",
@@ -103,7 +103,7 @@ class TestCreatePost:
         mock_success.json.return_value = {"id": 101, "link": "https://example.com/post/"}
         mock_success.raise_for_status = MagicMock()
 
-        with patch("core.wordpress_client.requests.post", side_effect=[mock_fail, mock_success]) as mock_post:
+        with patch.object(wp_client.session, "post", side_effect=[mock_fail, mock_success]) as mock_post:
             result = wp_client.create_post(
                 title="Post",
                 content="<p>Content</p>",
@@ -113,3 +113,251 @@ class TestCreatePost:
 
         assert result["id"] == 101
         assert mock_post.call_count == 2
+
+
+class TestSession:
+    def test_requests_share_one_session_with_timeout(self, wp_client):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = []
+        mock_response.headers = {"X-WP-TotalPages": "1"}
+
+        with patch.object(wp_client.session, "get", return_value=mock_response) as mock_get:
+            wp_client.verify_auth()
+            wp_client.get_posts()
+
+        assert mock_get.call_count == 2
+        for call in mock_get.call_args_list:
+            assert call[1]["timeout"] == wp_client.timeout
+
+    def test_adapter_pools_and_retries_gateway_errors(self, wp_client):
+        adapter = wp_client.session.get_adapter("https://example.com/wp-json/")
+        retry = adapter.max_retries
+
+        assert adapter._pool_maxsize >= 4
+        assert set(retry.status_forcelist) == {502, 503, 504}
+        assert retry.total >= 1
+        assert retry.is_retry("GET", 503)
+        # POST creates posts/media — never replayed after the server may have acted on it
+        assert not retry.is_retry("POST", 504)
+
+    def test_injected_session_is_used(self):
+        session = MagicMock()
+        client = WordPressClient("https://example.com", "admin", "pw", session=session)
+        client.update_post(7, {"title": "x"})
+        session.post.assert_called_once()
+        client.close()
+        session.close.assert_called_once()
+
+
+def _page_response(posts, total_pages=None, total=None):
+    r = MagicMock()
+    r.status_code = 200
+    r.json.return_value = posts
+    r.headers = {}
+    if total_pages is not None:
+        r.headers["X-WP-TotalPages"] = str(total_pages)
+    if total is not None:
+        r.headers["X-WP-Total"] = str(total)
+    return r
+
+
+class TestGetPosts:
+    def test_fetches_remaining_pages_concurrently_in_order(self, wp_client):
+        pages = {
+            1: _page_response([{"id": 1}, {"id": 2}], total_pages=3),
+            2: _page_response([{"id": 3}, {"id": 4}], total_pages=3),
+            3: _page_response([{"id": 5}], total_pages=3),
+        }
+
+        def fake_get(url, headers=None, params=None, timeout=None):
+            return pages[params["page"]]
+
+        with patch.object(wp_client.session, "get", side_effect=fake_get) as mock_get:
+            posts = wp_client.get_posts(per_page=2)
+
+        assert [p["id"] for p in posts] == [1, 2, 3, 4, 5]
+        assert sorted(c[1]["params"]["page"] for c in mock_get.call_args_list) == [1, 2, 3]
+
+    def test_fields_projection(self, wp_client):
+        with patch.object(wp_client.session, "get",
+                          return_value=_page_response([{"id": 1}], total_pages=1)) as mock_get:
+            wp_client.get_posts(fields=["id", "link"])
+        assert mock_get.call_args[1]["params"]["_fields"] == "id,link"
+
+    def test_without_pagination_headers_walks_pages(self, wp_client):
+        responses = [_page_response([{"id": 1}, {"id": 2}]), _page_response([{"id": 3}])]
+        with patch.object(wp_client.session, "get", side_effect=responses):
+            posts = wp_client.get_posts(per_page=2)
+        assert [p["id"] for p in posts] == [1, 2, 3]
+
+    def test_failed_page_is_skipped(self, wp_client):
+        failed = MagicMock(status_code=500)
+
+        def fake_get(url, headers=None, params=None, timeout=None):
+            if params["page"] == 2:
+                return failed
+            return _page_response([{"id": params["page"]}], total_pages=3)
+
+        with patch.object(wp_client.session, "get", side_effect=fake_get):
+            posts = wp_client.get_posts(per_page=1)
+            strict = wp_client.get_posts(per_page=1, strict=True)
+        assert [p["id"] for p in posts] == [1, 3]
+        assert strict is None
+
+
+class TestCountPosts:
+    def test_reads_total_header(self, wp_client):
+        with patch.object(wp_client.session, "get",
+                          return_value=_page_response([{"id": 1}], total=42)) as mock_get:
+            assert wp_client.count_posts() == 42
+        params = mock_get.call_args[1]["params"]
+        assert params["per_page"] == 1
+        assert params["_fields"] == "id"
+
+    def test_missing_header_returns_none(self, wp_client):
+        with patch.object(wp_client.session, "get", return_value=_page_response([])):
+            assert wp_client.count_posts() is None
+
+
+class TestIncrementalFetch:
+    def test_modified_after_and_etag_are_sent(self, wp_client):
+        r = _page_response([{"id": 1}], total_pages=1)
+        r.headers["ETag"] = '"v2"'
+        with patch.object(wp_client.session, "get", return_value=r) as mock_get:
+            posts, etag = wp_client.get_posts_since("2024-05-01T10:00:00", etag='"v1"')
+
+        assert posts == [{"id": 1}]
+        assert etag == '"v2"'
+        kwargs = mock_get.call_args[1]
+        assert kwargs["params"]["modified_after"] == "2024-05-01T10:00:00"
+        assert kwargs["params"]["orderby"] == "modified"
+        assert kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert "Authorization" in kwargs["headers"]
+
+    def test_not_modified(self, wp_client):
+        with patch.object(wp_client.session, "get", return_value=MagicMock(status_code=304)):
+            assert wp_client.get_posts_since("2024-05-01T10:00:00", etag='"v1"') == (None, '"v1"')
+
+    def test_get_post(self, wp_client):
+        r = MagicMock(status_code=200)
+        r.json.return_value = {"id": 5}
+        with patch.object(wp_client.session, "get", return_value=r) as mock_get:
+            assert wp_client.get_post(5, fields=["id", "content"]) == {"id": 5}
+        assert mock_get.call_args[0][0].endswith("/wp-json/wp/v2/posts/5")
+        assert mock_get.call_args[1]["params"] == {"_fields": "id,content"}
+
+
+class TestGetMedia:
+    def test_batches_ids_with_include(self, wp_client):
+        def fake_get(url, headers=None, params=None, timeout=None):
+            ids = [int(i) for i in params["include"].split(",")]
+            r = MagicMock(status_code=200)
+            r.json.return_value = [{"id": i, "source_url": f"https://example.com/{i}.png"} for i in ids]
+            return r
+
+        with patch.object(wp_client.session, "get", side_effect=fake_get) as mock_get:
+            media = wp_client.get_media(range(1, 151))
+
+        assert len(media) == 150
+        assert media[150]["source_url"] == "https://example.com/150.png"
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[0][1]["params"]["per_page"] == 100
+        assert mock_get.call_args_list[0][1]["params"]["_fields"] == "id,source_url"
+
+    def test_failed_batch_is_skipped(self, wp_client):
+        with patch.object(wp_client.session, "get", return_value=MagicMock(status_code=500)):
+            assert wp_client.get_media([1, 2]) == {}
+
+
+class TestBatch:
+    def _batch_response(self, statuses):
+        r = MagicMock(status_code=207)
+        r.json.return_value = {"responses": [{"status": s, "body": {"id": i}} for i, s in enumerate(statuses)]}
+        return r
+
+    def test_writes_are_sent_in_batches_of_25(self, wp_client):
+        def fake_post(url, headers=None, json=None, timeout=None):
+            return self._batch_response([200] * len(json["requests"]))
+
+        with patch.object(wp_client.session, "post", side_effect=fake_post) as mock_post:
+            with wp_client.batch() as batch:
+                writes = [batch.update_post(i, {"title": f"T{i}"}) for i in range(30)]
+
+        assert mock_post.call_count == 2
+        first = mock_post.call_args_list[0]
+        assert first[0][0] == "https://example.com/wp-json/batch/v1"
+        assert len(first[1]["json"]["requests"]) == 25
+        assert first[1]["json"]["requests"][0] == {"method": "POST", "path": "/wp/v2/posts/0",
+                                                   "body": {"title": "T0"}}
+        last = mock_post.call_args_list[1][1]["json"]["requests"][-1]
+        assert last == {"method": "POST", "path": "/wp/v2/posts/29", "body": {"title": "T29"}}
+        assert all(w.ok for w in writes)
+
+    def test_media_writes_skip_the_batch_endpoint(self, wp_client):
+        updated = MagicMock(status_code=200)
+        with patch.object(wp_client.session, "post", side_effect=[self._batch_response([200]), updated]) as mock_post:
+            with wp_client.batch() as batch:
+                post = batch.update_post(1, {"title": "a"})
+                media = batch.update_media(7, "alt")
+
+        urls = [c[0][0] for c in mock_post.call_args_list]
+        assert urls == ["https://example.com/wp-json/batch/v1", "https://example.com/wp-json/wp/v2/media/7"]
+        assert [r["path"] for r in mock_post.call_args_list[0][1]["json"]["requests"]] == ["/wp/v2/posts/1"]
+        assert post.ok and media.ok
+
+    def test_sub_request_failure_is_reported(self, wp_client):
+        with patch.object(wp_client.session, "post", return_value=self._batch_response([200, 400])):
+            with wp_client.batch() as batch:
+                ok = batch.update_post(1, {"title": "a"})
+                failed = batch.update_post(2, {"title": "b"})
+        assert ok.ok is True
+        assert failed.ok is False
+
+    def test_falls_back_to_individual_calls_without_endpoint(self, wp_client):
+        not_found = MagicMock(status_code=404)
+        updated = MagicMock(status_code=200)
+        updated.json.return_value = {"id": 1}
+
+        with patch.object(wp_client.session, "post", side_effect=[not_found, updated, updated, updated]) as mock_post:
+            with wp_client.batch() as batch:
+                first = batch.update_post(1, {"title": "a"})
+                second = batch.update_media(2, "alt")
+            # Endpoint is remembered as missing — next batch goes straight to single calls
+            with wp_client.batch() as batch:
+                third = batch.update_post(3, {"title": "c"})
+
+        urls = [c[0][0] for c in mock_post.call_args_list]
+        assert urls == [
+            "https://example.com/wp-json/batch/v1",
+            "https://example.com/wp-json/wp/v2/posts/1",
+            "https://example.com/wp-json/wp/v2/media/2",
+            "https://example.com/wp-json/wp/v2/posts/3",
+        ]
+        assert first.ok and second.ok and third.ok
+        assert wp_client.supports_batch is False
+
+    def test_batch_not_allowed_route_is_sent_individually(self, wp_client):
+        batch_response = MagicMock(status_code=207)
+        batch_response.json.return_value = {"responses": [
+            {"status": 400, "body": {"code": "rest_batch_not_allowed"}},
+        ]}
+        updated = MagicMock(status_code=200)
+        updated.json.return_value = {"id": 5}
+        with patch.object(wp_client.session, "post", side_effect=[batch_response, updated, updated]) as mock_post:
+            with wp_client.batch() as batch:
+                write = batch.update_post(5, {"title": "a"})
+            # The refusal is remembered — the route is no longer batched
+            with wp_client.batch() as batch:
+                batch.update_post(6, {"title": "b"})
+        urls = [c[0][0] for c in mock_post.call_args_list]
+        assert urls[1:] == ["https://example.com/wp-json/wp/v2/posts/5", "https://example.com/wp-json/wp/v2/posts/6"]
+        assert write.ok is True
+
+    def test_rate_limiter_paces_each_request(self, wp_client):
+        limiter = MagicMock()
+        with patch.object(wp_client.session, "post", return_value=self._batch_response([200, 200])):
+            with wp_client.batch(rate_limiter=limiter) as batch:
+                batch.update_post(1, {})
+                batch.update_post(2, {})
+        assert limiter.throttle.call_count == 1
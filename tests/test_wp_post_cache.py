@@ -0,0 +1,166 @@
+"""Tests for WPPostCache — incremental sync, lookups, pruning."""
+from unittest.mock import MagicMock
+from core.wp_post_cache import WPPostCache, content_hash, normalize_url, create_wp_post_cache
+
+
+def make_post(post_id, modified="2024-05-01T10:00:00", html="<p>x</p>", slug=None):
+    slug = slug or f"post-{post_id}"
+    return {
+        "id": post_id,
+        "slug": slug,
+        "link": f"https://example.com/{slug}/",
+        "modified": modified,
+        "title": {"rendered": f"Post {post_id}"},
+        "content": {"rendered": html},
+    }
+
+
+def make_wp(posts, etag='"v1"', total=None):
+    wp = MagicMock()
+    wp.base_url = "https://example.com"
+    wp.get_posts_since.return_value = (posts, etag)
+    wp.count_posts.return_value = len(posts) if total is None else total
+    return wp
+
+
+class TestWPPostCache:
+    def test_first_sync_fetches_everything(self):
+        cache = WPPostCache(":memory:")
+        wp = make_wp([make_post(1), make_post(2)])
+
+        result = cache.sync(wp)
+
+        assert result == {"fetched": 2, "changed": 2, "removed": 0, "synced": True}
+        wp.get_posts_since.assert_called_once()
+        assert wp.get_posts_since.call_args[0][0] is None
+        assert wp.get_posts_since.call_args[1]["etag"] is None
+        wp.get_posts.assert_not_called()
+
+    def test_lookups_by_id_slug_and_url(self):
+        cache = WPPostCache(":memory:")
+        cache.sync(make_wp([make_post(7, slug="terapia-online")]))
+        site = "https://example.com"
+
+        assert cache.get(site, 7)["slug"] == "terapia-online"
+        assert cache.get_by_slug(site, "terapia-online")["id"] == 7
+        assert cache.get_by_url(site, "http://www.example.com/terapia-online")["id"] == 7
+        assert cache.get(site, 8) is None
+        assert cache.get_content_hash(site, 7) == content_hash("<p>x</p>")
+
+    def test_incremental_sync_sends_newest_modified_and_etag(self):
+        cache = WPPostCache(":memory:", max_age=0)
+        cache.sync(make_wp([make_post(1, "2024-05-01T10:00:00"), make_post(2, "2024-05-03T08:00:00")]))
+
+        wp = make_wp([make_post(2, "2024-05-04T09:00:00", html="<p>new</p>")], etag='"v2"', total=2)
+        result = cache.sync(wp, force=True)
+
+        args, kwargs = wp.get_posts_since.call_args
+        assert args[0] == "2024-05-03T08:00:00"
+        assert kwargs["etag"] == '"v1"'
+        assert result["changed"] == 1
+        assert cache.get("https://example.com", 2)["content"]["rendered"] == "<p>new</p>"
+
+    def test_unchanged_content_is_not_counted_as_changed(self):
+        cache = WPPostCache(":memory:")
+        cache.sync(make_wp([make_post(1)]))
+        changed = cache.apply_posts("https://example.com", [make_post(1, "2024-06-01T00:00:00")])
+        assert changed == 0
+
+    def test_not_modified_keeps_cache(self):
+        cache = WPPostCache(":memory:")
+        cache.sync(make_wp([make_post(1)]))
+
+        wp = make_wp([make_post(1)])
+        wp.get_posts_since.return_value = (None, '"v1"')
+        result = cache.sync(wp, force=True)
+
+        assert result["synced"] is True
+        assert result["fetched"] == 0
+        assert cache.count("https://example.com") == 1
+
+    def test_fresh_cache_skips_requests(self):
+        cache = WPPostCache(":memory:", max_age=3600)
+        cache.sync(make_wp([make_post(1)]))
+        wp = make_wp([])
+        assert cache.sync(wp)["synced"] is False
+        wp.get_posts_since.assert_not_called()
+
+    def test_count_mismatch_prunes_deleted_and_fetches_missed_posts(self):
+        cache = WPPostCache(":memory:")
+        cache.sync(make_wp([make_post(1), make_post(2)]))
+
+        # Post 2 deleted; 3 and 4 were scheduled posts published with an old modified date
+        wp = make_wp([], total=3)
+        wp.get_posts.return_value = [{"id": 1}, {"id": 3}, {"id": 4}]
+        wp.get_post.side_effect = lambda post_id, fields=None: make_post(post_id, "2024-01-01T00:00:00")
+        result = cache.sync(wp, force=True)
+
+        assert result["removed"] == 1
+        assert [c[0][0] for c in wp.get_post.call_args_list] == [3, 4]
+        assert sorted(p["id"] for p in cache.all_posts("https://example.com")) == [1, 3, 4]
+
+    def test_incomplete_id_listing_does_not_prune(self):
+        cache = WPPostCache(":memory:")
+        cache.sync(make_wp([make_post(1), make_post(2), make_post(3)]))
+
+        # Post 3 deleted, but one listing page failed
+        wp = make_wp([], total=2)
+        wp.get_posts.return_value = None
+        assert cache.sync(wp, force=True)["removed"] == 0
+        wp.get_posts.assert_called_once_with(fields=["id"], strict=True)
+
+        # Listing shorter than X-WP-Total (pages dropped) — also not trusted
+        wp.get_posts.return_value = [{"id": 1}]
+        assert cache.sync(wp, force=True)["removed"] == 0
+        assert cache.count("https://example.com") == 3
+
+    def test_failed_first_sync_is_retried(self):
+        cache = WPPostCache(":memory:")
+        wp = make_wp([])
+        wp.get_posts_since.return_value = (None, None)
+        assert cache.sync(wp)["synced"] is False
+        assert cache.is_stale(wp)
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "posts.sqlite")
+        WPPostCache(path).sync(make_wp([make_post(1)]))
+        assert WPPostCache(path).count("https://example.com") == 1
+
+    def test_normalize_url(self):
+        assert normalize_url("HTTPS://www.Example.com/a/?utm=1#x") == "example.com/a"
+
+    def test_factory_disabled(self):
+        assert create_wp_post_cache(enabled=False) is None
+
+
+class TestPostCacheConsumers:
+    def test_reoptimizer_reads_posts_from_cache(self):
+        from core.reoptimizer import ArticleReoptimizer
+        cache = WPPostCache(":memory:")
+        wp = make_wp([make_post(1)])
+        opt = ArticleReoptimizer(wp, {"wordpress_url": "https://example.com"}, post_cache=cache)
+
+        posts = opt._load_posts()
+
+        assert [p["id"] for p in posts] == [1]
+        wp.get_posts.assert_not_called()
+
+    def test_refresh_article_looks_up_one_post(self):
+        from core.reoptimizer_v2 import ContentFreshnessEngine
+        wp = make_wp([])
+        wp.get_post.return_value = None
+        engine = ContentFreshnessEngine(wp, {"wordpress_url": "https://example.com"})
+
+        result = engine.refresh_article(5)
+
+        assert result == {"success": False, "error": "Post not found"}
+        wp.get_post.assert_called_once_with(5)
+        wp.get_posts.assert_not_called()
+
+    def test_find_post_by_url_uses_cache(self):
+        from core.reoptimizer_v2 import ContentFreshnessEngine
+        cache = WPPostCache(":memory:")
+        wp = make_wp([make_post(9, slug="ansiedade")])
+        engine = ContentFreshnessEngine(wp, {"wordpress_url": "https://example.com"}, post_cache=cache)
+
+        assert engine.find_post_by_url("https://example.com/ansiedade/")["id"] == 9